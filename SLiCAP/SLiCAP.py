@@ -106,6 +106,7 @@ def initProject(name, firstRun=True):
         copyNotOverwrite(ini.defaultLib + '/Grid.png', ini.htmlPath + 'css/Grid.png')
         makeDir(ini.mathmlPath)
         makeDir(ini.latexPath)
+        makeDir(ini.cachePath)
         # Create the HTML project index file
     startHTML(name)
         # Create the libraries
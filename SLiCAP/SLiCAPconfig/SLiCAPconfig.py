@@ -15,6 +15,7 @@ Default values:
 >>> LATEXPATH   = 'tex/'    # path for LaTeX output saveTeX()
 >>> MATHMLPATH  = 'mathml/' # path for mathML output saveMathML()
 >>> IMGPATH     = 'img/'    # path for image files
+>>> CACHEPATH   = 'cache/'  # path for cached results
 """
 PROJECTPATH = None      # Leave it for automatic detection
 # PATHS: relative to the project path
@@ -26,3 +27,4 @@ CSVPATH     = 'csv/'    # path for CSV files (csv2html)
 LATEXPATH   = 'tex/'    # path for LaTeX output saveTeX()
 MATHMLPATH  = 'mathml/' # path for mathML output saveMathML()
 IMGPATH     = 'img/'    # path for image files
+CACHEPATH   = 'cache/'  # path for cached results
@@ -40,7 +40,7 @@ def doInstruction(instObj):
         instObj.circuit.elements[instObj.lgRef] = newLGrefElement
         instObj.circuit = updateCirData(instObj.circuit)
     if instObj.step:
-        if ini.stepFunction:
+        if ini.stepFunction and instObj.dataType != 'sensitivity':
             # Create a substitution dictionary that does not contain step parameters
             subsDict = {}
             if instObj.stepMethod == 'array':
@@ -57,44 +57,56 @@ def doInstruction(instObj):
             # Do stepping by means of substitution in the numerator and denominator
             if instObj.dataType == 'poles':
                 denom = doDenom(instObj)
-                denoms = stepFunctions(instObj, denom)
-                # pz analysis is numeric so better lambdify!
-                for poly in denoms:
-                    instObj.poles.append(numRoots(poly, ini.Laplace))
+                instObj.poles = stepRoots(instObj, denom)
                 instObj.zeros = []
             elif instObj.dataType == 'zeros':
                 numer = doNumer(instObj)
-                numers = stepFunctions(instObj, numer)
-                for poly in numers:
-                    instObj.zeros.append(numRoots(poly, ini.Laplace))
+                instObj.zeros = stepRoots(instObj, numer)
                 instObj.poles = []
             elif instObj.dataType == 'pz':
                 denom = doDenom(instObj)
-                denoms = stepFunctions(instObj, denom)
                 numer = doNumer(instObj)
-                numers = stepFunctions(instObj, numer)
                 instObj.poles = []
                 instObj.zeros = []
                 instObj.DCvalue = []
-                for i in range(len(denoms)):
-                    poles = numRoots(denoms[i], ini.Laplace)
-                    zeros = numRoots(numers[i], ini.Laplace)
-                    (poles, zeros) = cancelPZ(poles, zeros)
-                    instObj.poles.append(poles)
-                    instObj.zeros.append(zeros)
-                    try:
-                        # Lets try a real limit with Maxima CAS
-                        instObj.DCvalue.append(maxLimit(numers[i]/denoms[i], str(ini.Laplace), '0', 'plus'))
-                    except:
-                        # If not just substitute s=0 with Sympy
-                        instObj.DCvalue.append((numers[i]/denoms[i]).subs(ini.Laplace, 0))
+                denoms = stepPolyCoeffs(instObj, denom)
+                numers = stepPolyCoeffs(instObj, numer)
+                if type(denoms) != type(None) and type(numers) != type(None):
+                    # Evaluated coefficients of all steps
+                    allPoles = batchRoots(denoms)
+                    allZeros = batchRoots(numers)
+                    for i in range(len(denoms)):
+                        (poles, zeros) = cancelPZ(allPoles[i], allZeros[i])
+                        instObj.poles.append(poles)
+                        instObj.zeros.append(zeros)
+                        instObj.DCvalue.append(coeffsDCvalue(numers[i], denoms[i]))
+                else:
+                    denoms = stepFunctions(instObj, denom)
+                    numers = stepFunctions(instObj, numer)
+                    for i in range(len(denoms)):
+                        poles = numRoots(denoms[i], ini.Laplace)
+                        zeros = numRoots(numers[i], ini.Laplace)
+                        (poles, zeros) = cancelPZ(poles, zeros)
+                        instObj.poles.append(poles)
+                        instObj.zeros.append(zeros)
+                        try:
+                            # Lets try a real limit with Maxima CAS
+                            instObj.DCvalue.append(maxLimit(numers[i]/denoms[i], str(ini.Laplace), '0', 'plus'))
+                        except:
+                            # If not just substitute s=0 with Sympy
+                            instObj.DCvalue.append((numers[i]/denoms[i]).subs(ini.Laplace, 0))
             elif instObj.dataType == 'step':
-                denom = doDenom(instObj)
-                denoms = stepFunctions(instObj, denom)
+                denom = doDenom(instObj)*ini.Laplace
                 numer = doNumer(instObj)
-                numers = stepFunctions(instObj, numer)
-                for i in range(len(denoms)):
-                    instObj.stepResp.append(maxILT(numers[i], denoms[i]*ini.Laplace, numeric = instObj.numeric))
+                timeFunc = stepILT(instObj, numer, denom)
+                if type(timeFunc) != type(None):
+                    instObj.timeFunc = timeFunc
+                    instObj.stepResp = [timeFunc.expr(i) for i in range(timeFunc.poles.shape[0])]
+                else:
+                    denoms = stepFunctions(instObj, denom)
+                    numers = stepFunctions(instObj, numer)
+                    for i in range(len(denoms)):
+                        instObj.stepResp.append(maxILT(numers[i], denoms[i], numeric = instObj.numeric))
             elif instObj.dataType == 'impulse' or instObj.dataType == 'time':
                 denom = doDenom(instObj)
                 numer = doNumer(instObj)
@@ -102,13 +114,22 @@ def doInstruction(instObj):
                     nNum, nDen = numer.as_numer_denom()
                     numer = nNum
                     denom = denom*nDen
-                denoms = stepFunctions(instObj, denom)
-                numers = stepFunctions(instObj, numer)
-                for i in range(len(denoms)):
-                    try:
-                        instObj.stepResp.append(maxILT(numers[i], denoms[i], numeric = instObj.numeric))
-                    except:
-                        print("Warning: could not calculate the unit impulse response.")
+                if instObj.dataType == 'impulse':
+                    results = instObj.impulse
+                else:
+                    results = instObj.time
+                timeFunc = stepILT(instObj, numer, denom)
+                if type(timeFunc) != type(None):
+                    instObj.timeFunc = timeFunc
+                    results += [timeFunc.expr(i) for i in range(timeFunc.poles.shape[0])]
+                else:
+                    denoms = stepFunctions(instObj, denom)
+                    numers = stepFunctions(instObj, numer)
+                    for i in range(len(denoms)):
+                        try:
+                            results.append(maxILT(numers[i], denoms[i], numeric = instObj.numeric))
+                        except:
+                            print("Warning: could not calculate the unit impulse response.")
             elif instObj.dataType == 'numer':
                 numer = doNumer(instObj)
                 instObj.numer = stepFunctions(instObj, numer)
@@ -147,12 +168,13 @@ def doInstruction(instObj):
                 if instObj.source != None:
                     # Calculate the squared gain from source to detector as a
                     # function of ini.frequency
-                    numer = maxNumer(instObj.M, detP, detN, srcP, srcN, numeric = instObj.numeric)
+                    cofactors = makeCofactors(instObj)
+                    numer = cofactors.numer(detP, detN, srcP, srcN, numeric = instObj.numeric)
                     numer = assumeRealParams(numer.subs(ini.Laplace, 2*sp.pi*sp.I*ini.frequency))
                     nR, nI = numer.as_real_imag()
                     numer2 = nR**2 + nI**2
                     #numer2 = sp.Abs(numer)**2
-                    denom = maxDet(instObj.M, numeric=instObj.numeric)
+                    denom = cofactors.det(numeric = instObj.numeric)
                     denom = assumeRealParams(denom.subs(ini.Laplace, 2*sp.pi*sp.I*ini.frequency))
                     dR, dI = denom.as_real_imag()
                     denom2 = dR**2 + dI**2
@@ -233,17 +255,28 @@ def doInstruction(instObj):
             instObj.parDefs = subsDict
             # For each set of step variable create the numeric substitution
             # dictionary, make the matrices and do the non-stepped instruction.
+            stepDefs = []
             if instObj.stepMethod != 'array':
                 for stepVal in instObj.stepList:
-                    instObj.parDefs[instObj.stepVar] = stepVal
-                    doDataType(instObj)
+                    parDefs = {}
+                    for key in list(subsDict.keys()):
+                        parDefs[key] = subsDict[key]
+                    parDefs[instObj.stepVar] = stepVal
+                    stepDefs.append(parDefs)
             else:
                 # array stepping, number of steps is length of lists in stepArray
                 for i in range(len(instObj.stepArray[0])):
                     # substitute the i-th value for each step variable in the
                     # .parDefs dictionary.
+                    parDefs = {}
+                    for key in list(subsDict.keys()):
+                        parDefs[key] = subsDict[key]
                     for j in range(len(instObj.stepVars)):
-                        instObj.parDefs[instObj.stepVars[j]] = instObj.stepArray[j][i]
+                        parDefs[instObj.stepVars[j]] = instObj.stepArray[j][i]
+                    stepDefs.append(parDefs)
+            if ini.stepProcesses == 1 or len(stepDefs) < 2 or not doParallelSteps(instObj, stepDefs):
+                for parDefs in stepDefs:
+                    instObj.parDefs = parDefs
                     doDataType(instObj)
     else:
         # Create a deep copy of de circuit parameter definitions and do the 
@@ -252,12 +285,259 @@ def doInstruction(instObj):
         for key in list(instObj.circuit.parDefs.keys()):
             instObj.parDefs[key] = instObj.circuit.parDefs[key]
         doDataType(instObj)
+    updatePruneError(instObj)
     if instObj.gainType == 'asymptotic':
         # Restore the original loop gain reference element
         instObj.circuit.elements[instObj.lgRef] = oldLGrefElement
         instObj.circuit = updateCirData(instObj.circuit)
     return instObj
 
+STEPRESULTS = ['DCvalue', 'poles', 'zeros', 'svarTerms', 'ivarTerms',
+               'ovarTerms', 'ivar', 'ovar', 'dcSolve', 'dc', 'snoiseTerms',
+               'inoiseTerms', 'onoiseTerms', 'inoise', 'onoise', 'denom',
+               'numer', 'laplace', 'solve', 'time', 'impulse', 'stepResp',
+               'timeFunc', 'dcSens', 'poleSens', 'domPole', 'M', 'Dv', 'Iv']
+"""
+Attributes of **allResults()** objects that are returned by the processes
+that perform parallel parameter stepping.
+"""
+
+STEPINSTOBJ = None
+"""
+**allResults()** object of a worker process for parallel parameter stepping.
+"""
+
+def initStepWorker(instObj, settings):
+    """
+    Initializes a worker process for parallel parameter stepping.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param settings: Attributes of **ini** of the parent process.
+    :type settings: dict
+    """
+    global STEPINSTOBJ
+    for key in list(settings.keys()):
+        setattr(ini, key, settings[key])
+    STEPINSTOBJ = instObj
+
+def doStepWorker(parDefs):
+    """
+    Executes the instruction for one step in a worker process.
+
+    :param parDefs: Parameter definitions of this step.
+    :type parDefs: dict
+
+    :return: Dictionary with the results of this step; the keys are the names
+             of the attributes listed in **STEPRESULTS**.
+    :return type: dict
+    """
+    instObj = STEPINSTOBJ
+    for attr in STEPRESULTS:
+        if type(getattr(instObj, attr)) == list:
+            setattr(instObj, attr, [])
+        elif type(getattr(instObj, attr)) == dict:
+            setattr(instObj, attr, {})
+        elif isinstance(getattr(instObj, attr), iltFunction):
+            setattr(instObj, attr, None)
+    instObj.parDefs = parDefs
+    instObj.cofactors = None
+    doDataType(instObj)
+    results = {}
+    for attr in STEPRESULTS:
+        results[attr] = getattr(instObj, attr)
+    return results
+
+def doParallelSteps(instObj, stepDefs):
+    """
+    Executes the steps of a stepped instruction with ini.stepFunction == False
+    in a pool of ini.stepProcesses processes.
+
+    The results of the steps are merged in step order into the list attributes
+    of the **allResults()** object, as with serial execution.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param stepDefs: List with parameter definitions (*dict*) for each step.
+    :type stepDefs: list
+
+    :return: True if the steps have been executed, False if parallel execution
+             failed.
+    :return type: Bool
+    """
+    numProcesses = ini.stepProcesses
+    if numProcesses == None or numProcesses < 1:
+        numProcesses = os.cpu_count()
+    numProcesses = min(numProcesses, len(stepDefs))
+    chunkSize = max(1, len(stepDefs) // (4 * numProcesses))
+    # The lexer of the circuit cannot be passed to another process
+    lexer = instObj.circuit.lexer
+    instObj.circuit.lexer = None
+    cofactors = instObj.cofactors
+    instObj.cofactors = None
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers = numProcesses, initializer = initStepWorker, initargs = (instObj, vars(ini))) as pool:
+            results = list(pool.map(doStepWorker, stepDefs, chunksize = chunkSize))
+    except Exception as error:
+        print("Warning: parallel parameter stepping failed, continuing serially:", error)
+        return False
+    finally:
+        instObj.circuit.lexer = lexer
+        instObj.cofactors = cofactors
+    for result in results:
+        for attr in STEPRESULTS:
+            value = result[attr]
+            if type(value) == list:
+                getattr(instObj, attr).extend(value)
+            elif type(value) == dict:
+                for key in list(value.keys()):
+                    if key in getattr(instObj, attr):
+                        getattr(instObj, attr)[key].extend(value[key])
+                    else:
+                        getattr(instObj, attr)[key] = value[key]
+            elif isinstance(value, iltFunction) and isinstance(getattr(instObj, attr), iltFunction):
+                getattr(instObj, attr).extend(value)
+            else:
+                setattr(instObj, attr, value)
+    instObj.parDefs = stepDefs[-1]
+    return True
+
+def stepPolyCoeffs(instObj, function):
+    """
+    Returns the coefficients of the Laplace variable of a polynomial for all
+    steps.
+
+    The coefficients are extracted once and each coefficient is converted into
+    a numpy function of the step variable(s) that is evaluated for all step
+    values at once.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param function: Polynomial in ini.Laplace of which the coefficients depend
+                     on the step variable(s).
+    :type function: sympy.Expr
+
+    :return: Numpy array of which row i holds the coefficients, in descending
+             order, for step i. None if the coefficients depend on other
+             parameters than the step variable(s).
+    :return type: numpy.ndarray, NoneType
+    """
+    if instObj.stepMethod == 'array':
+        stepVars = [sp.Symbol(str(var)) for var in instObj.stepVars]
+        stepVals = [np.array(instObj.stepArray[j], dtype = float) for j in range(len(instObj.stepVars))]
+    else:
+        stepVars = [sp.Symbol(str(instObj.stepVar))]
+        stepVals = [np.array(instObj.stepList, dtype = float)]
+    try:
+        coeffs = polyCoeffs(sp.expand(sp.sympify(function)), ini.Laplace)
+    except:
+        return None
+    numSteps = len(stepVals[0])
+    result = np.zeros((numSteps, len(coeffs)))
+    for i in range(len(coeffs)):
+        coeff = sp.sympify(coeffs[i])
+        if len(coeff.free_symbols - set(stepVars)) != 0:
+            return None
+        func = sp.lambdify(stepVars, coeff, 'numpy')
+        try:
+            result[:, i] = np.real(func(*stepVals))
+        except:
+            return None
+    return result
+
+def stepRoots(instObj, function):
+    """
+    Returns the numeric roots of a polynomial in ini.Laplace for all steps.
+
+    The coefficients for all steps are obtained with **stepPolyCoeffs()**. If
+    that fails, the roots are calculated from the polynomials returned by
+    **stepFunctions()**.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param function: Polynomial in ini.Laplace of which the coefficients depend
+                     on the step variable(s).
+    :type function: sympy.Expr
+
+    :return: List with arrays of roots, one for each step.
+    :return type: list
+    """
+    coeffs = stepPolyCoeffs(instObj, function)
+    if type(coeffs) != type(None):
+        return batchRoots(coeffs)
+    return [numRoots(poly, ini.Laplace) for poly in stepFunctions(instObj, function)]
+
+def stepILT(instObj, numer, denom):
+    """
+    Returns the numeric inverse Laplace transforms of numer/denom for all
+    steps of a numeric instruction.
+
+    The coefficients for all steps are obtained with **stepPolyCoeffs()**. If
+    that fails, they are obtained from the functions returned by
+    **stepFunctions()**.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param numer: Numerator, polynomial in ini.Laplace of which the
+                  coefficients depend on the step variable(s).
+    :type numer: sympy.Expr
+
+    :param denom: Denominator, polynomial in ini.Laplace of which the
+                  coefficients depend on the step variable(s).
+    :type denom: sympy.Expr
+
+    :return: Numeric inverse Laplace transforms, or None if the instruction is
+             not numeric or if the coefficients are not numeric.
+    :return type: SLiCAPnumeric.iltFunction, NoneType
+    """
+    if not instObj.numeric:
+        return None
+    numers = stepPolyCoeffs(instObj, numer)
+    denoms = stepPolyCoeffs(instObj, denom)
+    if type(numers) != type(None) and type(denoms) != type(None):
+        size = max(numers.shape[1], denoms.shape[1])
+        numers = np.pad(numers, ((0, 0), (size - numers.shape[1], 0)))
+        denoms = np.pad(denoms, ((0, 0), (size - denoms.shape[1], 0)))
+        return iltFunction(numers, denoms)
+    return numILT(stepFunctions(instObj, numer), stepFunctions(instObj, denom))
+
+def doILT(instObj, numer, denom):
+    """
+    Returns the inverse Laplace transform of numer/denom.
+
+    For numeric instructions it is calculated with **SLiCAPnumeric.numILT()**
+    and the numeric inverse Laplace transform is stored in the attribute
+    *timeFunc* of the instruction, or appended to it for stepped
+    instructions. Else, or if the coefficients are not numeric, it is
+    calculated with **maxILT()**.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param numer: Numerator of the Laplace Transform.
+    :type numer: sympy.Expr
+
+    :param denom: Denominator of the Laplace Transform.
+    :type denom: sympy.Expr
+
+    :return: Time function
+    :return type: sympy.Expr
+    """
+    if instObj.numeric:
+        timeFunc = numILT([numer], [denom])
+        if type(timeFunc) != type(None):
+            if instObj.step and type(instObj.timeFunc) != type(None):
+                instObj.timeFunc.extend(timeFunc)
+            else:
+                instObj.timeFunc = timeFunc
+            return timeFunc.expr()
+    return maxILT(numer, denom, numeric = instObj.numeric)
+
 def stepFunctions(instObj, function):
     """
     Substitutes values for step parameters in functions and returns a list
@@ -339,7 +619,11 @@ def doDataType(instObj):
         else:
             instObj.laplace = doLaplace(instObj)         
     elif instObj.dataType == 'step':
-        instObj.stepResp = maxILT(doNumer(instObj), doDenom(instObj)*ini.Laplace, numeric = instObj.numeric)
+        stepResp = doILT(instObj, doNumer(instObj), doDenom(instObj)*ini.Laplace)
+        if instObj.step:
+            instObj.stepResp.append(stepResp)
+        else:
+            instObj.stepResp = stepResp
     elif instObj.dataType == 'impulse' or instObj.dataType == 'time':
         numer = doNumer(instObj)
         denom = doDenom(instObj)
@@ -349,12 +633,20 @@ def doDataType(instObj):
             denom = sp.expand(denom*nDen)
         if instObj.dataType == 'impulse':
             try:
-                instObj.impulse = maxILT(numer, denom, numeric = instObj.numeric)
+                impulse = doILT(instObj, numer, denom)
+                if instObj.step:
+                    instObj.impulse.append(impulse)
+                else:
+                    instObj.impulse = impulse
             except:
                 print("Warning: could not calculate the unit impulse response.")
         elif instObj.dataType == 'time':
             try:
-                instObj.time = maxILT(numer, denom, numeric = instObj.numeric)
+                timeResp = doILT(instObj, numer, denom)
+                if instObj.step:
+                    instObj.time.append(timeResp)
+                else:
+                    instObj.time = timeResp
             except:
                 print("Warning: could not calculate the time response.")
     elif instObj.dataType == 'solve':
@@ -362,6 +654,14 @@ def doDataType(instObj):
             instObj.solve.append(doSolve(instObj))
         else:
             instObj.solve = doSolve(instObj)
+    elif instObj.dataType == 'noise' and instObj.numeric and ini.numericNoise and not instObj.step:
+        # Spectra will be evaluated on a frequency grid by numNoise()
+        instObj.onoise = None
+        instObj.inoise = None
+        for key in instObj.circuit.indepVars:
+            params = instObj.circuit.elements[key].params
+            if 'noise' in list(params.keys()) and params['noise'] != 0:
+                instObj.snoiseTerms[key] = params['noise']
     elif instObj.dataType == 'noise':
         # Calculate the contributions of each noise source to the
         # spectral density of the total output noise
@@ -374,8 +674,9 @@ def doDataType(instObj):
         if instObj.source != None:
             # Calculate the squared gain from source to detector as a
             # function of ini.frequency
-            numer = assumeRealParams(maxNumer(instObj.M, detP, detN, srcP, srcN).subs(ini.Laplace, ini.frequency*2*sp.pi*sp.I))
-            denom = assumeRealParams(maxDet(instObj.M).subs(ini.Laplace, ini.frequency*2*sp.pi*sp.I))
+            cofactors = makeCofactors(instObj)
+            numer = assumeRealParams(cofactors.numer(detP, detN, srcP, srcN).subs(ini.Laplace, ini.frequency*2*sp.pi*sp.I))
+            denom = assumeRealParams(cofactors.det().subs(ini.Laplace, ini.frequency*2*sp.pi*sp.I))
             nR, nI = numer.as_real_imag()
             numer2 = nR**2 + nI**2
             dR, dI = denom.as_real_imag()
@@ -425,34 +726,65 @@ def doDataType(instObj):
             instObj.dcSolve.append(doSolveDC(instObj))
         else:
             instObj.dcSolve = doSolveDC(instObj)
+    elif instObj.dataType == 'sensitivity':
+        # Derivatives of the DC value and of the dominant pole with respect
+        # to all circuit parameters
+        dcSens = numDCsens(instObj)
+        if type(dcSens) == type(None):
+            dcSens = {}
+        poleSens = numPoleSens(instObj)
+        if type(poleSens) == type(None):
+            pole, poleSens = None, {}
+        else:
+            pole, poleSens = poleSens
+        if instObj.step:
+            for (attr, sens) in [('dcSens', dcSens), ('poleSens', poleSens)]:
+                for key in list(sens.keys()):
+                    if key in getattr(instObj, attr):
+                        getattr(instObj, attr)[key].append(sens[key])
+                    else:
+                        getattr(instObj, attr)[key] = [sens[key]]
+            instObj.domPole.append(pole)
+        else:
+            instObj.dcSens = dcSens
+            instObj.poleSens = poleSens
+            instObj.domPole = pole
     elif instObj.dataType == 'dcvar':
-        # Calculate the contributions of each dcvar source to the
-        # variance at the detector
-        detP, detN, srcP, srcN = makeSrcDetPos(instObj)
-        ovarTerms, dcSol = doDCvar(instObj, detP, detN)
-        ivarTerms = {}
-        svarTerms = {}
-        ovar      = 0
         alreadyKeys = list(instObj.ovarTerms.keys())
-        if instObj.source != None:
-            # Calculate the squared DC gain from source to detector
-            M = instObj.M.subs(ini.Laplace, 0)
-            numer2 = (maxNumer(M, detP, detN, srcP, srcN, numeric = instObj.numeric))**2
-            denom2 = (maxDet(M, numeric = instObj.numeric))**2
-            try:
-                gain2 = sp.simplify(numer2/denom2)
-            except:
-                gain2 = simplify(numer2/denom2, method = 'fraction')
-            ivar = 0
-        for key in list(ovarTerms.keys()):
-            ovar += ovarTerms[key]
-            svarTerms[key] = instObj.circuit.elements[key].params['dcvar']
+        monteCarlo = None
+        if instObj.numeric and ini.dcvarSamples > 0:
+            # Estimate the variances from Monte-Carlo samples
+            monteCarlo = numDCvar(instObj)
+        if monteCarlo != None:
+            (ovar, ivar, ovarTerms, ivarTerms, svarTerms, dcSol) = monteCarlo
+        else:
+            # Calculate the contributions of each dcvar source to the
+            # variance at the detector
+            detP, detN, srcP, srcN = makeSrcDetPos(instObj)
+            ovarTerms, dcSol = doDCvar(instObj, detP, detN)
+            ivarTerms = {}
+            svarTerms = {}
+            ovar      = 0
             if instObj.source != None:
+                # Calculate the squared DC gain from source to detector
+                M = instObj.M.subs(ini.Laplace, 0)
+                numer2 = (maxNumer(M, detP, detN, srcP, srcN, numeric = instObj.numeric))**2
+                denom2 = (maxDet(M, numeric = instObj.numeric))**2
                 try:
-                    ivarTerms[key] = sp.simplify(ovarTerms[key]/gain2)
+                    gain2 = sp.simplify(numer2/denom2)
                 except:
-                    ivarTerms[key] = simplify(ovarTerms[key]/gain2, method = 'fraction')
-                ivar += ivarTerms[key]
+                    gain2 = simplify(numer2/denom2, method = 'fraction')
+                ivar = 0
+            for key in list(ovarTerms.keys()):
+                ovar += ovarTerms[key]
+                svarTerms[key] = instObj.circuit.elements[key].params['dcvar']
+                if instObj.source != None:
+                    try:
+                        ivarTerms[key] = sp.simplify(ovarTerms[key]/gain2)
+                    except:
+                        ivarTerms[key] = simplify(ovarTerms[key]/gain2, method = 'fraction')
+                    ivar += ivarTerms[key]
+        for key in list(ovarTerms.keys()):
             if instObj.step:
                 if key in alreadyKeys:
                     instObj.ovarTerms[key].append(ovarTerms[key])
@@ -481,6 +813,126 @@ def doDataType(instObj):
             instObj.dcSolve = dcSol
     return instObj
 
+def makeCofactors(instObj):
+    """
+    Returns the determinant and cofactors of the MNA matrix instObj.M.
+
+    The **matrixCofactors()** object is created once for each MNA matrix and
+    stored in instObj.cofactors, such that determinants and cofactors are
+    calculated only once during the execution of an instruction. At its
+    creation, the cofactors of the numerator of the transfer are requested if
+    the data type requires both the numerator and the denominator. These
+    cofactors will then be calculated in one pass with the determinant.
+
+    If ini.schurReduction is True, the sub circuit instances of the circuit
+    are passed to the object, see **subcircuitBlocks()**.
+
+    If ini.pruneTolerance > 0 and the simulation type is 'symbolic', the
+    nominal parameter values are passed to the object for pruning of the
+    results, see **nominalValues()**. The achieved error of the pruning is
+    accumulated in instObj.pruneError.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: Determinant and cofactors of the MNA matrix
+    :return type: **matrixCofactors()** object
+    """
+    if instObj.cofactors == None or instObj.cofactors.M is not instObj.M:
+        updatePruneError(instObj)
+        blocks = None
+        if ini.schurReduction:
+            blocks = subcircuitBlocks(instObj)
+        nominal = None
+        if ini.pruneTolerance > 0 and not instObj.numeric:
+            nominal = nominalValues(instObj)
+        instObj.cofactors = matrixCofactors(instObj.M, blocks, nominal)
+        if instObj.gainType in ['loopgain', 'servo'] or (instObj.source != None and (instObj.gainType != 'vi' or instObj.dataType == 'noise')):
+            if instObj.gainType == 'servo' or instObj.dataType in ['pz', 'laplace', 'step', 'impulse', 'time', 'noise']:
+                (detP, detN, srcP, srcN) = makeSrcDetPos(instObj)
+                instObj.cofactors.requestNumer(detP, detN, srcP, srcN)
+    return instObj.cofactors
+
+def nominalValues(instObj):
+    """
+    Returns the nominal numeric values of the parameters in the MNA matrix
+    instObj.M, obtained from the circuit parameter definitions.
+
+    Parameters without a numeric value are omitted.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: Dictionary with key-value pairs:
+
+             - key (*sympy.Symbol*): parameter
+             - value (*sympy.Float*): nominal value of the parameter
+    :return type: dict
+    """
+    instObj.circuit.resolver.update(instObj.circuit.parDefs)
+    values = {}
+    for par in instObj.M.free_symbols:
+        if par != ini.Laplace:
+            value = instObj.circuit.resolver.numValue(par)
+            if isinstance(value, sp.Basic) and value.is_number:
+                values[par] = value
+    return values
+
+def updatePruneError(instObj):
+    """
+    Updates instObj.pruneError with the achieved error of the pruning of the
+    determinant and numerators in instObj.cofactors.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+    """
+    if instObj.cofactors != None:
+        instObj.pruneError = max(instObj.pruneError, instObj.cofactors.pruneError)
+
+def subcircuitBlocks(instObj):
+    """
+    Returns the positions of the internal variables and the port variables
+    of the sub circuit and model instances of the circuit in the vector with
+    dependent variables instObj.Dv.
+
+    The internal variables of an instance are the voltages of its local nodes
+    and the branch currents of its elements. They are sorted by their names
+    without the instance suffix, and the ports are sorted in the order of the
+    nodes of the instance, such that identical instances yield identical
+    matrices.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: List with (suffix, internal, ports) tuples, see
+             **portModel()**.
+    :return type: list
+    """
+    names = [str(var) for var in instObj.Dv]
+    index = {names[i]: i for i in range(len(names))}
+    blocks = []
+    for refDes in list(instObj.circuit.instances.keys()):
+        (nodes, elements) = instObj.circuit.instances[refDes]
+        suffix = '_' + refDes
+        internal = []
+        for name in elements:
+            if name not in list(instObj.circuit.elements.keys()):
+                continue
+            elmt = instObj.circuit.elements[name]
+            varNames = ['V_' + node for node in elmt.nodes if node not in nodes and node != '0']
+            varNames += [depVar + '_' + name for depVar in MODELS[elmt.model].depVars]
+            for var in varNames:
+                if var in index and index[var] not in internal:
+                    internal.append(index[var])
+        internal.sort(key = lambda i: names[i][0: len(names[i]) - len(suffix)] if names[i].endswith(suffix) else names[i])
+        ports = []
+        for node in nodes:
+            var = 'V_' + node
+            if var in index and index[var] not in ports:
+                ports.append(index[var])
+        blocks.append((suffix, internal, ports))
+    return blocks
+
 def doDenom(instObj):
     """
     Calculates the denominator of a transfer by evaluating the determinant
@@ -511,10 +963,11 @@ def doDenom(instObj):
 
     :return type: sympy.Expr
     """
-    denom = maxDet(instObj.M)
+    cofactors = makeCofactors(instObj)
+    denom = cofactors.det()
     if instObj.gainType == 'servo':
         (detP, detN, srcP, srcN) = makeSrcDetPos(instObj)
-        numer = maxNumer(instObj.M, detP, detN, srcP, srcN)
+        numer = cofactors.numer(detP, detN, srcP, srcN)
         lgNumer, lgDenom = sp.fraction(sp.together(lgValue(instObj)))
         #lgNumer, lgDenom = lgValue(instObj).as_numer_denom()
         numer = numer * - lgNumer
@@ -533,248 +986,22 @@ def doPoles(instObj):
     transfer defined by the gain type. It then calculates the numerical roots
     by calling **SLiCAPmath.numRoots()**.
 
+    If ini.numericPZ is True, numeric poles are calculated with
+    **SLiCAPnumeric.numPZ()**, without calculation of the denominator.
+
     :param instObj: **allResults()** object that holds instruction data.
     :type instObj: :class:`allResult()`
 
     :return: list with numerical roots of the denominator of a transfer
     :return type: list
     """
+    if ini.numericPZ:
+        result = numPZ(instObj, zeros = False)
+        if result != None:
+            return result[0]
     denom = sp.expand(sp.collect(doDenom(instObj).evalf(), ini.Laplace))
     return numRoots(denom, ini.Laplace)
 
-def lgValue(instObj):
-    """
-    Calculates the corrected gain of the loop gain reference.
-
-    In case of a loop gain reference of the type EZ and HZ the calculation of
-    the loop gain is performed as if a current source was placed in parallel
-    with the output impedance (zo) of this controlled source (Norton equivalent
-    representation). The value of this current source is that of the loop gain
-    reference divided by the output impedance of the device.
-
-    :param instObj: **allResults()** object that holds instruction data.
-    :type instObj: :class:`allResult()`
-
-    :return: Gain of the loop gain reference, modified in a Norton equivalent
-             in cases in which the model of the loop gain reference is 'EZ' or
-             'HZ'.
-
-    :return type: sympy.
-    """
-    lgRef = instObj.circuit.elements[instObj.lgRef]
-    if lgRef.model == 'g':
-        value = lgRef.params['value']
-    elif lgRef.model == 'E':
-        value = lgRef.params['value']
-    elif lgRef.model == 'EZ':
-        if lgRef.params['zo'] != 0:
-            value = lgRef.params['value']/lgRef.params['zo']
-        else:
-            value = lgRef.params['value']
-    elif lgRef.model == 'HZ':
-        if lgRef.params['zo'] != 0:
-            value = lgRef.params['value']/lgRef.params['zo']
-        else:
-            value = lgRef.params['value']
-    elif lgRef.model == 'H':
-        value = lgRef.params['value']
-    elif lgRef.model == 'F':
-        value = lgRef.params['value']
-    elif lgRef.model == 'G':
-        value = lgRef.params['value']
-    if instObj.simType == 'numeric':
-        value = fullSubs(value, instObj.parDefs)
-    return value
-
-def makeSrcDetPos(instObj):
-    """
-    Returns the number of the source row(s) and detector colum(s) for
-    calculation of cofactors or for application of Cramer's rule.
-
-    If the gain type is 'loopgain' or 'servo', the source and the detector are
-    taken at the input and the output of the loop gain reference.
-
-    :param instObj: **allResults()** object that holds instruction data.
-    :type instObj: :class:`allResult()`
-
-    :return: tuple: (detP, detN, srcP, srcN):
-
-            - detP (*None, int*): number of the row of the vector with dependent
-              variables that corresponds with the positive detector
-            - detN (*None, int*): number of the row of the vector with dependent
-              variables that corresponds with the negative detector
-            - srcP (*None, int*): number of the row of the vector with dependent
-              variables that corresponds with the positive source
-            - srcN (*None, int*): number of the row of the vector with dependent
-              variables that corresponds with the negative source
-
-    :return type: tuple
-    """
-    detectors = []
-    for var in instObj.circuit.depVars:
-        if var != 'V_0':
-            detectors.append(var)
-    if instObj.gainType == 'loopgain' or instObj.gainType == 'servo':
-        lgRef = instObj.circuit.elements[instObj.lgRef]
-        if lgRef.model == 'E':
-            # The detector nodes are the inP and inN nodes of the VCVS
-            srcP = detectors.index('Io_' + instObj.lgRef)
-            srcN = None
-            # The source row is that of the current through the controlled
-            # voltage source
-            if lgRef.nodes[2] == '0':
-                detP = None
-            else:
-                detP = detectors.index('V_' + lgRef.nodes[2])
-            if lgRef.nodes[3] == '0':
-                detN = None
-            else:
-                detN = detectors.index('V_' + lgRef.nodes[3])
-        elif lgRef.model == 'EZ':
-            # The detector nodes are the inP and inN nodes of the VCVS
-            if lgRef.nodes[2] == '0':
-                detP = None
-            else:
-                detP = detectors.index('V_' + lgRef.nodes[2])
-            if lgRef.nodes[3] == '0':
-                detN = None
-            else:
-                detN = detectors.index('V_' + lgRef.nodes[3])
-            if lgRef.params['zo'] != 0:
-                # A current source in parallel with Zo, hence flowing from the
-                # outN node to the outP node of the device is the new source.
-                # The gain of the reference variable needs to be divided by the
-                # value of Zo.
-                if lgRef.nodes[0] == '0':
-                    srcP = None
-                else:
-                    srcP = detectors.index('V_' + lgRef.nodes[0])
-                if lgRef.nodes[1] == '0':
-                    srcN = None
-                else:
-                    srcN = detectors.index('V_' + lgRef.nodes[1])
-            else:
-                # If Zo is zero the method for model 'E' must be applied.
-                srcP = detectors.index('Io_' + instObj.lgRef)
-                srcN = None
-        elif lgRef.model == 'F':
-            # The detector row is that of the input current of the CCCS
-            detP = detectors.index('Ii_' + instObj.lgRef)
-            detN = None
-            # The source rows correspond with those of the nodes of the
-            # controlled current source at the output of the device.
-            if lgRef.nodes[1] == '0':
-                srcP = None
-            else:
-                srcP = detectors.index('V_' + lgRef.nodes[1])
-            if lgRef.nodes[0] == '0':
-                srcN = None
-            else:
-                srcN = detectors.index('V_' + lgRef.nodes[0])
-        elif lgRef.model == 'G':
-            # The detector rows correspond with those of the input nodes
-            # of the VCCS.
-            if lgRef.nodes[2] == '0':
-                detP = None
-            else:
-                detP = detectors.index('V_' + lgRef.nodes[2])
-            if lgRef.nodes[3] == '0':
-                detN = None
-            else:
-                detN = detectors.index('V_' + lgRef.nodes[3])
-            # The source current source flows from the outN node to the
-            # outP node of the device.
-            if lgRef.nodes[0] == '0':
-                srcN = None
-            else:
-                srcN = detectors.index('V_' + lgRef.nodes[0])
-            if lgRef.nodes[1] == '0':
-                srcP = None
-            else:
-                srcP = detectors.index('V_' + lgRef.nodes[1])
-        elif lgRef.model == 'g':
-            # The detector rows correspond with those of the input nodes
-            # of the VCCS.
-            if lgRef.nodes[2] == '0':
-                detP = None
-            else:
-                detP = detectors.index('V_' + lgRef.nodes[2])
-            if lgRef.nodes[3] == '0':
-                detN = None
-            else:
-                detN = detectors.index('V_' + lgRef.nodes[3])
-            # The source current source flows from the outN node to the
-            # outP node of the device.
-            if lgRef.nodes[1] == '0':
-                srcP = None
-            else:
-                srcP = detectors.index('V_' + lgRef.nodes[1])
-            if lgRef.nodes[0] == '0':
-                srcN = None
-            else:
-                srcN = detectors.index('V_' + lgRef.nodes[0])
-        elif lgRef.model == 'H':
-            # The detector row is that of the input current of the CCVS
-            detP = detectors.index('Ii_' + instObj.lgRef)
-            detN = None
-            # The source row is that of the output current of the CCVS
-            srcP = detectors.index('Io_' + instObj.lgRef)
-            srcN = None
-        elif lgRef.model == 'HZ':
-            # The detector row is that of the input current of the CCVS
-            detP = detectors.index('Ii_' + instObj.lgRef)
-            detN = None
-            if lgRef.params['zo'] != 0:
-                # A current source in parallel with Zo, hence flowing from the
-                # outN node to the outP node of the device is the new source.
-                # The gain of the reference variable needs to be divided by the
-                # value of Zo.
-                if lgRef.nodes[0] == '0':
-                    srcP = None
-                else:
-                    srcP = detectors.index('V_' + lgRef.nodes[0])
-                if lgRef.nodes[1] == '0':
-                    srcN = None
-                else:
-                    srcN = detectors.index('V_' + lgRef.nodes[1])
-            else:
-                # If Zo equals zero the method for model 'H' must be applied.
-                srcP = detectors.index('Io_' + instObj.lgRef)
-                srcN = None
-    else:
-        # For all other gain types:
-        # The detector rows are those that correspond with the dependent
-        # variables of the detector.
-        (detP, detN) = instObj.detector
-        if detP != None:
-            detP = detectors.index(detP)
-        if detN != None:
-            detN = detectors.index(detN)
-        if instObj.source != None:
-            # If there is s source defined:
-            if instObj.source[0].upper() == 'V':
-                # The source row corresponds with that of the current through
-                # the voltage source
-                srcP = detectors.index('I_' + instObj.source)
-                srcN = None
-            elif instObj.source[0].upper() == 'I':
-                # The source rows correspond with those of the nodal voltages
-                # of the source nodes
-                nodes = instObj.circuit.elements[instObj.source].nodes
-                if nodes[0] != '0':
-                    srcN = detectors.index('V_' + nodes[0])
-                else:
-                    srcN = None
-                if nodes[1] != '0':
-                    srcP = detectors.index('V_' + nodes[1])
-                else:
-                    srcP = None
-        else:
-            # If there is no source defines, srcP and srcN are set to 'None'
-            srcP = None
-            srcN = None
-    return(detP, detN, srcP, srcN)
-
 def doNumer(instObj):
     """
     Calculates the numerator of a transfer by evaluating cofactors or by using
@@ -812,9 +1039,9 @@ def doNumer(instObj):
         # Todo:
         # Iv can have Laplace rationals in it, check if this works with ILT
         Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'value', numeric = instObj.numeric)
-        return maxCramerNumer(instObj.M, Iv, detP, detN)
+        return makeCofactors(instObj).cramer(Iv, detP, detN)
     else:
-        numer = maxNumer(instObj.M, detP, detN, srcP, srcN)
+        numer = makeCofactors(instObj).numer(detP, detN, srcP, srcN)
         if instObj.gainType == 'loopgain' or instObj.gainType == 'servo':
             lgNumer, lgDenom = sp.fraction(sp.together(lgValue(instObj)))
             #lgNumer, lgDenom = lgValue(instObj).as_numer_denom()
@@ -831,12 +1058,19 @@ def doZeros(instObj):
     transfer defined by the gain type. It then calculates the numerical roots
     by calling **SLiCAPmath.numRoots()**.
 
+    If ini.numericPZ is True, numeric zeros are calculated with
+    **SLiCAPnumeric.numPZ()**, without calculation of the numerator.
+
     :param instObj: **allResults()** object that holds instruction data.
     :type instObj: :class:`allResult()`
 
     :return: list with numerical roots of the numerator of a transfer
     :return type: list
     """
+    if ini.numericPZ:
+        result = numPZ(instObj, poles = False)
+        if result != None:
+            return result[1]
     numer = sp.expand(sp.collect(doNumer(instObj).evalf(), ini.Laplace))
     return numRoots(numer, ini.Laplace)
 
@@ -851,12 +1085,22 @@ def doPZ(instObj):
     - Cancel poles and zeros that coincide within a relative tolerance of
       :math:`10^{-\mathrm{ini.disp}}`.
 
+    If ini.numericPZ is True, numeric poles, zeros and the DC value are
+    calculated with **SLiCAPnumeric.numPZ()**, without calculation of the
+    numerator and the denominator.
+
     :param instObj: **allResults()** object that holds instruction data.
     :type instObj: :class:`allResult()`
 
     :return: tuple: (poles, zeros, DCvalue)
     :return type: tuple
     """
+    if ini.numericPZ:
+        result = numPZ(instObj)
+        if result != None:
+            (poles, zeros, DCvalue) = result
+            (poles, zeros) = cancelPZ(poles, zeros)
+            return(poles, zeros, DCvalue)
     numer = sp.expand(sp.collect(doNumer(instObj).evalf(), ini.Laplace))
     denom = sp.expand(sp.collect(doDenom(instObj).evalf(), ini.Laplace))
     poles = numRoots(denom, ini.Laplace)
@@ -929,19 +1173,21 @@ def doNoise(instObj, detP, detN, denom2):
     :return type: dict
     """
     onoiseTerms = {}
+    cofactors = makeCofactors(instObj)
     if denom2 == None:
-        denom = maxDet(instObj.M, numeric = instObj.numeric)
+        denom = cofactors.det(numeric = instObj.numeric)
         denom = assumeRealParams(denom.subs(ini.Laplace, 2*sp.pi*sp.I*ini.frequency))
         dR, dI = denom.as_real_imag()
         denom2 = dR**2 + dI**2
     denom2 = sp.factor(denom2)
     Iv = makeSrcVector(instObj.circuit, instObj.circuit.parDefs, 'all', value = 'id', numeric = instObj.numeric)
-    allTerms =  maxCramerNumer(instObj.M, Iv, detP, detN, numeric = instObj.numeric)
+    allTerms =  cofactors.cramer(Iv, detP, detN, numeric = instObj.numeric)
     noiseContribs = list(allTerms.atoms(sp.Symbol))
+    instObj.circuit.resolver.update(instObj.parDefs)
     for src in instObj.circuit.indepVars:
         if 'noise' in list(instObj.circuit.elements[src].params.keys()) and instObj.circuit.elements[src].params['noise'] != 0:
             if instObj.numeric:
-                value = fullSubs(instObj.circuit.elements[src].params['noise'], instObj.parDefs)
+                value = instObj.circuit.resolver.subs(instObj.circuit.elements[src].params['noise'])
             else:
                 value = instObj.circuit.elements[src].params['noise']
             noiseSource = sp.Symbol(src)
@@ -1076,12 +1322,13 @@ def doDCvar(instObj, detP, detN):
     # Now all terms of the numerator
     allTerms = maxCramerNumer(M, Iv, detP, detN, numeric = instObj.numeric)
     ovarTerms = {}
+    instObj.circuit.resolver.update(instObj.parDefs)
     for src in instObj.circuit.indepVars:
         # Now the squared numerator for sources that have a nonzero dcVar value.
         if 'dcvar' in list(instObj.circuit.elements[src].params.keys()) and instObj.circuit.elements[src].params['dcvar'] != 0:
             if instObj.numeric:
                 # Calculate the numeric value of the source
-                value = fullSubs(instObj.circuit.elements[src].params['dcvar'], instObj.parDefs)
+                value = instObj.circuit.resolver.subs(instObj.circuit.elements[src].params['dcvar'])
             else:
                 value = instObj.circuit.elements[src].params['dcvar']
             # Select the coefficient for each variance source from allTerms
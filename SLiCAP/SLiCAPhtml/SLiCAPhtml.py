@@ -750,6 +750,9 @@ def noise2html(instObj, label = '', labelText = ''):
     elif instObj.step == True :
         print("Error: parameter stepping not implemented for 'noise2html()'.")
         return html
+    elif type(instObj.onoise) == type(None):
+        print("Error: 'noise2html()' requires symbolic noise spectra, these are not calculated if ini.numericNoise == True.")
+        return html
     if label != '':
         if labelText == '':
             labelText = label
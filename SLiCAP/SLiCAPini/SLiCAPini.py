@@ -14,13 +14,22 @@ import numpy as np
 import sympy as sp
 import requests
 from scipy.signal import residue
-from scipy.optimize import newton, fsolve
+from scipy.linalg import eigvals, lu_factor, lu_solve
+from scipy.optimize import newton, fsolve, linear_sum_assignment
 import ply.lex as lex
 from shutil import copy2 as cp
 from time import time
 from datetime import datetime
 import re
+from collections import defaultdict
+from copy import deepcopy
+import hashlib
+import pickle
 import subprocess
+import concurrent.futures
+import threading
+import queue
+import atexit
 import platform
 import os
 import getpass
@@ -113,6 +122,7 @@ class settings(object):
        - latexPath         : Directory with csv files for HTML tables
        - mathmlPath        : Directory for mathML output
        - imgPath           : Directory with images for HTML output
+       - cachePath         : Directory with cached results
        - defaultLib        : Directory with SLiCAP basic library files
        - docPath           : Directory with html documentation
 
@@ -148,6 +158,8 @@ class settings(object):
          - True: use Sympy.lambify for parameter stepping
          - False : substitute step parameters in matrix
 
+       - stepProcesses     : Number of processes for stepping by substitution
+
        - Hz:
 
          - True: frequency in Hz and phase in degrees
@@ -161,6 +173,27 @@ class settings(object):
          of the Laplace variable will be normalized to unity.
        - factor: True: Try to factor the numerator and denominator of expressions.
        - MaximaMatrixDim   : Maximum dimension of a square matrix to be passed to Maxima
+       - detMethod         : Method for calculation of determinants
+       - detProcesses      : Number of processes for ini.detMethod == 'zippel'
+       - schurReduction    : True: elimination of internal variables of sub circuits
+       - pruneTolerance    : Relative error tolerance of pruning of symbolic determinants
+       - depVarOrder       : Ordering of the dependent variables in the MNA matrix
+       - MaximaSessions    : Number of persistent Maxima sessions used by maxEval
+       - MaximaCache       : True: store results of maxEval in a disk cache
+       - MaximaCacheSize   : Maximum size of the Maxima disk cache in MB
+       - numericPZ         : True: numeric poles and zeros from eigenvalues
+       - numericSweep      : True: plotSweep() solves the numeric MNA equations
+       - numericNoise      : True: numeric noise spectra are evaluated on a frequency grid
+       - numIntTol         : Relative tolerance of numeric integration of noise spectra
+       - dcvarSamples      : Number of Monte-Carlo samples of numeric dcvar analysis
+       - dcvarSeed         : Seed of the random generator of Monte-Carlo dcvar analysis
+       - dcvarChunk        : Number of Monte-Carlo samples solved at once
+
+    #. Library and circuit settings
+
+       - libCache          : True: store compiled libraries in a disk cache
+       - circuitCache      : True: reuse checked circuits from memory
+       - circuitDiskCache  : True: store checked circuits in a disk cache
 
     #. Display settings
 
@@ -267,6 +300,11 @@ class settings(object):
         Path (*str*), to image files will be set by **SLiCAP.initProject()**;  defaults to None.
         """
 
+        self.cachePath          = None
+        """
+        Path (*str*), to cached results will be set by **SLiCAP.initProject()**;  defaults to None.
+        """
+
         self.mathml             = False
         """
         (*Bool*) setting for rendering math in html pages.
@@ -341,6 +379,15 @@ class settings(object):
          - False : substitute step parameters in matrix
          """
 
+        self.stepProcesses      = 1
+        """
+        Number of processes (*int*) for parameter stepping with
+        ini.stepFunction == False. The steps are distributed over a pool of
+        processes and the results are merged in step order. If set to 1 all
+        steps are executed in the current process, if set to 0 the number of
+        processes equals the number of CPUs. Defaults to 1.
+        """
+
         self.maxSolve           = True
         """
         (*Bool*)
@@ -471,6 +518,214 @@ class settings(object):
         Maximum size of sa square matrix to be passed to maxima.
         """
 
+        self.detMethod          = 'maxima'
+        """
+        Method (*str*) for the calculation of determinants and cofactors by
+        **maxDet()**, **maxNumer()** and **maxCramerNumer()**:
+
+        - 'maxima': Maxima CAS
+        - 'minors': sparse minor expansion with memoized sub-minors in Python
+        - 'bareiss': fraction-free elimination with sparse pivoting in Python
+        - 'fft': evaluation at points on circles in the complex plane and
+          interpolation with the FFT, for matrices of which the entries are
+          polynomials of the Laplace variable with numeric coefficients;
+          'minors' is used for other matrices
+        - 'zippel': sparse interpolation of the determinant in all symbols
+          from evaluations modulo primes; 'minors' is used for matrices with
+          entries that are not rational functions of the symbols
+        - 'ddd': extraction of the coefficients of the Laplace variable from a
+          determinant decision diagram of the matrix, see **DDD()**; the
+          diagram is available as the attribute 'ddd' of the cofactors
+          (instruction result attribute 'cofactors')
+
+        Defaults to 'maxima'.
+        """
+
+        self.detProcesses       = 1
+        """
+        Number of processes (*int*) for the evaluations modulo primes with
+        ini.detMethod == 'zippel'. If set to 1 all evaluations are performed
+        in the current process, if set to 0 the number of processes equals the
+        number of CPUs. Defaults to 1.
+        """
+
+        self.schurReduction     = False
+        """
+        (*Bool*)
+
+        - True: the internal variables of each sub circuit or model instance
+          are eliminated before the calculation of determinants and cofactors
+          (Schur complement). The port description of each unique instance is
+          calculated only once and stored for reuse, see
+          **matrixCofactors()**. Not used with ini.detMethod == 'fft'.
+        - False: determinants and cofactors of the flat MNA matrix
+
+        Defaults to False.
+        """
+
+        self.pruneTolerance     = 0
+        """
+        Relative error tolerance (*float*) per coefficient of the Laplace
+        variable for the pruning of determinants and transfer numerators of
+        symbolic MNA matrices. Terms of which the sum of the magnitudes at the nominal
+        parameter values, obtained from the circuit parameter definitions, is
+        smaller than this tolerance times the magnitude of the coefficient are
+        removed, see **pruneTerms()**. The achieved error is stored in the
+        attribute 'pruneError' of the instruction results. For the gain type
+        'servo', the denominator is composed of the pruned determinant and the
+        pruned numerator of the loop gain; its error is not included. If set
+        to 0, no terms are removed. Defaults to 0.
+        """
+
+        self.depVarOrder        = 'auto'
+        """
+        Ordering (*str*) of the dependent variables in the MNA matrix, applied
+        by **sortDepVars()** during checking of a circuit:
+
+        - 'heuristic': independent voltage sources and controlled sources
+          connected to ground first, followed by the other branch currents and
+          the nodal voltages
+        - 'mindegree': minimum-degree ordering of the structural pattern of
+          the MNA matrix, this minimizes the fill-in during elimination and
+          the number of terms in a minor expansion
+        - 'auto': 'mindegree' if ini.detMethod is not 'maxima', else
+          'heuristic'
+
+        Defaults to 'auto'.
+        """
+
+        self.MaximaSessions     = 1
+        """
+        Number (*int*) of persistent Maxima sessions used by **maxEval()**.
+        The sessions are started at their first use and are kept alive for
+        subsequent evaluations. If set to 0, each evaluation starts a new
+        Maxima process. Defaults to 1.
+        """
+
+        self.MaximaCache        = True
+        """
+        (*Bool*)
+
+        - True: results of **maxEval()** are stored in a disk cache in the
+          directory ini.cachePath, and identical evaluations are read from this
+          cache.
+        - False: each evaluation is performed by Maxima CAS
+
+        Defaults to True.
+        """
+
+        self.MaximaCacheSize    = 100
+        """
+        Maximum size in MB (*int, float*) of the Maxima disk cache. The least
+        recently used results are removed if the cache exceeds this size.
+        Defaults to 100.
+        """
+
+        self.numericPZ          = True
+        """
+        (*Bool*)
+
+        - True: numeric poles and zeros are calculated as the generalized
+          eigenvalues of the MNA matrix and of the MNA matrix bordered with the
+          source and the detector, without expansion of determinants.
+        - False: numeric poles and zeros are calculated as the roots of the
+          denominator and the numerator of the transfer.
+
+        This setting only applies to instructions with simType 'numeric'.
+        Defaults to True.
+        """
+
+        self.numericSweep       = True
+        """
+        (*Bool*)
+
+        - True: **plotSweep()** calculates the magnitude, the phase and the
+          group delay of numeric results of the data types 'laplace' and
+          'matrix' by solving the MNA equations at each frequency.
+        - False: **plotSweep()** evaluates the Laplace transform of the result.
+
+        Defaults to True.
+        """
+
+        self.numericNoise       = False
+        """
+        (*Bool*)
+
+        - True: instructions with simType 'numeric' and dataType 'noise',
+          without parameter stepping, do not calculate symbolic noise spectra.
+          The spectra are evaluated at the frequencies of a plot or of a
+          numeric integration with **SLiCAPnumeric.numNoise()**, which
+          performs one adjoint solve of the MNA equations per frequency.
+        - False: noise spectra are calculated as functions of ini.frequency.
+
+        Defaults to False.
+        """
+
+        self.numIntTol          = 1e-6
+        """
+        Relative tolerance (*float*) of the numeric integration of noise
+        spectra by **rmsNoise()**. Defaults to 1e-6.
+        """
+
+        self.dcvarSamples       = 0
+        """
+        Number of Monte-Carlo samples (*int*) of numeric 'dcvar' analysis. If
+        greater than zero, the numeric dcvar variance is estimated from
+        Monte-Carlo samples of the values of independent sources and resistors
+        with a nonzero 'dcvar' parameter. Defaults to 0: analytic linear
+        variance estimate.
+        """
+
+        self.dcvarSeed          = None
+        """
+        Seed (*int, NoneType*) of the random number generator of Monte-Carlo
+        dcvar analysis. Defaults to None: results are not reproducible.
+        """
+
+        self.dcvarChunk         = 1000
+        """
+        Number of Monte-Carlo samples (*int*) of which the DC systems are
+        solved at once. Results of chunks are accumulated, hence memory
+        usage does not grow with ini.dcvarSamples. Defaults to 1000.
+        """
+
+        self.libCache           = True
+        """
+        (*Bool*)
+
+        - True: compiled libraries are stored in a disk cache in the directory
+          ini.cachePath. **makeLibraries()** and **addUserLibs()** read the
+          compiled library from this cache if neither the library files nor
+          the SLiCAP version have changed.
+        - False: libraries are compiled at each start of a project
+
+        Defaults to True.
+        """
+
+        self.circuitCache       = True
+        """
+        (*Bool*)
+
+        - True: **checkCircuit()** keeps the checked circuits in memory and
+          returns a copy of a stored circuit if neither the netlist file nor
+          the libraries have changed.
+        - False: netlist files are checked at each call of **checkCircuit()**
+
+        Defaults to True.
+        """
+
+        self.circuitDiskCache   = False
+        """
+        (*Bool*)
+
+        - True: checked circuits are also stored in a disk cache in the
+          directory ini.cachePath, and are available in subsequent sessions.
+        - False: checked circuits are only kept in memory
+
+        This setting only applies if ini.circuitCache is True.
+        Defaults to False.
+        """
+
         self.ltspice = None
         """
         Operating system command prefix for batch generation of a netlist from an
@@ -565,6 +820,7 @@ class settings(object):
         self.latexPath        = projectPath + LATEXPATH
         self.mathmlPath       = projectPath + MATHMLPATH
         self.imgPath          = projectPath + IMGPATH
+        self.cachePath        = projectPath + CACHEPATH
         self.maxima           = MAXIMA
         self.ltspice          = LTSPICE
         self.netlist          = NETLIST
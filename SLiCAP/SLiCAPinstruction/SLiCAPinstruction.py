@@ -10,7 +10,7 @@ from SLiCAP.SLiCAPexecute import *
 GAINTYPES = ['vi', 'gain', 'loopgain', 'servo', 'asymptotic', 'direct',]
 DATATYPES = ['matrix', 'noise', 'solve', 'time', 'dc', 'dcvar', 'dcsolve',
              'numer', 'denom', 'laplace', 'zeros', 'poles', 'pz', 'impulse',
-             'step', 'params']
+             'step', 'params', 'sensitivity']
 
 class instruction(object):
     """
@@ -295,7 +295,8 @@ class instruction(object):
 
         :param dataType: data type for the instruction: 'dc', 'dcsolve', 'dcvar',
                          'denom', 'impulse', 'laplace', 'matrix', 'noise', 'numer',
-                         'params', 'poles', 'pz', 'solve', 'step', 'time' or 'zeros'.
+                         'params', 'poles', 'pz', 'sensitivity', 'solve', 'step',
+                         'time' or 'zeros'.
         :type dataType: str
 
         :Example:
@@ -1310,8 +1311,8 @@ class instruction(object):
                         # only needs a source for input noise analysis
                         self.checkSource(need = False)
                     elif self.dataType == 'matrix':
-                        # need nothing
-                        pass
+                        # detector is optional
+                        self.checkDetector()
                     elif self.dataType == 'solve':
                         # need nothing
                         pass
@@ -1327,6 +1328,10 @@ class instruction(object):
                     elif self.dataType == 'dcsolve':
                         # need nothing
                         pass
+                    elif self.dataType == 'sensitivity':
+                        # need numeric and detector
+                        self.checkNumeric()
+                        self.checkDetector()
                     else:
                         self.errors += 1
                         print("Error: dataType '{0}' not available for gainType: '{1}'.".format(self.dataType, self.gainType))
@@ -1342,6 +1347,10 @@ class instruction(object):
                     elif self.dataType == 'denom':
                         # need nothing
                         pass
+                    elif self.dataType == 'matrix':
+                        # source and detector are optional
+                        self.checkDetector()
+                        self.checkSource(need = False)
                     elif self.dataType == 'impulse':
                         # need source and detector
                         self.checkDetector()
@@ -1363,6 +1372,11 @@ class instruction(object):
                         self.checkNumeric()
                         self.checkDetector()
                         self.checkSource()
+                    elif self.dataType == 'sensitivity' and self.gainType == 'gain':
+                        # need numeric source and detector
+                        self.checkNumeric()
+                        self.checkDetector()
+                        self.checkSource()
                     else:
                         self.errors += 1
                         print("Error: dataType '{0}' not available for gainType: '{1}'.".format(self.dataType, self.gainType))
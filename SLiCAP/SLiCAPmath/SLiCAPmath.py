@@ -215,6 +215,127 @@ def numRoots(expr, var):
             return []
     return []
 
+def coeffRoots(coeffs):
+    """
+    Returns the roots of a polynomial with numeric coefficients.
+
+    :param coeffs: Coefficients of the polynomial in descending order.
+    :type coeffs: list, numpy.ndarray
+
+    :return: Array with roots in the same order as returned by **numRoots()**.
+    :rtype: numpy.ndarray
+    """
+    return batchRoots([coeffs])[0]
+
+def batchRoots(coeffs):
+    """
+    Returns the roots of a number of polynomials with numeric coefficients.
+
+    The roots are the eigenvalues of the companion matrices of the polynomials.
+    The companion matrices of polynomials of the same order are stacked and
+    their eigenvalues are calculated with a single call of
+    numpy.linalg.eigvals(). Leading zero coefficients reduce the order of a
+    polynomial, trailing zero coefficients give roots at zero.
+
+    :param coeffs: Two-dimensional array of which each row holds the
+                   coefficients of a polynomial in descending order.
+    :type coeffs: list, numpy.ndarray
+
+    :return: List with an array of roots for each row of coeffs, in the same
+             order as returned by **numRoots()**.
+    :rtype: list
+    """
+    coeffs = np.atleast_2d(np.array(coeffs, dtype = float))
+    (numPolys, numCoeffs) = coeffs.shape
+    nonZero = coeffs != 0
+    lead = np.where(np.any(nonZero, axis = 1), np.argmax(nonZero, axis = 1), numCoeffs)
+    trail = np.where(np.any(nonZero, axis = 1), np.argmax(np.flip(nonZero, 1), axis = 1), 0)
+    roots = [np.array([]) for i in range(numPolys)]
+    for (first, last) in set(zip(lead, trail)):
+        rows = np.nonzero((lead == first) & (trail == last))[0]
+        order = numCoeffs - first - last - 1
+        if order < 0:
+            continue
+        if order > 0:
+            c = coeffs[rows, first: numCoeffs - last]
+            companion = np.zeros((len(rows), order, order))
+            companion[:, 0, :] = -c[:, 1:] / c[:, :1]
+            companion[:, range(1, order), range(order - 1)] = 1
+            eigs = np.linalg.eigvals(companion)
+        else:
+            eigs = np.zeros((len(rows), 0))
+        for k in range(len(rows)):
+            polyRoots = np.concatenate((eigs[k], np.zeros(last)))
+            if not np.any(np.imag(polyRoots)):
+                polyRoots = np.real(polyRoots)
+            roots[rows[k]] = np.flip(polyRoots, 0)
+    return roots
+
+def trackRoots(roots):
+    """
+    Orders the roots of successive steps such that roots with the same index
+    form continuous branches of a root locus.
+
+    The roots of each step are assigned to the branches with the minimum total
+    distance to the last positions of these branches
+    (scipy.optimize.linear_sum_assignment).
+
+    :param roots: List with arrays of roots, one for each step.
+    :type roots: list
+
+    :return: Complex array with a row for each step and a column for each
+             branch. Missing roots are NaN.
+    :rtype: numpy.ndarray
+    """
+    numBranches = max([len(stepRoots) for stepRoots in roots] + [0])
+    branches = np.full((len(roots), numBranches), np.nan, dtype = complex)
+    last = np.full(numBranches, np.nan, dtype = complex)
+    for k in range(len(roots)):
+        stepRoots = np.array(roots[k], dtype = complex).reshape(-1)
+        if len(stepRoots) == 0:
+            continue
+        cost = np.abs(last[:, None] - stepRoots[None, :])
+        finite = np.isfinite(cost)
+        if np.any(finite):
+            # Start new branches only where no branch can be continued
+            cost[~finite] = 2 * np.max(cost[finite]) + 1
+        else:
+            cost[:, :] = 0
+        (rowInd, colInd) = linear_sum_assignment(cost)
+        branches[k, rowInd] = stepRoots[colInd]
+        last[rowInd] = stepRoots[colInd]
+    return branches
+
+def coeffsDCvalue(numerCoeffs, denomCoeffs):
+    """
+    Returns the zero-frequency value of a rational function of the Laplace
+    variable from the numeric coefficients of its numerator and denominator.
+
+    :param numerCoeffs: Coefficients of the numerator in descending order.
+    :type numerCoeffs: list, numpy.ndarray
+
+    :param denomCoeffs: Coefficients of the denominator in descending order.
+    :type denomCoeffs: list, numpy.ndarray
+
+    :return: Limit of the function for the Laplace variable approaching zero
+             from the positive side.
+    :rtype: sympy.Float, int, sympy.core.numbers.Infinity
+    """
+    numer = np.flip(np.array(numerCoeffs, dtype = float), 0)
+    denom = np.flip(np.array(denomCoeffs, dtype = float), 0)
+    if not np.any(numer):
+        return 0
+    if not np.any(denom):
+        return sp.zoo
+    orderN = np.nonzero(numer)[0][0]
+    orderD = np.nonzero(denom)[0][0]
+    ratio = numer[orderN]/denom[orderD]
+    if orderN > orderD:
+        return 0
+    elif orderN < orderD:
+        return sp.sign(ratio)*sp.oo
+    return sp.Float(ratio)
+
 def makeLaplaceRational(gain, zeros, poles):
     """
     Creates a Laplace rational from a gain factor, a list of zeros and a list
@@ -363,20 +484,20 @@ def cancelPZ(poles, zeros):
 
     :return: Tuple with a list with poles (*float*) and a list with zeros (*float*).
     """
-    newPoles = []
-    newZeros = []
-    # make a copy of the lists of poles and zeros, this one will be modified
-    for i in range(len(poles)):
-        newPoles.append(poles[i])
-    for i in range(len(zeros)):
-        newZeros.append(zeros[i])
-    for i in range(len(poles)):
-        for j in range(len(zeros)):
-            if abs(sp.re(poles[i]) - sp.re(zeros[j])) <= 10**(-ini.disp)*abs(sp.re(poles[i]) + sp.re(zeros[j]))/2 \
-            and abs(sp.im(poles[i]) - sp.im(zeros[j])) <= 10**(-ini.disp)*abs(sp.im(poles[i]) + sp.im(zeros[j]))/2 \
-            and poles[i] in newPoles and zeros[j] in newZeros:
-                newPoles.remove(poles[i])
-                newZeros.remove(zeros[j])
+    P = np.array(poles, dtype = complex).reshape(-1)
+    Z = np.array(zeros, dtype = complex).reshape(-1)
+    tol = 10**(-ini.disp)
+    # Matrix with coinciding poles (rows) and zeros (columns)
+    match = (np.abs(P.real[:, None] - Z.real[None, :]) <= tol*np.abs(P.real[:, None] + Z.real[None, :])/2) \
+          & (np.abs(P.imag[:, None] - Z.imag[None, :]) <= tol*np.abs(P.imag[:, None] + Z.imag[None, :])/2)
+    keepPoles = np.ones(len(P), dtype = bool)
+    keepZeros = np.ones(len(Z), dtype = bool)
+    for (i, j) in zip(*np.nonzero(match)):
+        if keepPoles[i] and keepZeros[j]:
+            keepPoles[i] = False
+            keepZeros[j] = False
+    newPoles = [poles[i] for i in range(len(poles)) if keepPoles[i]]
+    newZeros = [zeros[j] for j in range(len(zeros)) if keepZeros[j]]
     return(newPoles, newZeros)
 
 def findServoBandwidth(loopgainRational):
@@ -545,6 +666,237 @@ def fullSubs(valExpr, parDefs):
         print("Warning: reached maximum number of substitutions for expression '{0}'".format(strValExpr))
     return valExpr
 
+class parResolver(object):
+    """
+    Resolves parameter definitions in topological order.
+
+    The resolver holds the fully substituted values of the parameters of a set
+    of parameter definitions. A parameter is resolved after the parameters
+    used in its definition, and its value is obtained with a single
+    substitution of their resolved values. Resolved values are kept until the
+    definition of the parameter, or of one of the parameters on which it
+    depends, changes.
+
+    Circular parameter definitions are reported; the values of the parameters
+    in a cycle are obtained with **fullSubs()**.
+
+    Each circuit object holds a resolver in its attribute 'resolver'.
+
+    :Example:
+
+    >>> resolver = parResolver()
+    >>> resolver.update({sp.Symbol('a'): sp.Symbol('b')*2, sp.Symbol('b'): 3})
+    >>> resolver.subs(sp.Symbol('a') + sp.Symbol('c'))
+    c + 6
+    """
+    def __init__(self):
+        """
+        Initialization of the parameter resolver, see description above.
+        """
+        self.parDefs    = {}
+        """
+        (*dict*) with the parameter definitions of the last update.
+        """
+
+        self.users      = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: Name (*sympy.Symbol*) of a parameter.
+        - value: (*set*) with names (*sympy.Symbol*) of the parameters of
+          which the definition uses this parameter.
+        """
+
+        self.values     = {}
+        """
+        (*dict*) with resolved (fully substituted) parameter values.
+        """
+
+        self.numValues  = {}
+        """
+        (*dict*) with numeric values (sympy.N) of resolved parameters.
+        """
+
+        self.cycles     = set()
+        """
+        (*set*) with names (*sympy.Symbol*) of parameters with a circular
+        definition.
+        """
+
+    def update(self, parDefs):
+        """
+        Updates the parameter definitions.
+
+        Resolved values of changed parameters and of the parameters that
+        depend on them are removed.
+
+        :param parDefs: Dictionary with key-value pairs:
+
+                        - key (*sympy.Symbol*): parameter name
+                        - value (*sympy object, int, float*): value of the parameter
+        :type parDefs: dict
+        """
+        changed = []
+        for key in set(self.parDefs.keys()) | set(parDefs.keys()):
+            if key not in self.parDefs or key not in parDefs or self.parDefs[key] != parDefs[key]:
+                changed.append(key)
+        if len(changed) == 0:
+            return
+        # Invalidate the changed parameters and all parameters downstream
+        invalid = set()
+        params = list(changed)
+        while len(params) != 0:
+            par = params.pop()
+            if par not in invalid:
+                invalid.add(par)
+                params += list(self.users.get(par, []))
+        for par in invalid:
+            self.values.pop(par, None)
+            self.numValues.pop(par, None)
+            self.cycles.discard(par)
+        # Update the dependency graph
+        for key in changed:
+            if key in self.parDefs:
+                for par in parAtoms(self.parDefs[key]):
+                    self.users[par].discard(key)
+            if key in parDefs:
+                for par in parAtoms(parDefs[key]):
+                    if par not in self.users:
+                        self.users[par] = set()
+                    self.users[par].add(key)
+        self.parDefs = dict(parDefs)
+        return
+
+    def resolve(self, par):
+        """
+        Returns the fully substituted value of a parameter.
+
+        :param par: Name of the parameter.
+        :type par: sympy.Symbol
+
+        :return: Value of the parameter or the parameter itself if it has not
+                 been defined.
+        :rtype: sympy object, int, float
+        """
+        if par in self.values:
+            return self.values[par]
+        if par not in self.parDefs:
+            return par
+        # Depth-first traversal of the dependency graph
+        state = {}
+        path  = []
+        stack = [par]
+        while len(stack) != 0:
+            key = stack[-1]
+            if key in self.values:
+                stack.pop()
+            elif key not in state:
+                state[key] = 1
+                path.append(key)
+                for dep in parAtoms(self.parDefs[key]):
+                    if dep in self.parDefs and dep not in self.values:
+                        if state.get(dep) == 1:
+                            cycle = path[path.index(dep):]
+                            self.cycles.update(cycle)
+                            print("Error: circular parameter definition: {0}.".format(', '.join([str(name) for name in cycle])))
+                        elif dep not in state:
+                            stack.append(dep)
+            else:
+                stack.pop()
+                if state[key] == 1:
+                    state[key] = 2
+                    path.remove(key)
+                    if key in self.cycles:
+                        self.values[key] = fullSubs(self.parDefs[key], self.parDefs)
+                    else:
+                        self.values[key] = self.substitute(self.parDefs[key], self.values)
+        return self.values[par]
+
+    def numValue(self, par):
+        """
+        Returns the numeric value (sympy.N) of the fully substituted value of a
+        parameter.
+
+        :param par: Name of the parameter.
+        :type par: sympy.Symbol
+
+        :return: Numeric value of the parameter.
+        :rtype: sympy object
+        """
+        if par not in self.numValues:
+            self.numValues[par] = sp.N(self.resolve(par))
+        return self.numValues[par]
+
+    def substitute(self, expr, values):
+        """
+        Substitutes values of parameters in an expression.
+
+        :param expr: Expression.
+        :type expr: sympy object, int, float
+
+        :param values: Dictionary with parameter values.
+        :type values: dict
+
+        :return: Expression after substitution.
+        :rtype: sympy object, int, float
+        """
+        if not isinstance(expr, sp.Basic):
+            return expr
+        substDict = {}
+        for par in parAtoms(expr):
+            if par in values:
+                substDict[par] = values[par]
+        if len(substDict) == 0:
+            return expr
+        return expr.xreplace(substDict)
+
+    def subs(self, expr, numeric = False):
+        """
+        Returns 'expr' after substitution of the resolved parameter values,
+        this gives the same result as **fullSubs()** with the parameter
+        definitions of the last update.
+
+        :param expr: Expression in which the parameters should be substituted.
+        :type expr: sympy.Expr, sympy.Symbol, int, float
+
+        :param numeric: If True, numeric parameter values are substituted and
+                        the result is evaluated with sympy.N.
+        :type numeric: bool
+
+        :return: Expression after substitution.
+        :rtype: sympy object, int, float
+        """
+        if not isinstance(expr, sp.Basic):
+            if numeric:
+                return sp.N(expr)
+            return expr
+        substDict = {}
+        for par in parAtoms(expr):
+            if par in self.parDefs:
+                if numeric:
+                    substDict[par] = self.numValue(par)
+                else:
+                    substDict[par] = self.resolve(par)
+        expr = expr.xreplace(substDict)
+        if numeric:
+            expr = sp.N(expr)
+        return expr
+
+def parAtoms(expr):
+    """
+    Returns the symbols in an expression.
+
+    :param expr: Expression.
+    :type expr: sympy object, int, float
+
+    :return: Set with symbols (*sympy.Symbol*).
+    :rtype: set
+    """
+    try:
+        return expr.atoms(sp.Symbol)
+    except AttributeError:
+        return set()
+
 def assumeRealParams(expr, params = 'all'):
     """
     Returns the sympy expression 'expr' in which variables, except the
@@ -1081,6 +1433,1678 @@ def routh(charPoly, eps):
             M[i,j] = sp.simplify(-1/M[i-1,0]*subMatrix.det())
     return M
 
+def detEntries(M):
+    """
+    Returns the nonzero entries of the square matrix 'M'.
+
+    If all entries are polynomials of the Laplace variable (ini.Laplace) with
+    numeric coefficients, the entries are converted into sympy.Poly objects,
+    else they are returned as sympy expressions.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Tuple with a dictionary with key-value pairs:
+
+             - key: (row, col) position (*tuple*) of the entry
+             - value: entry (*sympy.Expr, sympy.Poly*)
+
+             and True if the entries are sympy.Poly objects.
+    :rtype: tuple
+    """
+    dim = M.shape[0]
+    entries = {}
+    for i in range(dim):
+        for j in range(dim):
+            if M[i, j] != 0:
+                entries[(i, j)] = sp.sympify(M[i, j])
+    poly = True
+    for key in list(entries.keys()):
+        entry = entries[key]
+        if not entry.free_symbols.issubset({ini.Laplace}) or not entry.is_polynomial(ini.Laplace):
+            poly = False
+            break
+    if poly:
+        for key in list(entries.keys()):
+            entries[key] = sp.Poly(entries[key], ini.Laplace)
+    return entries, poly
+
+def minorDet(entries, rows, cols, memo):
+    """
+    Returns the determinant of the submatrix with the rows 'rows' and the
+    columns 'cols' of a sparse matrix.
+
+    The determinant is calculated by expansion along the row or column of the
+    submatrix with the smallest number of nonzero entries. The determinants
+    of all sub-minors are stored in 'memo' and reused.
+
+    :param entries: Dictionary with the nonzero entries, see **detEntries()**.
+    :type entries: dict
+
+    :param rows: Ordered row numbers of the submatrix.
+    :type rows: tuple
+
+    :param cols: Ordered column numbers of the submatrix.
+    :type cols: tuple
+
+    :param memo: Dictionary with determinants of submatrices:
+
+                 - key: (rows, cols) (*tuple*)
+                 - value: determinant (*sympy.Expr, sympy.Poly*)
+
+                 Its item with key 'one' should hold the unit element.
+    :type memo: dict
+
+    :return: Determinant of the submatrix
+    :rtype: sympy.Expr, sympy.Poly
+    """
+    key = (rows, cols)
+    if key in memo:
+        return memo[key]
+    one = memo['one']
+    zero = one - one
+    dim = len(rows)
+    if dim == 0:
+        memo[key] = one
+        return one
+    elif dim == 1:
+        result = entries.get((rows[0], cols[0]), zero)
+        memo[key] = result
+        return result
+    # Find the row or column with the smallest number of nonzero entries
+    bestCount = dim + 1
+    for i in range(dim):
+        nonzero = [j for j in range(dim) if (rows[i], cols[j]) in entries]
+        if len(nonzero) < bestCount:
+            bestCount = len(nonzero)
+            expansion = [(i, j) for j in nonzero]
+        if bestCount < 2:
+            break
+    if bestCount > 1:
+        for j in range(dim):
+            nonzero = [i for i in range(dim) if (rows[i], cols[j]) in entries]
+            if len(nonzero) < bestCount:
+                bestCount = len(nonzero)
+                expansion = [(i, j) for i in nonzero]
+            if bestCount < 2:
+                break
+    terms = []
+    for (i, j) in expansion:
+        subDet = minorDet(entries, rows[0:i] + rows[i+1:], cols[0:j] + cols[j+1:], memo)
+        if subDet != zero:
+            term = entries[(rows[i], cols[j])]*subDet
+            if (i + j)%2 != 0:
+                term = -term
+            terms.append(term)
+    if len(terms) == 0:
+        result = zero
+    elif isinstance(one, sp.Poly):
+        result = terms[0]
+        for term in terms[1:]:
+            result += term
+    else:
+        result = sp.Add(*[sp.expand(term) for term in terms])
+    memo[key] = result
+    return result
+
+def detMinors(M):
+    """
+    Returns the expanded determinant of the square matrix 'M', calculated by
+    sparse minor expansion with memoized sub-minors.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Determinant of M
+    :rtype: sympy.Expr
+    """
+    entries, poly = detEntries(M)
+    if poly:
+        memo = {'one': sp.Poly(1, ini.Laplace)}
+    else:
+        memo = {'one': sp.Integer(1)}
+    dim = M.shape[0]
+    result = minorDet(entries, tuple(range(dim)), tuple(range(dim)), memo)
+    if poly:
+        result = result.as_expr()
+    return result
+
+def detBareiss(M):
+    """
+    Returns the expanded determinant of the square matrix 'M', calculated by
+    fraction-free (Bareiss) elimination with sparse pivoting.
+
+    Rows with rational entries are multiplied with the least common multiple
+    of their denominators before the elimination. The pivot of each
+    elimination step is selected with the smallest Markowitz count. Floats are
+    converted into rational numbers, such that all divisions are exact.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Determinant of M
+    :rtype: sympy.Expr
+    """
+    dim = M.shape[0]
+    if dim == 0:
+        return sp.Integer(1)
+    scale = sp.Integer(1)
+    floats = False
+    rows = []
+    for i in range(dim):
+        row = []
+        for j in range(dim):
+            entry = sp.sympify(M[i, j])
+            numbers = entry.atoms(sp.Float)
+            if len(numbers) > 0:
+                floats = True
+                entry = entry.xreplace({number: sp.Rational(number) for number in numbers})
+            row.append(sp.together(entry))
+        denoms = [sp.fraction(entry)[1] for entry in row if entry != 0]
+        if len(denoms) > 0:
+            multiplier = sp.lcm_list(denoms)
+            if multiplier != 1:
+                row = [sp.cancel(entry*multiplier) for entry in row]
+                scale *= multiplier
+        rows.append(row)
+    gens = set()
+    for row in rows:
+        for entry in row:
+            gens = gens.union(entry.free_symbols)
+    gens = sorted(list(gens), key=str)
+    if len(gens) == 0:
+        gens = [ini.Laplace]
+    A = {}
+    for i in range(dim):
+        for j in range(dim):
+            if rows[i][j] != 0:
+                A[(i, j)] = sp.Poly(rows[i][j], *gens)
+    activeRows = list(range(dim))
+    activeCols = list(range(dim))
+    sign = 1
+    prev = sp.Poly(1, *gens)
+    for k in range(dim):
+        # Select the pivot with the smallest Markowitz count
+        rowCount = {}
+        colCount = {}
+        for (i, j) in list(A.keys()):
+            rowCount[i] = rowCount.get(i, 0) + 1
+            colCount[j] = colCount.get(j, 0) + 1
+        pivot = None
+        for (i, j) in list(A.keys()):
+            cost = ((rowCount[i] - 1)*(colCount[j] - 1), A[(i, j)].total_degree())
+            if pivot == None or cost < pivotCost:
+                pivot = (i, j)
+                pivotCost = cost
+        if pivot == None:
+            return sp.Integer(0)
+        r, c = pivot
+        if (activeRows.index(r) + activeCols.index(c))%2 != 0:
+            sign = -sign
+        activeRows.remove(r)
+        activeCols.remove(c)
+        p = A[pivot]
+        pivotRow = {}
+        pivotCol = {}
+        rest = {}
+        for (i, j) in list(A.keys()):
+            if i == r and j != c:
+                pivotRow[j] = A[(i, j)]
+            elif j == c and i != r:
+                pivotCol[i] = A[(i, j)]
+            elif i != r and j != c:
+                rest[(i, j)] = A[(i, j)]
+        A = {}
+        for i in activeRows:
+            for j in activeCols:
+                entry = rest.get((i, j))
+                if entry != None:
+                    entry = p*entry
+                if i in pivotCol and j in pivotRow:
+                    if entry == None:
+                        entry = -pivotCol[i]*pivotRow[j]
+                    else:
+                        entry = entry - pivotCol[i]*pivotRow[j]
+                if entry != None and not entry.is_zero:
+                    entry = entry.quo(prev)
+                    if not entry.is_zero:
+                        A[(i, j)] = entry
+        prev = p
+    result = sp.expand(sign*prev.as_expr()/scale)
+    if floats:
+        result = sp.N(result)
+    return result
+
+def degreeBounds(degrees, valuations):
+    """
+    Returns an upper bound of the degree and a lower bound of the lowest power
+    of the Laplace variable of the determinant of a square polynomial matrix.
+
+    The bounds are the maximum weight and the minimum weight of a perfect
+    matching of rows and columns with the degrees and the lowest powers of
+    the nonzero entries as weights.
+
+    :param degrees: Array with the degrees of the entries, -1 for zero
+                    entries.
+    :type degrees: numpy.ndarray
+
+    :param valuations: Array with the lowest powers of the entries.
+    :type valuations: numpy.ndarray
+
+    :return: Tuple with the upper bound of the degree and the lower bound of
+             the lowest power, or None if the matrix is structurally singular.
+    :rtype: tuple, NoneType
+    """
+    dim = degrees.shape[0]
+    if dim == 0:
+        return (0, 0)
+    nonzero = degrees >= 0
+    penalty = (np.max(degrees) + 1) * (dim + 1)
+    rows, cols = linear_sum_assignment(np.where(nonzero, degrees, -penalty), maximize = True)
+    if not np.all(nonzero[rows, cols]):
+        return None
+    degree = int(np.sum(degrees[rows, cols]))
+    rows, cols = linear_sum_assignment(np.where(nonzero, valuations, penalty))
+    return (degree, int(np.sum(valuations[rows, cols])))
+
+def tropicalRadii(coeffs):
+    """
+    Returns estimates of the radii in the complex plane at which the dominant
+    term of the determinant of a square polynomial matrix changes.
+
+    The estimates are the breakpoints of the tropical (max-plus) determinant
+    of the matrix with the natural logarithms of the magnitudes of the
+    coefficients: the maximum weight of a perfect matching of rows and
+    columns, in which the weight of an entry at the logarithm of the radius
+    rho is the maximum of log(abs(a_k)) + k*rho over its coefficients a_k.
+    This function is convex and piecewise linear in rho; its breakpoints
+    are found with the intersections of the tangents at its ends.
+
+    :param coeffs: Array with the coefficient matrices of the powers of the
+                   Laplace variable, the power is the first index.
+    :type coeffs: numpy.ndarray
+
+    :return: List with radii in ascending order.
+    :rtype: list
+    """
+    dim = coeffs.shape[1]
+    with np.errstate(divide = 'ignore'):
+        logCoeffs = np.log(np.abs(coeffs))
+    finite = np.isfinite(logCoeffs)
+    if dim == 0 or not np.any(finite):
+        return []
+    nonzero = np.any(finite, axis = 0)
+    powers = np.arange(coeffs.shape[0])[:, None, None]
+    bound = dim * (np.max(logCoeffs[finite]) - np.min(logCoeffs[finite])) + 1
+
+    def evaluate(rho):
+        weights = np.where(finite, logCoeffs + powers*rho, -np.inf)
+        best = np.max(weights, axis = 0)
+        penalty = (np.max(np.abs(best[nonzero])) + 1) * (dim + 1)
+        rows, cols = linear_sum_assignment(np.where(nonzero, best, -penalty), maximize = True)
+        if not np.all(nonzero[rows, cols]):
+            return None
+        return (np.sum(best[rows, cols]), np.sum(np.argmax(weights, axis = 0)[rows, cols]))
+
+    lower = evaluate(-bound)
+    if lower == None:
+        return []
+    upper = evaluate(bound)
+    rhos = []
+    intervals = [(-bound, lower, bound, upper)]
+    while len(intervals) != 0:
+        (a, (Va, sa), b, (Vb, sb)) = intervals.pop()
+        if sa == sb:
+            continue
+        c = (Vb - sb*b - Va + sa*a)/(sa - sb)
+        (Vc, sc) = evaluate(c)
+        if Vc <= Va + sa*(c - a) + 1e-9*(1 + abs(Vc)) or c <= a or c >= b:
+            rhos.append(c)
+        else:
+            intervals += [(a, (Va, sa), c, (Vc, sc)), (c, (Vc, sc), b, (Vb, sb))]
+    return [np.exp(rho) for rho in sorted(rhos)]
+
+def logFloat(mantissa, logScale):
+    """
+    Returns the number mantissa*exp(logScale) as a sympy.Float, without
+    overflow or underflow of double precision numbers.
+
+    :param mantissa: Mantissa
+    :type mantissa: float
+
+    :param logScale: Natural logarithm of the scale factor
+    :type logScale: float
+
+    :return: mantissa*exp(logScale)
+    :rtype: sympy.Float
+    """
+    if mantissa == 0:
+        return sp.Float(0)
+    exponent = np.log10(abs(mantissa)) + logScale/np.log(10)
+    power = int(np.floor(exponent))
+    return sp.Float('%se%s'%(repr(float(np.sign(mantissa) * 10**(exponent - power))), power))
+
+def minorsFFT(M, minors, tol = 1e-10):
+    """
+    Returns the expanded determinants of a square matrix and of its minor
+    matrices, of which the entries are polynomials of the Laplace variable
+    with numeric coefficients, obtained by evaluation and interpolation.
+
+    The determinant of the matrix is evaluated with batched LU decompositions
+    at N points on a circle with radius r in the complex plane; the
+    determinant of the minor matrix (i, j) is obtained from the (j, i) entry
+    of the inverse of the matrix at these points. The coefficients of the
+    powers of ini.Laplace follow from the FFT of these values. N is obtained
+    from the bounds of the degree and of the lowest power of the determinants
+    derived from the degrees of the entries, see **degreeBounds()**.
+
+    Coefficients of which the terms are small compared to the largest term on
+    the circle are inaccurate; for the minors, the terms are compared with
+    the determinant times the largest entry of the column of the inverse.
+    The evaluation is therefore performed at the radii at which the dominant
+    term of the determinant changes, estimated with **tropicalRadii()**, and
+    repeated with radii derived from the Newton polygon of the coefficients:
+    each coefficient is taken from the evaluation in which its term is
+    largest compared to the other terms. Coefficients of which the terms remain smaller than 'tol'
+    times the largest term are set to zero.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :param minors: List with (row, col) tuples of minors, (None, None) for
+                   the determinant of the matrix itself.
+    :type minors: list
+
+    :param tol: Relative tolerance of the coefficients, defaults to 1e-10
+    :type tol: float
+
+    :return: Dictionary with key-value pairs:
+
+             - key: (row, col) (*tuple*) of the minor
+             - value: determinant (*sympy.Expr*)
+
+             or None if the entries are not polynomials of the Laplace
+             variable with numeric coefficients.
+    :rtype: dict, NoneType
+    """
+    entries, poly = detEntries(M)
+    if not poly:
+        return None
+    dim = M.shape[0]
+    results = {}
+    degrees = -np.ones((dim, dim), dtype = int)
+    valuations = np.zeros((dim, dim), dtype = int)
+    order = 0
+    for (i, j) in list(entries.keys()):
+        degrees[i, j] = entries[(i, j)].degree()
+        valuations[i, j] = min([monom[0] for monom in entries[(i, j)].monoms()])
+        order = max(order, degrees[i, j])
+    coeffs = np.zeros((order + 1, dim, dim))
+    for (i, j) in list(entries.keys()):
+        for (monom, coeff) in entries[(i, j)].terms():
+            coeffs[monom[0], i, j] = float(coeff)
+    # Bounds of the powers of ini.Laplace of the determinants of the minors
+    bounds = {}
+    for (row, col) in minors:
+        rows = [i for i in range(dim) if i != row]
+        cols = [j for j in range(dim) if j != col]
+        bound = degreeBounds(degrees[rows][:, cols], valuations[rows][:, cols])
+        if bound == None:
+            results[(row, col)] = sp.Integer(0)
+        elif len(rows) == 0:
+            results[(row, col)] = sp.Integer(1)
+        else:
+            bounds[(row, col)] = bound
+    if len(bounds) == 0:
+        return results
+    keys = list(bounds.keys())
+    N = max([bounds[key][0] - bounds[key][1] for key in keys]) + 1
+    N += N%2
+    cofRows = sorted(list(set([key[0] for key in keys if key[0] != None])))
+    # A rotation over half the angle between the points avoids roots on the
+    # real axis. The points are pairwise complex conjugate: only the upper
+    # half needs to be evaluated.
+    theta = np.pi/N
+    points = np.exp(1j*(2*np.pi*np.arange(N)/N + theta))
+    half = N//2
+    # Best estimates of the coefficients: for each minor the mantissas, the
+    # natural logarithms of their scale factors and their relative magnitudes
+    mantissas = {key: np.zeros(N) for key in keys}
+    logScales = {key: np.zeros(N) for key in keys}
+    relative = {key: np.zeros(N) for key in keys}
+    # Initial radii at the breakpoints of the tropical determinant, at which
+    # the coefficients of the determinant are expected to dominate
+    radii = []
+    for radius in tropicalRadii(coeffs):
+        if len(radii) == 0 or np.log(radius/radii[-1]) > np.log(2):
+            radii.append(radius)
+    if len(radii) == 0:
+        norms = [np.max(np.abs(A)) for A in coeffs]
+        if order > 0 and norms[0] != 0 and norms[-1] != 0:
+            radii = [(norms[0]/norms[-1])**(1/order)]
+        else:
+            radii = [1.]
+    done = []
+    chunk = max(1, int(2**22/dim**2))
+    while len(radii) != 0:
+        for r in radii:
+            z = r * points
+            # Phases and natural logarithms of the magnitudes of the
+            # determinants at the points on the circle
+            phases = {key: np.zeros(N, dtype = complex) for key in keys}
+            logMags = {key: np.zeros(N) for key in keys}
+            logRefs = {key: np.zeros(N) for key in keys}
+            for start in range(0, half, chunk):
+                zc = z[start: min(start + chunk, half)]
+                Mz = np.zeros((len(zc), dim, dim), dtype = complex)
+                Mz += coeffs[-1]
+                for k in range(order - 1, -1, -1):
+                    Mz = Mz * zc[:, None, None] + coeffs[k]
+                (sign, logAbs) = np.linalg.slogdet(Mz)
+                if len(cofRows) != 0:
+                    inverse = np.linalg.solve(Mz, np.eye(dim)[:, cofRows])
+                for key in keys:
+                    phase = sign
+                    logMag = logAbs
+                    logRef = logAbs
+                    if key[0] != None:
+                        column = inverse[:, :, cofRows.index(key[0])]
+                        entry = column[:, key[1]]
+                        if (key[0] + key[1])%2 != 0:
+                            entry = -entry
+                        phase = np.where(entry != 0, sign * np.exp(1j*np.angle(entry)), 0)
+                        with np.errstate(divide = 'ignore'):
+                            logMag = logAbs + np.log(np.abs(entry))
+                            # The rounding errors in the minor scale with the
+                            # largest entry of the column of the inverse
+                            logRef = logAbs + np.log(np.max(np.abs(column), axis = 1))
+                    phases[key][start: start + len(zc)] = phase
+                    logMags[key][start: start + len(zc)] = logMag
+                    logRefs[key][start: start + len(zc)] = logRef
+            for key in keys:
+                phases[key][half:] = np.conj(phases[key][half-1::-1])
+                logMags[key][half:] = logMags[key][half-1::-1]
+                (degree, valuation) = bounds[key]
+                # Values of det/s^valuation scaled with exp(-L)
+                logMag = logMags[key] - valuation*np.log(r)
+                finite = logMag[np.isfinite(logMag)]
+                if len(finite) == 0:
+                    continue
+                L = np.max(finite)
+                with np.errstate(invalid = 'ignore'):
+                    q = np.where(np.isfinite(logMag), phases[key] * np.exp(logMag - L), 0) * np.exp(-1j*valuation*np.angle(points))
+                F = np.fft.fft(q)/N
+                F = np.real(F * np.exp(-1j*theta*np.arange(N)))
+                # Mean reference magnitude, relative to which the rounding
+                # errors of the coefficients are of the order of eps
+                logRef = logRefs[key][:half] - valuation*np.log(r)
+                logRef = logRef[np.isfinite(logRef)]
+                if len(logRef) == 0 or np.max(np.abs(F)) == 0:
+                    continue
+                Lr = np.max(logRef)
+                scale = np.exp(L - Lr - np.log(np.mean(np.exp(logRef - Lr))))
+                for k in range(degree - valuation + 1):
+                    if abs(F[k])*scale > relative[key][k]:
+                        relative[key][k] = abs(F[k])*scale
+                        mantissas[key][k] = F[k]
+                        logScales[key][k] = L - k*np.log(r)
+        done += radii
+        # Select new radii at which the terms of inaccurate coefficients are
+        # large compared to the other terms, from the radii at the edges of
+        # the Newton polygons of the estimated coefficients
+        candidates = []
+        targets = []
+        logCoeffs = {}
+        for key in keys:
+            (degree, valuation) = bounds[key]
+            known = [k for k in range(degree - valuation + 1) if relative[key][k] >= tol]
+            logCoeffs[key] = np.array([np.log(abs(mantissas[key][k])) + logScales[key][k] for k in known])
+            targets += [(key, known.index(k)) for k in known if relative[key][k] < 1e-3]
+            hull = []
+            for i in range(len(known)):
+                while len(hull) > 1 and (logCoeffs[key][hull[-1]] - logCoeffs[key][hull[-2]])*(known[i] - known[hull[-1]]) <= (logCoeffs[key][i] - logCoeffs[key][hull[-1]])*(known[hull[-1]] - known[hull[-2]]):
+                    hull.pop()
+                hull.append(i)
+            for m in range(1, len(hull)):
+                radius = np.exp((logCoeffs[key][hull[m-1]] - logCoeffs[key][hull[m]])/(known[hull[m]] - known[hull[m-1]]))
+                if min([abs(np.log(radius/r)) for r in done]) > np.log(2):
+                    candidates.append((radius, key, known))
+        radii = []
+        while len(targets) != 0 and len(candidates) != 0:
+            best = []
+            for (radius, key, known) in candidates:
+                covered = []
+                for target in targets:
+                    if target[0] == key:
+                        logTerms = logCoeffs[key] + np.array(known)*np.log(radius)
+                        if logTerms[target[1]] - np.max(logTerms) > np.log(1e-3):
+                            covered.append(target)
+                if len(covered) > len(best):
+                    best = covered
+                    bestRadius = radius
+            if len(best) == 0:
+                break
+            radii.append(bestRadius)
+            targets = [target for target in targets if target not in best]
+            candidates = [candidate for candidate in candidates if abs(np.log(candidate[0]/bestRadius)) > np.log(2)]
+    for key in keys:
+        (degree, valuation) = bounds[key]
+        result = 0
+        for k in range(degree - valuation + 1):
+            if relative[key][k] >= tol:
+                result += logFloat(mantissas[key][k], logScales[key][k]) * ini.Laplace**(k + valuation)
+        results[key] = result
+    return results
+
+def detFFT(M):
+    """
+    Returns the expanded determinant of the square matrix 'M' of which the
+    entries are polynomials of the Laplace variable with numeric
+    coefficients, obtained by evaluation and interpolation with
+    **minorsFFT()**.
+
+    If 'M' has symbolic entries, the determinant is calculated with
+    **detMinors()**.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Determinant of M
+    :rtype: sympy.Expr
+    """
+    result = minorsFFT(M, [(None, None)])
+    if result == None:
+        return detMinors(M)
+    return result[(None, None)]
+
+def powMod(base, exponent, p):
+    """
+    Returns base**exponent modulo the prime p, element-wise for numpy arrays.
+
+    :param base: Base(s)
+    :type base: int, numpy.ndarray
+
+    :param exponent: Non-negative exponent(s)
+    :type exponent: int, numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: base**exponent mod p
+    :rtype: numpy.ndarray
+    """
+    base = np.asarray(base, dtype = np.int64) % p
+    exponent = np.asarray(exponent, dtype = np.int64)
+    result = np.ones(np.broadcast(base, exponent).shape, dtype = np.int64)
+    while np.any(exponent > 0):
+        result = np.where(exponent & 1, result * base % p, result)
+        base = base * base % p
+        exponent = exponent >> 1
+    return result
+
+def detModP(A, p):
+    """
+    Returns the determinants modulo the prime p of a stack of square integer
+    matrices, calculated by Gaussian elimination modulo p.
+
+    :param A: Array with shape (number of matrices, dim, dim) and entries in
+              the range [0, p).
+    :type A: numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: Array with the determinants modulo p.
+    :rtype: numpy.ndarray
+    """
+    A = A.copy()
+    (number, dim) = A.shape[0:2]
+    det = np.ones(number, dtype = np.int64)
+    index = np.arange(number)
+    for k in range(dim):
+        nonzero = A[:, k:, k] != 0
+        det[~np.any(nonzero, axis = 1)] = 0
+        pivot = np.argmax(nonzero, axis = 1) + k
+        swap = pivot != k
+        if np.any(swap):
+            row = A[index, k].copy()
+            A[index, k] = A[index, pivot]
+            A[index, pivot] = row
+            det[swap] = (p - det[swap]) % p
+        det = det * A[:, k, k] % p
+        factors = A[:, k+1:, k] * powMod(A[:, k, k], p - 2, p)[:, None] % p
+        A[:, k+1:, k:] = (A[:, k+1:, k:] - factors[:, :, None] * A[:, None, k, k:] % p) % p
+    return det
+
+def zippelMatrix(M):
+    """
+    Converts a square matrix into a matrix with polynomial entries with
+    integer coefficients, suited for evaluation modulo primes.
+
+    Rows with rational entries or rational coefficients are multiplied with
+    the least common multiple of their denominators. Floats are converted
+    into rational numbers by their decimal representation.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Tuple with:
+
+             #. List with the variables (*sympy.Symbol*) of the polynomials
+             #. List with a dictionary for each row, with key-value pairs:
+
+                - key: column number (*int*) of a nonzero entry
+                - value: list with (exponents, coefficient) tuples of the
+                  terms of the entry, exponents is a tuple with the exponents
+                  of the variables, coefficient an integer
+
+             #. List with the multiplication factors (*sympy.Expr*) of the rows
+             #. True if the matrix had floats
+
+             or None if the entries are not rational functions of symbols
+             with rational coefficients.
+    :rtype: tuple, NoneType
+    """
+    dim = M.shape[0]
+    floats = False
+    entries = []
+    scales = []
+    for i in range(dim):
+        row = []
+        for j in range(dim):
+            entry = sp.sympify(M[i, j])
+            numbers = entry.atoms(sp.Float)
+            if len(numbers) > 0:
+                floats = True
+                entry = entry.xreplace({number: sp.Rational(str(number)) for number in numbers})
+            row.append(sp.together(entry))
+        scale = sp.Integer(1)
+        denoms = [sp.fraction(entry)[1] for entry in row if entry != 0]
+        if len(denoms) > 0:
+            scale = sp.lcm_list(denoms)
+            if scale != 1:
+                row = [sp.cancel(entry*scale) for entry in row]
+        entries.append(row)
+        scales.append(scale)
+    # The variables of the scale factors are included, such that these can
+    # be divided out term by term
+    gens = set()
+    for scale in scales:
+        gens = gens.union(scale.free_symbols)
+    for row in entries:
+        for entry in row:
+            gens = gens.union(entry.free_symbols)
+    gens = sorted(list(gens), key=str)
+    rows = []
+    for i in range(dim):
+        terms = {}
+        multiplier = 1
+        for j in range(dim):
+            if entries[i][j] != 0:
+                if len(gens) == 0:
+                    if not entries[i][j].is_Rational:
+                        return None
+                    terms[j] = [((), entries[i][j])]
+                else:
+                    try:
+                        poly = sp.Poly(entries[i][j], *gens)
+                    except sp.PolynomialError:
+                        return None
+                    if not poly.domain.is_QQ and not poly.domain.is_ZZ:
+                        return None
+                    terms[j] = poly.terms()
+                for (exponents, coeff) in terms[j]:
+                    multiplier = sp.ilcm(multiplier, sp.Rational(coeff).q)
+        for j in list(terms.keys()):
+            terms[j] = [(tuple(exponents), int(sp.Rational(coeff)*multiplier)) for (exponents, coeff) in terms[j]]
+        scales[i] *= multiplier
+        rows.append(terms)
+    return gens, rows, scales, floats
+
+def zippelEval(rows, rowSel, colSel, points, p):
+    """
+    Returns the determinants modulo p of the submatrix with rows 'rowSel' and
+    columns 'colSel' of a matrix obtained from **zippelMatrix()**, evaluated
+    at a number of points.
+
+    :param rows: Rows of the matrix, see **zippelMatrix()**.
+    :type rows: list
+
+    :param rowSel: Row numbers of the submatrix.
+    :type rowSel: list
+
+    :param colSel: Column numbers of the submatrix.
+    :type colSel: list
+
+    :param points: Array with shape (number of points, number of variables)
+                   with the values of the variables modulo p.
+    :type points: numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: Array with the determinants modulo p.
+    :rtype: numpy.ndarray
+    """
+    dim = len(rowSel)
+    chunk = max(1, 2**22 // max(1, dim*dim))
+    results = []
+    for start in range(0, points.shape[0], chunk):
+        X = points[start: start + chunk]
+        powers = {}
+        A = np.zeros((X.shape[0], dim, dim), dtype = np.int64)
+        for a in range(dim):
+            row = rows[rowSel[a]]
+            for b in range(dim):
+                if colSel[b] not in row:
+                    continue
+                value = np.zeros(X.shape[0], dtype = np.int64)
+                for (exponents, coeff) in row[colSel[b]]:
+                    term = np.full(X.shape[0], coeff % p, dtype = np.int64)
+                    for v in range(len(exponents)):
+                        if exponents[v] != 0:
+                            if (v, exponents[v]) not in powers:
+                                powers[(v, exponents[v])] = powMod(X[:, v], exponents[v], p)
+                            term = term * powers[(v, exponents[v])] % p
+                    value = (value + term) % p
+                A[:, a, b] = value
+        results.append(detModP(A, p))
+    return np.concatenate(results)
+
+def matmulModP(A, B, p):
+    """
+    Returns the matrix product A.B modulo the prime p.
+
+    The entries are split in 16-bit parts, of which the products are
+    calculated exactly with floating point matrix multiplications.
+
+    :param A: Integer array with shape (n, K) and entries in the range [0, p).
+    :type A: numpy.ndarray
+
+    :param B: Integer array with shape (K, m) and entries in the range [0, p).
+    :type B: numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: A.B mod p
+    :rtype: numpy.ndarray
+    """
+    result = np.zeros((A.shape[0], B.shape[1]), dtype = np.int64)
+    for start in range(0, A.shape[1], 2**20):
+        (A1, A0) = np.divmod(A[:, start: start + 2**20], 2**16)
+        (B1, B0) = np.divmod(B[start: start + 2**20], 2**16)
+        (A1, A0, B1, B0) = [X.astype(float) for X in (A1, A0, B1, B0)]
+        high = (A1 @ B1).astype(np.int64) % p
+        middle = ((A1 @ B0).astype(np.int64) + (A0 @ B1).astype(np.int64)) % p
+        low = (A0 @ B0).astype(np.int64) % p
+        result = (result + high * (2**32 % p) % p + middle * 2**16 % p + low) % p
+    return result
+
+def vandermondeSolve(m, V, p):
+    """
+    Solves the transposed Vandermonde systems sum_t c[t, j]*m[t]**i = V[i, j]
+    modulo the prime p.
+
+    :param m: Array with the distinct nodes m[t] modulo p.
+    :type m: numpy.ndarray
+
+    :param V: Array with shape (len(m), number of systems) with the right
+              hand sides.
+    :type V: numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: Array c with the same shape as V.
+    :rtype: numpy.ndarray
+    """
+    T = len(m)
+    # Coefficients of the master polynomial P(z) = prod_t (z - m[t])
+    P = np.ones(1, dtype = np.int64)
+    for t in range(T):
+        P = (np.concatenate(([0], P)) - m[t] * np.concatenate((P, [0])) % p) % p
+    # Synthetic division of P(z) by (z - m[t]) for all t; the quotients
+    # Q[i, t] are collected in blocks and multiplied with V[i, :]
+    c = np.zeros((T, V.shape[1]), dtype = np.int64)
+    q = np.ones(T, dtype = np.int64)
+    denom = np.zeros(T, dtype = np.int64)
+    block = max(1, min(T, 2**22 // T))
+    for stop in range(T, 0, -block):
+        start = max(0, stop - block)
+        Q = np.zeros((stop - start, T), dtype = np.int64)
+        for i in range(stop - 1, start - 1, -1):
+            if i < T - 1:
+                q = (P[i + 1] + m * q) % p
+            Q[i - start] = q
+            denom = (denom * m + q) % p
+        c = (c + matmulModP(Q.T, V[start: stop], p)) % p
+    return c * powMod(denom, p - 2, p)[:, None] % p
+
+def interpolateModP(b, Y, p):
+    """
+    Returns the coefficients of the polynomials that take the values Y[j, t]
+    at the distinct nodes b[j], modulo the prime p.
+
+    :param b: Array with the nodes modulo p.
+    :type b: numpy.ndarray
+
+    :param Y: Array with shape (len(b), number of polynomials) with the values.
+    :type Y: numpy.ndarray
+
+    :param p: Prime number smaller than 2**31
+    :type p: int
+
+    :return: Array C with the same shape as Y, C[e, t] is the coefficient of
+             the power e of polynomial t.
+    :rtype: numpy.ndarray
+    """
+    J = len(b)
+    c = Y.copy() % p
+    # Divided differences
+    for k in range(1, J):
+        for j in range(J - 1, k - 1, -1):
+            c[j] = (c[j] - c[j - 1]) % p * pow(int(b[j] - b[j - k]) % p, p - 2, p) % p
+    # Conversion of the Newton form to the monomial form
+    C = np.zeros_like(c)
+    C[0] = c[J - 1]
+    for k in range(J - 2, -1, -1):
+        shifted = np.zeros_like(C)
+        shifted[1:] = C[:-1]
+        C = (shifted - int(b[k]) * C % p) % p
+        C[0] = (C[0] + c[k]) % p
+    return C
+
+def zippelNodes(rng, number, p):
+    """
+    Returns 'number' distinct random nonzero numbers modulo p.
+    """
+    while True:
+        nodes = rng.integers(1, p, number, dtype = np.int64)
+        if len(np.unique(nodes)) == number:
+            return nodes
+
+def zippelSkeleton(rows, rowSel, colSel, support, p, seed):
+    """
+    Returns the coefficients modulo p of a determinant of which the support
+    (the exponents of its terms) is known, from its values at len(support)
+    points.
+
+    See **zippelEval()** for the description of the arguments 'rows',
+    'rowSel', 'colSel' and 'p'.
+
+    :param support: List with the exponents (*tuple*) of the terms.
+    :type support: list
+
+    :param seed: Seed of the random generator.
+    :type seed: int
+
+    :return: Array with the coefficients modulo p, or None if no points with
+             distinct monomial values have been found.
+    :rtype: numpy.ndarray, NoneType
+    """
+    rng = np.random.default_rng(seed)
+    T = len(support)
+    exponents = np.array(support, dtype = np.int64).reshape(T, len(support[0]))
+    for attempt in range(10):
+        r = rng.integers(2, p, exponents.shape[1], dtype = np.int64)
+        m = np.ones(T, dtype = np.int64)
+        for v in range(exponents.shape[1]):
+            m = m * powMod(r[v], exponents[:, v], p) % p
+        if len(np.unique(m)) == T:
+            break
+    else:
+        return None
+    points = np.ones((T, exponents.shape[1]), dtype = np.int64)
+    for i in range(1, T):
+        points[i] = points[i - 1] * r % p
+    values = zippelEval(rows, rowSel, colSel, points, p)
+    return vandermondeSolve(m, values[:, None], p)[:, 0]
+
+def zippelModP(rows, rowSel, colSel, degrees, p, rng):
+    """
+    Returns the determinant modulo p of the submatrix with rows 'rowSel' and
+    columns 'colSel' of a matrix obtained from **zippelMatrix()**, by
+    Zippel's sparse interpolation.
+
+    The variables are added one by one. The support of the determinant in the
+    first k variables, with the remaining variables at random values, serves
+    as skeleton for the next variable: for each of degrees[k] + 1 values of
+    variable k, the coefficients of the skeleton follow from a transposed
+    Vandermonde system, after which they are interpolated in variable k.
+
+    See **zippelEval()** for the description of the arguments 'rows',
+    'rowSel', 'colSel' and 'p'.
+
+    :param degrees: Upper bounds of the degrees of the variables.
+    :type degrees: list
+
+    :param rng: Random generator
+    :type rng: numpy.random.Generator
+
+    :return: Dictionary with key-value pairs:
+
+             - key: exponents (*tuple*) of a term
+             - value: coefficient modulo p (*int*)
+
+             or None if no points with distinct monomial values have been
+             found.
+    :rtype: dict, NoneType
+    """
+    nv = len(degrees)
+    anchor = rng.integers(1, p, nv, dtype = np.int64)
+    support = [()]
+    coeffs = zippelEval(rows, rowSel, colSel, anchor[None, :], p)
+    for k in range(nv):
+        J = degrees[k] + 1
+        T = len(support)
+        b = zippelNodes(rng, J, p)
+        exponents = np.array(support, dtype = np.int64).reshape(T, k)
+        for attempt in range(10):
+            r = rng.integers(2, p, k, dtype = np.int64)
+            m = np.ones(T, dtype = np.int64)
+            for v in range(k):
+                m = m * powMod(r[v], exponents[:, v], p) % p
+            if len(np.unique(m)) == T:
+                break
+        else:
+            return None
+        points = np.tile(anchor, (J, T, 1))
+        skeleton = np.ones((T, k), dtype = np.int64)
+        for i in range(1, T):
+            skeleton[i] = skeleton[i - 1] * r % p
+        points[:, :, 0:k] = skeleton[None, :, :]
+        points[:, :, k] = b[:, None]
+        values = zippelEval(rows, rowSel, colSel, points.reshape(J*T, nv), p).reshape(J, T)
+        # coeffs[t, j]: coefficient of support[t] with variable k = b[j]
+        coeffs = vandermondeSolve(m, values.T, p)
+        # coeffs[e, t]: coefficient of support[t]*x_k**e
+        coeffs = interpolateModP(b, coeffs.T, p)
+        (powers, terms) = np.nonzero(coeffs)
+        support = [support[t] + (int(e),) for (e, t) in zip(powers, terms)]
+        coeffs = coeffs[powers, terms]
+        if len(support) == 0:
+            return {}
+    return {support[t]: int(coeffs[t]) for t in range(len(support)) if coeffs[t] != 0}
+
+def zippelDet(rows, rowSel, colSel, nv):
+    """
+    Returns the determinant of the submatrix with rows 'rowSel' and columns
+    'colSel' of a matrix obtained from **zippelMatrix()**.
+
+    The support and the coefficients modulo a first prime are obtained with
+    **zippelModP()**. The coefficients modulo subsequent primes follow from
+    **zippelSkeleton()**, these evaluations are distributed over
+    ini.detProcesses processes. The integer coefficients are reconstructed
+    with the Chinese remainder theorem, until they no longer change. The
+    result is verified at a random point modulo another prime; on failure
+    the calculation is repeated with other random values.
+
+    See **zippelEval()** for the description of the arguments 'rows',
+    'rowSel' and 'colSel'.
+
+    :param nv: Number of variables
+    :type nv: int
+
+    :return: Dictionary with key-value pairs:
+
+             - key: exponents (*tuple*) of a term
+             - value: coefficient (*int*)
+
+             or None if the determinant could not be verified.
+    :rtype: dict, NoneType
+    """
+    degrees = []
+    for v in range(nv):
+        rowDegrees = [max([0] + [exponents[v] for j in colSel if j in rows[i] for (exponents, coeff) in rows[i][j]]) for i in rowSel]
+        colDegrees = [max([0] + [exponents[v] for i in rowSel if j in rows[i] for (exponents, coeff) in rows[i][j]]) for j in colSel]
+        degrees.append(min(sum(rowDegrees), sum(colDegrees)))
+    rng = np.random.default_rng(len(rowSel))
+    numProcesses = ini.detProcesses
+    if numProcesses == None or numProcesses < 1:
+        numProcesses = os.cpu_count()
+    p = 2**31
+    for attempt in range(3):
+        p = sp.prevprime(p)
+        modular = zippelModP(rows, rowSel, colSel, degrees, p, rng)
+        if modular == None:
+            continue
+        support = list(modular.keys())
+        residues = [modular[term] for term in support]
+        modulus = p
+        coeffs = [c - p if c > p//2 else c for c in residues]
+        stable = len(support) == 0
+        while not stable:
+            primes = []
+            for i in range(numProcesses):
+                p = sp.prevprime(p)
+                primes.append(p)
+            seeds = rng.integers(0, 2**31, len(primes))
+            args = [(rows, rowSel, colSel, support, primes[i], int(seeds[i])) for i in range(len(primes))]
+            if numProcesses > 1:
+                with concurrent.futures.ProcessPoolExecutor(max_workers = numProcesses) as pool:
+                    results = list(pool.map(zippelSkeleton, *zip(*args)))
+            else:
+                results = [zippelSkeleton(*arg) for arg in args]
+            for i in range(len(primes)):
+                if type(results[i]) == type(None):
+                    continue
+                q = primes[i]
+                inverse = pow(modulus % q, q - 2, q)
+                residues = [residues[t] + modulus*((int(results[i][t]) - residues[t])*inverse % q) for t in range(len(support))]
+                modulus *= q
+                newCoeffs = [c - modulus if c > modulus//2 else c for c in residues]
+                stable = newCoeffs == coeffs
+                coeffs = newCoeffs
+                if stable:
+                    break
+        # Verification at a random point modulo another prime
+        p = sp.prevprime(p)
+        point = rng.integers(1, p, nv, dtype = np.int64)
+        value = int(zippelEval(rows, rowSel, colSel, point[None, :], p)[0])
+        check = 0
+        for t in range(len(support)):
+            term = coeffs[t] % p
+            for v in range(nv):
+                term = term * pow(int(point[v]), support[t][v], p) % p
+            check = (check + term) % p
+        if check == value:
+            return {support[t]: coeffs[t] for t in range(len(support)) if coeffs[t] != 0}
+    return None
+
+def minorsZippel(M, minors):
+    """
+    Returns the expanded determinants of a square matrix and of its minor
+    matrices, obtained by sparse interpolation from evaluations modulo primes.
+
+    The entries are converted into polynomials with integer coefficients with
+    **zippelMatrix()**; the determinants of these polynomial matrices are
+    obtained with **zippelDet()**, and divided by the multiplication factors
+    of the rows.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :param minors: List with (row, col) tuples of minors, (None, None) for
+                   the determinant of the matrix itself.
+    :type minors: list
+
+    :return: Dictionary with key-value pairs:
+
+             - key: (row, col) (*tuple*) of the minor
+             - value: determinant (*sympy.Expr*)
+
+             or None if the entries are not rational functions of symbols
+             with rational coefficients, or if a determinant could not be
+             verified.
+    :rtype: dict, NoneType
+    """
+    matrix = zippelMatrix(M)
+    if matrix == None:
+        return None
+    gens, rows, scales, floats = matrix
+    dim = M.shape[0]
+    results = {}
+    for key in minors:
+        rowSel = [i for i in range(dim) if i != key[0]]
+        colSel = [j for j in range(dim) if j != key[1]]
+        terms = zippelDet(rows, rowSel, colSel, len(gens))
+        if terms == None:
+            return None
+        scale = sp.Mul(*[scales[i] for i in rowSel])
+        # Monomial scale factors are divided out term by term
+        (shift, divisor, monomial) = ((0,)*len(gens), 1, True)
+        try:
+            if scale.is_Integer:
+                divisor = int(scale)
+            elif sp.Poly(scale, *gens).is_monomial:
+                ((shift, divisor),) = sp.Poly(scale, *gens).terms()
+            else:
+                monomial = False
+            if monomial:
+                result = sp.Add(*[sp.Mul(sp.Rational(coeff, int(divisor)), *[gens[v]**(exponents[v] - shift[v]) for v in range(len(gens))]) for (exponents, coeff) in terms.items()])
+            else:
+                result = sp.Add(*[sp.Mul(coeff, *[gens[v]**exponents[v] for v in range(len(gens))]) for (exponents, coeff) in terms.items()])
+                result = exactQuotient(result, scale)
+        except (TypeError, ValueError, sp.PolynomialError):
+            return None
+        if floats:
+            result = sp.N(result)
+        results[key] = result
+    return results
+
+def detZippel(M):
+    """
+    Returns the expanded determinant of the square matrix 'M', obtained by
+    sparse interpolation with **minorsZippel()**.
+
+    If this fails, the determinant is calculated with **detMinors()**.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :return: Determinant of M
+    :rtype: sympy.Expr
+    """
+    result = minorsZippel(M, [(None, None)])
+    if result == None:
+        print("Error: sparse interpolation of the determinant failed, using 'minors'.")
+        return detMinors(M)
+    return result[(None, None)]
+
+class DDD(object):
+    """
+    Determinant decision diagram of a square matrix.
+
+    The determinant is represented as a directed acyclic graph of cofactor
+    expansions. Each vertex is a sub-determinant, identified by its ordered
+    row and column numbers; it is expanded along the row or column with the
+    smallest number of nonzero entries. Identical sub-determinants are
+    stored only once (hash-consing), such that the size of the diagram grows
+    with the number of distinct sub-determinants rather than with the number
+    of terms of the expanded determinant.
+
+    The diagram supports counting of the product terms, numeric evaluation,
+    differentiation and extraction of the coefficients of the Laplace
+    variable, without expansion of the determinant. The determinants of
+    minor matrices are obtained from the same diagram.
+
+    :param M: Square matrix, e.g. the MNA matrix from **makeMatrices()**.
+    :type M: sympy.Matrix
+
+    :Example:
+
+    >>> D = DDD(M)
+    >>> D.count()                     # Number of product terms of det(M)
+    >>> D.evaluate({R: 1e3}, s = 1j)  # Numeric value of det(M)
+    >>> D.coeff(2, 0, 1)              # Coefficient of s^2 of minor (0, 1)
+    """
+    def __init__(self, M):
+        self.M       = M
+        """
+        Square matrix (*sympy.Matrix*).
+        """
+        self.entries = {}
+        """
+        Dictionary with the nonzero entries of the matrix:
+
+        - key: (row, col) (*tuple*)
+        - value: entry (*sympy.Expr*)
+        """
+        self.nodes   = [[]]
+        """
+        List with the vertices of the diagram. Each vertex is a list with
+        (sign, (row, col), child) tuples of its cofactor expansion, child is
+        the index of the vertex of the sub-determinant. Vertex 0 is the unit
+        determinant of an empty matrix. Children are always stored before
+        their parents.
+        """
+        self.index   = {}
+        """
+        Dictionary with the vertex index of each sub-determinant:
+
+        - key: (rows, cols) (*tuple*) with the ordered row and column numbers
+        - value: index (*int*) of the vertex in self.nodes, or None if the
+          sub-determinant is structurally zero.
+        """
+        dim = M.shape[0]
+        self.rowEntries = [set() for i in range(dim)]
+        """
+        List with the sets of column numbers of the nonzero entries of each
+        row.
+        """
+        self.colEntries = [set() for i in range(dim)]
+        """
+        List with the sets of row numbers of the nonzero entries of each
+        column.
+        """
+        self.memo    = {}
+        """
+        Dictionary with the calculated coefficients of the vertices:
+
+        - key: (vertex, power) (*tuple*)
+        - value: coefficient of ini.Laplace^power (*sympy.Expr*)
+        """
+        for i in range(dim):
+            for j in range(dim):
+                if M[i, j] != 0:
+                    self.entries[(i, j)] = sp.sympify(M[i, j])
+                    self.rowEntries[i].add(j)
+                    self.colEntries[j].add(i)
+        self.index[((), ())] = 0
+
+    def vertex(self, rows, cols):
+        """
+        Returns the index of the vertex of the sub-determinant with the
+        ordered rows 'rows' and columns 'cols'; the vertex and its
+        descendants are created if they do not yet exist.
+
+        :param rows: Ordered row numbers
+        :type rows: tuple
+
+        :param cols: Ordered column numbers
+        :type cols: tuple
+
+        :return: Index of the vertex, or None if the sub-determinant is
+                 structurally zero.
+        :rtype: int, NoneType
+        """
+        key = (rows, cols)
+        if key in self.index:
+            return self.index[key]
+        dim = len(rows)
+        rowSet = set(rows)
+        colSet = set(cols)
+        # Find the row or column with the smallest number of nonzero entries
+        bestCount = dim + 1
+        for i in range(dim):
+            count = len(self.rowEntries[rows[i]] & colSet)
+            if count < bestCount:
+                bestCount = count
+                expansion = [(i, cols.index(j)) for j in sorted(self.rowEntries[rows[i]] & colSet)]
+            if bestCount < 2:
+                break
+        if bestCount > 1:
+            for j in range(dim):
+                count = len(self.colEntries[cols[j]] & rowSet)
+                if count < bestCount:
+                    bestCount = count
+                    expansion = [(rows.index(i), j) for i in sorted(self.colEntries[cols[j]] & rowSet)]
+                if bestCount < 2:
+                    break
+        edges = []
+        for (i, j) in expansion:
+            child = self.vertex(rows[0:i] + rows[i+1:], cols[0:j] + cols[j+1:])
+            if child != None:
+                edges.append(((-1)**(i + j), (rows[i], cols[j]), child))
+        if len(edges) == 0:
+            self.index[key] = None
+        else:
+            self.nodes.append(edges)
+            self.index[key] = len(self.nodes) - 1
+        return self.index[key]
+
+    def root(self, row = None, col = None):
+        """
+        Returns the index of the vertex of the determinant of the matrix, or
+        of the minor matrix obtained by deleting row 'row' and column 'col'.
+
+        :param row: Number of the deleted row, or None for the matrix itself.
+        :type row: int, NoneType
+
+        :param col: Number of the deleted column, or None for the matrix
+                    itself.
+        :type col: int, NoneType
+
+        :return: Index of the vertex, or None if the determinant is
+                 structurally zero.
+        :rtype: int, NoneType
+        """
+        dim = self.M.shape[0]
+        rows = tuple([i for i in range(dim) if i != row])
+        cols = tuple([j for j in range(dim) if j != col])
+        return self.vertex(rows, cols)
+
+    def size(self):
+        """
+        Returns the number of vertices and the number of edges of the
+        diagram.
+
+        :return: Tuple with the number of vertices and the number of edges.
+        :rtype: tuple
+        """
+        return (len(self.nodes), sum([len(edges) for edges in self.nodes]))
+
+    def count(self, row = None, col = None):
+        """
+        Returns the number of product terms of the expanded determinant, or
+        of the expanded minor (row, col), before cancellation of terms.
+
+        See **DDD.root()** for the description of the arguments.
+
+        :return: Number of product terms
+        :rtype: int
+        """
+        top = self.root(row, col)
+        if top == None:
+            return 0
+        terms = {key: len(sp.Add.make_args(sp.expand(self.entries[key]))) for key in self.entries}
+        counts = [1]
+        for edges in self.nodes[1: top + 1]:
+            counts.append(sum([terms[key]*counts[child] for (sign, key, child) in edges]))
+        return counts[top]
+
+    def entryValues(self, values, s, var = None):
+        """
+        Returns the numeric values of the entries of the matrix, or of their
+        derivatives with respect to 'var'.
+
+        :param values: Dictionary with key-value pairs:
+
+                       - key: parameter (*sympy.Symbol*)
+                       - value: numeric value (*int, float*)
+        :type values: dict
+
+        :param s: Value(s) of the Laplace variable
+        :type s: int, float, complex, numpy.ndarray
+
+        :param var: Variable for differentiation, or None
+        :type var: sympy.Symbol, NoneType
+
+        :return: Dictionary with the values of the entries, or None if the
+                 entries have symbols without values.
+        :rtype: dict, NoneType
+        """
+        results = {}
+        for key in self.entries:
+            entry = self.entries[key]
+            if var != None:
+                entry = sp.diff(entry, var)
+            entry = entry.subs(values)
+            if not entry.free_symbols.issubset({ini.Laplace}):
+                print("Error: missing values for:", entry.free_symbols.difference({ini.Laplace}))
+                return None
+            results[key] = sp.lambdify(ini.Laplace, entry, 'numpy')(s)
+        return results
+
+    def evaluate(self, values = {}, s = 0, row = None, col = None):
+        """
+        Returns the numeric value of the determinant, or of the minor (row,
+        col).
+
+        See **DDD.entryValues()** and **DDD.root()** for the description of
+        the arguments.
+
+        :return: Value(s) of the determinant
+        :rtype: float, complex, numpy.ndarray, NoneType
+        """
+        top = self.root(row, col)
+        if top == None:
+            return 0*s
+        entries = self.entryValues(values, s)
+        if entries == None:
+            return None
+        results = [1]
+        for edges in self.nodes[1: top + 1]:
+            results.append(sum([sign*entries[key]*results[child] for (sign, key, child) in edges]))
+        return results[top]
+
+    def diff(self, var, values = {}, s = 0, row = None, col = None):
+        """
+        Returns the numeric value of the derivative of the determinant, or
+        of the minor (row, col), with respect to 'var'.
+
+        The derivatives of the vertices are evaluated together with their
+        values, in a single pass through the diagram.
+
+        See **DDD.entryValues()** and **DDD.root()** for the description of
+        the arguments.
+
+        :return: Value(s) of the derivative of the determinant
+        :rtype: float, complex, numpy.ndarray, NoneType
+        """
+        var = sp.sympify(var)
+        top = self.root(row, col)
+        if top == None:
+            return 0*s
+        entries = self.entryValues(values, s)
+        derivs = self.entryValues(values, s, var)
+        if entries == None or derivs == None:
+            return None
+        results = [1]
+        diffs = [0]
+        for edges in self.nodes[1: top + 1]:
+            results.append(sum([sign*entries[key]*results[child] for (sign, key, child) in edges]))
+            diffs.append(sum([sign*(derivs[key]*results[child] + entries[key]*diffs[child]) for (sign, key, child) in edges]))
+        return diffs[top]
+
+    def coeff(self, power, row = None, col = None):
+        """
+        Returns the coefficient of ini.Laplace^power of the determinant, or
+        of the minor (row, col). The coefficients of the vertices are
+        calculated on demand and stored for reuse.
+
+        See **DDD.root()** for the description of the arguments.
+
+        :param power: Power of the Laplace variable.
+        :type power: int
+
+        :return: Expanded coefficient, or None if the entries are not
+                 polynomials of the Laplace variable.
+        :rtype: sympy.Expr, NoneType
+        """
+        top = self.root(row, col)
+        if top == None or power < 0:
+            return sp.Integer(0)
+        if 'coeffs' not in self.memo:
+            coeffs = {}
+            for key in self.entries:
+                if not self.entries[key].is_polynomial(ini.Laplace):
+                    print("Error: matrix entries are not polynomials of the Laplace variable.")
+                    return None
+                coeffs[key] = sp.Poly(self.entries[key], ini.Laplace).all_coeffs()[::-1]
+            self.memo['coeffs'] = coeffs
+        coeffs = self.memo['coeffs']
+        # Work list of (vertex, power) items; children first
+        stack = [(top, power)]
+        while len(stack) != 0:
+            (node, k) = stack[-1]
+            if (node, k) in self.memo:
+                stack.pop()
+                continue
+            if node == 0:
+                self.memo[(node, k)] = sp.Integer(int(k == 0))
+                stack.pop()
+                continue
+            missing = [(child, k - j) for (sign, key, child) in self.nodes[node] for j in range(min(k, len(coeffs[key]) - 1) + 1) if (child, k - j) not in self.memo]
+            if len(missing) != 0:
+                stack += missing
+                continue
+            terms = []
+            for (sign, key, child) in self.nodes[node]:
+                for j in range(min(k, len(coeffs[key]) - 1) + 1):
+                    sub = self.memo[(child, k - j)]
+                    if coeffs[key][j] != 0 and sub != 0:
+                        terms.append(sp.expand(sign*coeffs[key][j]*sub))
+            self.memo[(node, k)] = sp.Add(*terms)
+            stack.pop()
+        return self.memo[(top, power)]
+
+    def degree(self, row = None, col = None):
+        """
+        Returns an upper bound of the degree in ini.Laplace of the
+        determinant, or of the minor (row, col).
+
+        See **DDD.root()** for the description of the arguments.
+
+        :return: Upper bound of the degree, -1 if the determinant is
+                 structurally zero.
+        :rtype: int
+        """
+        top = self.root(row, col)
+        if top == None:
+            return -1
+        entryDegrees = {key: int(sp.degree(self.entries[key], ini.Laplace)) if self.entries[key].is_polynomial(ini.Laplace) else 0 for key in self.entries}
+        degrees = [0]
+        for edges in self.nodes[1: top + 1]:
+            degrees.append(max([entryDegrees[key] + degrees[child] for (sign, key, child) in edges]))
+        return degrees[top]
+
+    def expr(self, row = None, col = None):
+        """
+        Returns the expanded determinant, or the expanded minor (row, col),
+        collected in powers of ini.Laplace.
+
+        See **DDD.root()** for the description of the arguments.
+
+        :return: Determinant
+        :rtype: sympy.Expr
+        """
+        if self.root(row, col) == None:
+            return sp.Integer(0)
+        for entry in self.entries.values():
+            if not entry.is_polynomial(ini.Laplace):
+                if row == None:
+                    return detMinors(self.M)
+                return detMinors(self.M.minor_submatrix(row, col))
+        return sp.Add(*[self.coeff(k, row, col)*ini.Laplace**k for k in range(self.degree(row, col) + 1)])
+
+def exactQuotient(numer, denom):
+    """
+    Returns the expanded quotient of two expressions of which the quotient
+    is known to be a polynomial or a sum of terms without common
+    denominator.
+
+    Polynomials are divided exactly; other expressions are simplified with
+    sympy.cancel().
+
+    :param numer: Numerator
+    :type numer: sympy.Expr
+
+    :param denom: Denominator
+    :type denom: sympy.Expr
+
+    :return: Expanded quotient
+    :rtype: sympy.Expr
+    """
+    numer = sp.sympify(numer)
+    denom = sp.sympify(denom)
+    if denom == 1:
+        return sp.expand(numer)
+    gens = sorted(list(numer.free_symbols.union(denom.free_symbols)), key=str)
+    if len(gens) == 0:
+        return numer/denom
+    if numer.is_polynomial(*gens) and denom.is_polynomial(*gens):
+        try:
+            return sp.Poly(numer, *gens).exquo(sp.Poly(denom, *gens)).as_expr()
+        except sp.polys.polyerrors.ExactQuotientFailed:
+            pass
+    return sp.expand(sp.cancel(numer/denom))
+
+def pruneTerms(expr, values, tolerance, var = None):
+    """
+    Removes numerically insignificant terms from a polynomial in 'var'
+    (simplification after generation).
+
+    The terms are grouped into coefficients of the powers of 'var' and of
+    the parameters without a nominal numeric value, e.g. noise sources. The
+    terms of each coefficient are evaluated with the nominal parameter
+    values. The smallest terms are removed as long as the sum of the
+    magnitudes of the removed terms does not exceed 'tolerance' times the
+    magnitude of the nominal value of the coefficient. Coefficients with a
+    zero nominal value are not changed.
+
+    :param expr: Polynomial in 'var'
+    :type expr: sympy.Expr
+
+    :param values: Dictionary with key-value pairs:
+
+                   - key (*sympy.Symbol*): parameter
+                   - value (*sympy.Float*): nominal value of the parameter
+    :type values: dict
+
+    :param tolerance: Relative error tolerance per coefficient
+    :type tolerance: float
+
+    :param var: Variable of the polynomial, defaults to ini.Laplace
+    :type var: sympy.Symbol
+
+    :return: Tuple with the pruned expression and the largest relative error
+             of its coefficients at the nominal parameter values.
+    :rtype: tuple
+
+    :Example:
+
+    >>> a, b = sp.symbols('a b')
+    >>> pruneTerms(a + b + a*b*ini.Laplace, {a: sp.Float(1), b: sp.Float(1e-4)}, 0.01)
+    (a*b*s + a, 9.999000099990002e-05)
+    """
+    if var == None:
+        var = ini.Laplace
+    known = set(values.keys())
+    known.discard(var)
+    coeffs = {}
+    for term in sp.Add.make_args(sp.expand(expr)):
+        coeff = []
+        monomial = []
+        for factor in sp.Mul.make_args(term):
+            if factor.free_symbols.issubset(known):
+                coeff.append(factor)
+            else:
+                monomial.append(factor)
+        monomial = sp.Mul(*monomial)
+        if monomial not in coeffs:
+            coeffs[monomial] = []
+        coeffs[monomial].append((term, sp.Mul(*coeff)))
+    kept = []
+    error = 0
+    for monomial in list(coeffs.keys()):
+        terms = coeffs[monomial]
+        try:
+            nominal = [complex(coeff.xreplace(values)) for (term, coeff) in terms]
+        except TypeError:
+            kept += [term for (term, coeff) in terms]
+            continue
+        total = abs(sum(nominal))
+        bound = 0
+        dropped = 0
+        pruned = set()
+        if total != 0:
+            for i in sorted(range(len(terms)), key = lambda i: abs(nominal[i])):
+                bound += abs(nominal[i])
+                if bound > tolerance*total:
+                    break
+                dropped += nominal[i]
+                pruned.add(i)
+            error = max(error, abs(dropped)/total)
+        kept += [terms[i][0] for i in range(len(terms)) if i not in pruned]
+    return (sp.Add(*kept), error)
+
+def matrixDet(M, method = None):
+    """
+    Returns the expanded determinant of the square matrix 'M', calculated
+    with Python.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :param method: Calculation method:
+
+                   - 'minors': sparse minor expansion with memoized sub-minors
+                   - 'bareiss': fraction-free elimination with sparse pivoting
+                   - 'fft': evaluation and interpolation for matrices with
+                     numeric entries, see **minorsFFT()**
+                   - 'zippel': sparse interpolation from evaluations modulo
+                     primes, see **minorsZippel()**
+                   - 'ddd': coefficient extraction from a determinant
+                     decision diagram, see **DDD()**
+
+                   Defaults to ini.detMethod.
+    :type method: str
+
+    :return: Determinant of M
+    :rtype: sympy.Expr
+
+    :Example:
+
+    >>> M = sp.Matrix([[1/R, -1/R, 1],[-1/R, 1/R + s*C, 0], [1, 0, 0]])
+    >>> matrixDet(M, method = 'bareiss')
+    -C*s - 1/R
+    """
+    if method == None:
+        method = ini.detMethod
+    if method == 'bareiss':
+        return detBareiss(M)
+    elif method == 'fft':
+        return detFFT(M)
+    elif method == 'zippel':
+        return detZippel(M)
+    elif method == 'ddd':
+        return DDD(M).expr()
+    elif method != 'minors':
+        print("Error: unknown determinant method: '%s', using 'minors'."%(method))
+    return detMinors(M)
+
 if __name__ == "__main__":
     s = ini.Laplace
     """
@@ -3,7 +3,7 @@
 """
 SLiCAP module for building the MNA matrix and the associated vectors.
 
-Imported by the module **SLiCAPpythonMaxima.py**
+Imported by the module **SLiCAPnumeric.py**
 """
 
 from SLiCAP.SLiCAPprotos import *
@@ -27,13 +27,17 @@ def getValues(elmt, param, numeric, parDefs):
 
                     - key  : parameter name (sympy.Symbol)
                     - value: numeric value of sympy expression
-    :type parDefs: dict
+
+                    or a parameter resolver updated with these definitions
+    :type parDefs: dict, SLiCAPmath.parResolver
 
     :return: Tuple with sympy expresssions or numeric values of the numerator
              and the denominator of the element parameter.
     :return type: tuple
     """
-    if numeric == True:
+    if numeric == True and isinstance(parDefs, parResolver):
+        value = parDefs.subs(elmt.params[param], numeric = True)
+    elif numeric == True:
         value = sp.N(fullSubs(elmt.params[param], parDefs))
     else:
         value = elmt.params[param]
@@ -68,14 +72,18 @@ def getValue(elmt, param, numeric, parDefs):
 
                     - key  : parameter name (sympy.Symbol)
                     - value: numeric value of sympy expression
-    :type parDefs: dict
+
+                    or a parameter resolver updated with these definitions
+    :type parDefs: dict, SLiCAPmath.parResolver
 
     :return: value: sympy expresssion or numeric value of the element parameter
     :return type: sympy.Expr, int, float, sympy.Float
     """
     if param not in list(elmt.params.keys()):
         return 0
-    if numeric == True:
+    if numeric == True and isinstance(parDefs, parResolver):
+        value = parDefs.subs(elmt.params[param], numeric = True)
+    elif numeric == True:
         value = sp.N(fullSubs(elmt.params[param], parDefs))
     else:
         value = elmt.params[param]
@@ -85,6 +93,11 @@ def makeMatrices(cir, parDefs, numeric, gainType, lgRef):
     """
     Returns the MNA matrix and the vector with dependent variables of a circuit.
 
+    The matrices are obtained from the MNA template (see **mnaTemplate**) of
+    the circuit for the given gain type, which is created at the first call
+    and stored in the circuit object. Subsequent calls only re-evaluate the
+    matrix entries that depend on changed parameter definitions.
+
     Modifications in the circuit object, necessary for calculation of different
     gain types are temporary. The circuit data before and after
     running 'makeMatrices' is the same:
@@ -138,227 +151,473 @@ def makeMatrices(cir, parDefs, numeric, gainType, lgRef):
              #. Vector with dependent variables Dv
     :return type: tuple
     """
-    if gainType == 'vi' or gainType == 'gain':
-        pass
-    elif gainType == 'direct' or gainType == 'loopgain' or gainType == 'servo':
-        lgValue = cir.elements[lgRef].params['value']
-        cir.elements[lgRef].params['value'] = 0
-    varIndex = cir.varIndex
-    dim = len(list(cir.varIndex.keys()))
-    Dv = [0 for i in range(dim)]
-    M  = [[0 for i in range(dim)] for i in range(dim)]
-    for i in range(len(cir.depVars)):
-        Dv[i] = sp.Symbol(cir.depVars[i])
-    for el in list(cir.elements.keys()):
-        elmt = cir.elements[el]
-        if elmt.model == 'C':
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][pos0] += value * ini.Laplace
-            M[pos0][pos1] -= value * ini.Laplace
-            M[pos1][pos0] -= value * ini.Laplace
-            M[pos1][pos1] += value * ini.Laplace
-        elif elmt.model == 'L':
-            dVarPos = varIndex['I_'+ elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += 1
-            M[dVarPos][pos1] -= 1
-            M[dVarPos][dVarPos] -= value * ini.Laplace
-        elif elmt.model == 'R':
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            value = 1/getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][pos0] += value
-            M[pos0][pos1] -= value
-            M[pos1][pos0] -= value
-            M[pos1][pos1] += value
-        elif elmt.model == 'r':
-            dVarPos = varIndex['I_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += 1
-            M[dVarPos][pos1] -= 1
-            M[dVarPos][dVarPos] -= value
-        elif elmt.model == 'E':
-            dVarPos = varIndex['Io_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += denom
-            M[dVarPos][pos1] -= denom
-            M[dVarPos][pos2] -= numer
-            M[dVarPos][pos3] += numer
-        elif elmt.model == 'EZ':
-            dVarPos = varIndex['Io_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += denom * zoD
-            M[dVarPos][pos1] -= denom * zoD
-            M[dVarPos][pos2] -= numer * zoD
-            M[dVarPos][pos3] += numer * zoD
-            M[dVarPos][dVarPos] -= zoN * denom
-        elif elmt.model == 'F':
-            dVarPos = varIndex['Ii_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += numer
-            M[pos1][dVarPos] -= numer
-            M[pos2][dVarPos] += denom
-            M[pos3][dVarPos] -= denom
-            M[dVarPos][pos2] += 1
-            M[dVarPos][pos3] -= 1
-        elif elmt.model == 'g':
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][pos2] += value
-            M[pos0][pos3] -= value
-            M[pos1][pos2] -= value
-            M[pos1][pos3] += value
-        elif elmt.model == 'G':
-            dVarPos = varIndex['Io_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos2] += numer
-            M[dVarPos][pos3] -= numer
-            M[dVarPos][dVarPos] -= denom
-        elif elmt.model == 'H':
-            dVarPosO = varIndex['Io_' + elmt.refDes]
-            dVarPosI = varIndex['Ii_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPosO] += 1
-            M[pos1][dVarPosO] -= 1
-            M[pos2][dVarPosI] += 1
-            M[pos3][dVarPosI] -= 1
-            M[dVarPosI][pos2] += 1
-            M[dVarPosI][pos3] -= 1
-            M[dVarPosO][pos0] += denom
-            M[dVarPosO][pos1] -= denom
-            M[dVarPosO][dVarPosI] -= numer
-        elif elmt.model == 'HZ':
-            dVarPosO = varIndex['Io_' + elmt.refDes]
-            dVarPosI = varIndex['Ii_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
-            (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
-            M[pos0][dVarPosO] += 1
-            M[pos1][dVarPosO] -= 1
-            M[pos2][dVarPosI] += 1
-            M[pos3][dVarPosI] -= 1
-            M[dVarPosI][pos2] += 1
-            M[dVarPosI][pos3] -= 1
-            M[dVarPosO][pos0] += denom * zoD
-            M[dVarPosO][pos1] -= denom * zoD
-            M[dVarPosO][dVarPosI] -= numer * zoD
-            M[dVarPosO][dVarPosO] -= zoN * denom
-        elif elmt.model == 'N':
-            dVarPos = varIndex['Io_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos2] += 1
-            M[dVarPos][pos3] -= 1
-        elif elmt.model == 'T':
-            dVarPos = varIndex['Io_' + elmt.refDes]
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[pos2][dVarPos] -= value
-            M[pos3][dVarPos] += value
-            M[dVarPos][pos0] += 1
-            M[dVarPos][pos1] -= 1
-            M[dVarPos][pos2] -= value
-            M[dVarPos][pos3] += value
-        elif elmt.model == 'V':
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            dVarPos = varIndex['I_' + elmt.refDes]
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += 1
-            M[dVarPos][pos1] -= 1
-        elif elmt.model == 'VZ':
-            (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
-            pos1 = varIndex[elmt.nodes[1]]
-            pos0 = varIndex[elmt.nodes[0]]
-            M[pos0][dVarPos] += 1
-            M[pos1][dVarPos] -= 1
-            M[dVarPos][pos0] += zoD
-            M[dVarPos][pos1] -= zoD
-            M[dVarPos][dVarPos] -= zoN
-        elif elmt.model == 'W':
-            pos0 = varIndex[elmt.nodes[0]]
-            pos1 = varIndex[elmt.nodes[1]]
-            pos2 = varIndex[elmt.nodes[2]]
-            pos3 = varIndex[elmt.nodes[3]]
-            value = getValue(elmt, 'value', numeric, parDefs)
-            M[pos0][pos2] += value
-            M[pos0][pos3] -= value
-            M[pos1][pos2] -= value
-            M[pos1][pos3] += value
-            M[pos2][pos0] -= value
-            M[pos2][pos1] += value
-            M[pos3][pos0] += value
-            M[pos3][pos1] -= value
-        elif elmt.model == 'K':
-            refPos1 = varIndex['I_' + elmt.refs[0]]
-            refPos0 = varIndex['I_' + elmt.refs[1]]
-            ind0    = getValue(cir.elements[elmt.refs[0]].params['value'])
-            ind1    = getValue(cir.elements[elmt.refs[1]].params['value'])
-            value = getValue(elmt, 'value', numeric, parDefs)
-            value = value * ini.Laplace * sqrt(ind0 * ind1)
-    M = matrix(M)
-    gndPos = varIndex['0']
-    M.row_del(gndPos)
-    M.col_del(gndPos)
-    Dv = matrix(Dv)
-    Dv.row_del(gndPos)
-    # Restore circuit data
     if gainType == 'direct' or gainType == 'loopgain' or gainType == 'servo':
-        cir.elements[lgRef].params['value'] = lgValue
-    return (M, Dv)
+        key = (numeric, gainType, lgRef, tuple(cir.depVars))
+    else:
+        key = (numeric, gainType, None, tuple(cir.depVars))
+    if key not in list(cir.mnaTemplates.keys()):
+        cir.mnaTemplates[key] = mnaTemplate(cir, numeric, gainType, lgRef)
+    return cir.mnaTemplates[key].update(cir, parDefs)
+
+def elementStamps(cir, elmt, numeric, parDefs):
+    """
+    Returns the contributions of an element to the MNA matrix of a circuit.
+
+    This function is called by **mnaTemplate.update()**.
+
+    :param cir: Circuit that holds the element.
+    :type cir: SLiCAPprotos.circuit
+
+    :parm elmt: element object
+    :type elmt: SLiCAPprotos.element
+
+    :param numeric: If True is uses full substitution and sympy.N for converting
+                    parameters to sympy floats
+    :type numeric: bool
+
+    :param parDefs: Dict with key value pairs:
+
+                    - key  : parameter name (sympy.Symbol)
+                    - value: numeric value of sympy expression
+
+                    or a parameter resolver updated with these definitions
+    :type parDefs: dict, SLiCAPmath.parResolver
+
+    :return: Dict with key value pairs:
+
+             - key  : row position (*int*) in the MNA matrix
+             - value: dict with key value pairs:
+
+               - key  : column position (*int*) in the MNA matrix
+               - value: contribution (*sympy.Expr*) of the element to this
+                 matrix entry
+
+             Positions are those before elimination of the row and the column
+             associated with the reference node '0'.
+    :return type: dict
+    """
+    varIndex = cir.varIndex
+    M = defaultdict(lambda: defaultdict(int))
+    if elmt.model == 'C':
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][pos0] += value * ini.Laplace
+        M[pos0][pos1] -= value * ini.Laplace
+        M[pos1][pos0] -= value * ini.Laplace
+        M[pos1][pos1] += value * ini.Laplace
+    elif elmt.model == 'L':
+        dVarPos = varIndex['I_'+ elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += 1
+        M[dVarPos][pos1] -= 1
+        M[dVarPos][dVarPos] -= value * ini.Laplace
+    elif elmt.model == 'R':
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        value = 1/getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][pos0] += value
+        M[pos0][pos1] -= value
+        M[pos1][pos0] -= value
+        M[pos1][pos1] += value
+    elif elmt.model == 'r':
+        dVarPos = varIndex['I_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += 1
+        M[dVarPos][pos1] -= 1
+        M[dVarPos][dVarPos] -= value
+    elif elmt.model == 'E':
+        dVarPos = varIndex['Io_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += denom
+        M[dVarPos][pos1] -= denom
+        M[dVarPos][pos2] -= numer
+        M[dVarPos][pos3] += numer
+    elif elmt.model == 'EZ':
+        dVarPos = varIndex['Io_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += denom * zoD
+        M[dVarPos][pos1] -= denom * zoD
+        M[dVarPos][pos2] -= numer * zoD
+        M[dVarPos][pos3] += numer * zoD
+        M[dVarPos][dVarPos] -= zoN * denom
+    elif elmt.model == 'F':
+        dVarPos = varIndex['Ii_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += numer
+        M[pos1][dVarPos] -= numer
+        M[pos2][dVarPos] += denom
+        M[pos3][dVarPos] -= denom
+        M[dVarPos][pos2] += 1
+        M[dVarPos][pos3] -= 1
+    elif elmt.model == 'g':
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][pos2] += value
+        M[pos0][pos3] -= value
+        M[pos1][pos2] -= value
+        M[pos1][pos3] += value
+    elif elmt.model == 'G':
+        dVarPos = varIndex['Io_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos2] += numer
+        M[dVarPos][pos3] -= numer
+        M[dVarPos][dVarPos] -= denom
+    elif elmt.model == 'H':
+        dVarPosO = varIndex['Io_' + elmt.refDes]
+        dVarPosI = varIndex['Ii_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPosO] += 1
+        M[pos1][dVarPosO] -= 1
+        M[pos2][dVarPosI] += 1
+        M[pos3][dVarPosI] -= 1
+        M[dVarPosI][pos2] += 1
+        M[dVarPosI][pos3] -= 1
+        M[dVarPosO][pos0] += denom
+        M[dVarPosO][pos1] -= denom
+        M[dVarPosO][dVarPosI] -= numer
+    elif elmt.model == 'HZ':
+        dVarPosO = varIndex['Io_' + elmt.refDes]
+        dVarPosI = varIndex['Ii_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        (numer, denom) = getValues(elmt, 'value', numeric, parDefs)
+        (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
+        M[pos0][dVarPosO] += 1
+        M[pos1][dVarPosO] -= 1
+        M[pos2][dVarPosI] += 1
+        M[pos3][dVarPosI] -= 1
+        M[dVarPosI][pos2] += 1
+        M[dVarPosI][pos3] -= 1
+        M[dVarPosO][pos0] += denom * zoD
+        M[dVarPosO][pos1] -= denom * zoD
+        M[dVarPosO][dVarPosI] -= numer * zoD
+        M[dVarPosO][dVarPosO] -= zoN * denom
+    elif elmt.model == 'N':
+        dVarPos = varIndex['Io_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos2] += 1
+        M[dVarPos][pos3] -= 1
+    elif elmt.model == 'T':
+        dVarPos = varIndex['Io_' + elmt.refDes]
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[pos2][dVarPos] -= value
+        M[pos3][dVarPos] += value
+        M[dVarPos][pos0] += 1
+        M[dVarPos][pos1] -= 1
+        M[dVarPos][pos2] -= value
+        M[dVarPos][pos3] += value
+    elif elmt.model == 'V':
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        dVarPos = varIndex['I_' + elmt.refDes]
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += 1
+        M[dVarPos][pos1] -= 1
+    elif elmt.model == 'VZ':
+        (zoN, zoD) = getValues(elmt, 'zo', numeric, parDefs)
+        pos1 = varIndex[elmt.nodes[1]]
+        pos0 = varIndex[elmt.nodes[0]]
+        M[pos0][dVarPos] += 1
+        M[pos1][dVarPos] -= 1
+        M[dVarPos][pos0] += zoD
+        M[dVarPos][pos1] -= zoD
+        M[dVarPos][dVarPos] -= zoN
+    elif elmt.model == 'W':
+        pos0 = varIndex[elmt.nodes[0]]
+        pos1 = varIndex[elmt.nodes[1]]
+        pos2 = varIndex[elmt.nodes[2]]
+        pos3 = varIndex[elmt.nodes[3]]
+        value = getValue(elmt, 'value', numeric, parDefs)
+        M[pos0][pos2] += value
+        M[pos0][pos3] -= value
+        M[pos1][pos2] -= value
+        M[pos1][pos3] += value
+        M[pos2][pos0] -= value
+        M[pos2][pos1] += value
+        M[pos3][pos0] += value
+        M[pos3][pos1] -= value
+    elif elmt.model == 'K':
+        refPos1 = varIndex['I_' + elmt.refs[0]]
+        refPos0 = varIndex['I_' + elmt.refs[1]]
+        ind0    = getValue(cir.elements[elmt.refs[0]].params['value'])
+        ind1    = getValue(cir.elements[elmt.refs[1]].params['value'])
+        value = getValue(elmt, 'value', numeric, parDefs)
+        value = value * ini.Laplace * sqrt(ind0 * ind1)
+    return {row: dict(M[row]) for row in list(M.keys())}
+
+class mnaTemplate(object):
+    """
+    Compiled MNA matrix of a circuit for a given gain type.
+
+    The template holds the stamps of all circuit elements and, for each matrix
+    entry, the elements that contribute to it. It also holds the names of the
+    parameters on which the values of each element depend. An update with new
+    parameter definitions only restamps the elements of which the values
+    depend on changed definitions, and only recalculates the matrix entries
+    to which these elements contribute.
+
+    Templates are created by **makeMatrices()** and stored in the attribute
+    **mnaTemplates** of the circuit object.
+    """
+    def __init__(self, cir, numeric, gainType, lgRef):
+        """
+        Initialization of the MNA template, see description above.
+        """
+        self.numeric    = numeric
+        """
+        (*bool*) If True, element values are evaluated with full substitution
+        of the parameter definitions.
+        """
+
+        self.gainType   = gainType
+        """
+        Gain type (*str*) for which the template has been created.
+        """
+
+        self.lgRef      = lgRef
+        """
+        Reference designator (*str*) of the loop gain reference.
+        """
+
+        self.parDefs    = {}
+        """
+        (*dict*) with the parameter definitions used for the last update.
+        """
+
+        self.elements   = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: Reference designator (*str*) of the element.
+        - value: (*tuple*) with model, nodes, references and parameters of the
+          element at the time of stamping.
+        """
+
+        self.stamps     = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: Reference designator (*str*) of the element.
+        - value: Stamps (*dict*) of the element as returned by
+          **elementStamps()**.
+        """
+
+        self.depends    = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: Reference designator (*str*) of the element.
+        - value: (*set*) with names (*sympy.Symbol*) of the parameters on which
+          the element values depend.
+        """
+
+        self.entries    = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: (*tuple*) with row and column position of a matrix entry.
+        - value: (*list*) with reference designators (*str*) of the elements
+          that contribute to this entry.
+        """
+
+        dim = len(list(cir.varIndex.keys()))
+        self.M          = [[0 for i in range(dim)] for i in range(dim)]
+        """
+        Full MNA matrix (*list* of *lists*), including the row and the column
+        associated with the reference node '0'.
+        """
+
+        self.gndPos     = cir.varIndex['0']
+        """
+        Position (*int*) of the reference node '0' in the full MNA matrix.
+        """
+
+        Dv = matrix([sp.Symbol(depVar) for depVar in cir.depVars] + [0 for i in range(dim - len(cir.depVars))])
+        Dv.row_del(self.gndPos)
+        self.Dv         = Dv
+        """
+        Vector (*sympy.Matrix*) with dependent variables.
+        """
+
+    def dependencies(self, cir, elmt, parDefs):
+        """
+        Returns the names of the parameters on which the values of an element
+        depend.
+
+        :param cir: Circuit that holds the element.
+        :type cir: SLiCAPprotos.circuit
+
+        :parm elmt: element object
+        :type elmt: SLiCAPprotos.element
+
+        :param parDefs: Dict with key value pairs:
+
+                        - key  : parameter name (sympy.Symbol)
+                        - value: numeric value of sympy expression
+        :type parDefs: dict
+
+        :return: Set with parameter names (*sympy.Symbol*).
+        :rtype: set
+        """
+        if not self.numeric:
+            return set()
+        params = []
+        for ref in [elmt.refDes] + list(elmt.refs):
+            if ref in list(cir.elements.keys()):
+                for value in list(cir.elements[ref].params.values()):
+                    try:
+                        params += list(value.atoms(sp.Symbol))
+                    except AttributeError:
+                        pass
+        depends = set()
+        while len(params) != 0:
+            par = params.pop()
+            if par not in depends:
+                depends.add(par)
+                try:
+                    params += list(parDefs[par].atoms(sp.Symbol))
+                except (KeyError, AttributeError):
+                    pass
+        return depends
+
+    def update(self, cir, parDefs):
+        """
+        Updates the template with new parameter definitions and circuit data,
+        and returns the MNA matrix and the vector with dependent variables.
+
+        :param cir: Circuit of the template.
+        :type cir: SLiCAPprotos.circuit
+
+        :param parDefs: Dict with key value pairs:
+
+                        - key  : parameter name (sympy.Symbol)
+                        - value: numeric value of sympy expression
+        :type parDefs: dict
+
+        :return: tuple with two sympy matrices:
+
+                 #. MNA matrix M
+                 #. Vector with dependent variables Dv
+        :return type: tuple
+        """
+        changed = set()
+        for key in set(self.parDefs.keys()) | set(parDefs.keys()):
+            if key not in self.parDefs or key not in parDefs or self.parDefs[key] != parDefs[key]:
+                changed.add(key)
+        self.parDefs = dict(parDefs)
+        # Numeric element values are obtained from the resolved parameters
+        values = parDefs
+        if self.numeric:
+            cir.resolver.update(parDefs)
+            values = cir.resolver
+        newEntries = False
+        dirty = set()
+        for el in list(self.stamps.keys()):
+            if el not in list(cir.elements.keys()):
+                # Element has been removed from the circuit
+                for row in list(self.stamps[el].keys()):
+                    for col in list(self.stamps[el][row].keys()):
+                        dirty.add((row, col))
+                del self.stamps[el]
+                del self.elements[el]
+                del self.depends[el]
+                newEntries = True
+        for el in list(cir.elements.keys()):
+            elmt = cir.elements[el]
+            data = (elmt.model, list(elmt.nodes), list(elmt.refs), dict(elmt.params))
+            if el in list(self.elements.keys()) and self.elements[el] == data and len(self.depends[el] & changed) == 0:
+                continue
+            if el in list(self.elements.keys()):
+                for row in list(self.stamps[el].keys()):
+                    for col in list(self.stamps[el][row].keys()):
+                        dirty.add((row, col))
+            if self.elements.get(el, (None,))[:3] != data[:3]:
+                newEntries = True
+            if el == self.lgRef and (self.gainType == 'direct' or self.gainType == 'loopgain' or self.gainType == 'servo'):
+                # Stamp the loop gain reference with a zero value
+                lgValue = elmt.params['value']
+                elmt.params['value'] = 0
+                self.stamps[el] = elementStamps(cir, elmt, self.numeric, values)
+                elmt.params['value'] = lgValue
+            else:
+                self.stamps[el] = elementStamps(cir, elmt, self.numeric, values)
+            self.elements[el] = data
+            self.depends[el] = self.dependencies(cir, elmt, parDefs)
+            for row in list(self.stamps[el].keys()):
+                for col in list(self.stamps[el][row].keys()):
+                    dirty.add((row, col))
+        if newEntries:
+            # Element order determines the order of summation
+            self.entries = {}
+            for el in list(cir.elements.keys()):
+                for row in list(self.stamps[el].keys()):
+                    for col in list(self.stamps[el][row].keys()):
+                        if (row, col) in list(self.entries.keys()):
+                            self.entries[(row, col)].append(el)
+                        else:
+                            self.entries[(row, col)] = [el]
+        for (row, col) in dirty:
+            value = 0
+            for el in self.entries.get((row, col), []):
+                value += self.stamps[el][row][col]
+            self.M[row][col] = value
+        M = matrix(self.M)
+        M.row_del(self.gndPos)
+        M.col_del(self.gndPos)
+        return (M, self.Dv.copy())
 
 def makeSrcVector(cir, parDefs, elid, value = 'id', numeric = True):
     """
@@ -436,6 +695,240 @@ def makeSrcVector(cir, parDefs, elid, value = 'id', numeric = True):
     Iv.row_del(gndPos)
     return Iv
 
+def lgValue(instObj):
+    """
+    Calculates the corrected gain of the loop gain reference.
+
+    In case of a loop gain reference of the type EZ and HZ the calculation of
+    the loop gain is performed as if a current source was placed in parallel
+    with the output impedance (zo) of this controlled source (Norton equivalent
+    representation). The value of this current source is that of the loop gain
+    reference divided by the output impedance of the device.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: Gain of the loop gain reference, modified in a Norton equivalent
+             in cases in which the model of the loop gain reference is 'EZ' or
+             'HZ'.
+
+    :return type: sympy.
+    """
+    lgRef = instObj.circuit.elements[instObj.lgRef]
+    if lgRef.model == 'g':
+        value = lgRef.params['value']
+    elif lgRef.model == 'E':
+        value = lgRef.params['value']
+    elif lgRef.model == 'EZ':
+        if lgRef.params['zo'] != 0:
+            value = lgRef.params['value']/lgRef.params['zo']
+        else:
+            value = lgRef.params['value']
+    elif lgRef.model == 'HZ':
+        if lgRef.params['zo'] != 0:
+            value = lgRef.params['value']/lgRef.params['zo']
+        else:
+            value = lgRef.params['value']
+    elif lgRef.model == 'H':
+        value = lgRef.params['value']
+    elif lgRef.model == 'F':
+        value = lgRef.params['value']
+    elif lgRef.model == 'G':
+        value = lgRef.params['value']
+    if instObj.simType == 'numeric':
+        instObj.circuit.resolver.update(instObj.parDefs)
+        value = instObj.circuit.resolver.subs(value)
+    return value
+
+def makeSrcDetPos(instObj):
+    """
+    Returns the number of the source row(s) and detector colum(s) for
+    calculation of cofactors or for application of Cramer's rule.
+
+    If the gain type is 'loopgain' or 'servo', the source and the detector are
+    taken at the input and the output of the loop gain reference.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: tuple: (detP, detN, srcP, srcN):
+
+            - detP (*None, int*): number of the row of the vector with dependent
+              variables that corresponds with the positive detector
+            - detN (*None, int*): number of the row of the vector with dependent
+              variables that corresponds with the negative detector
+            - srcP (*None, int*): number of the row of the vector with dependent
+              variables that corresponds with the positive source
+            - srcN (*None, int*): number of the row of the vector with dependent
+              variables that corresponds with the negative source
+
+    :return type: tuple
+    """
+    detectors = []
+    for var in instObj.circuit.depVars:
+        if var != 'V_0':
+            detectors.append(var)
+    if instObj.gainType == 'loopgain' or instObj.gainType == 'servo':
+        lgRef = instObj.circuit.elements[instObj.lgRef]
+        if lgRef.model == 'E':
+            # The detector nodes are the inP and inN nodes of the VCVS
+            srcP = detectors.index('Io_' + instObj.lgRef)
+            srcN = None
+            # The source row is that of the current through the controlled
+            # voltage source
+            if lgRef.nodes[2] == '0':
+                detP = None
+            else:
+                detP = detectors.index('V_' + lgRef.nodes[2])
+            if lgRef.nodes[3] == '0':
+                detN = None
+            else:
+                detN = detectors.index('V_' + lgRef.nodes[3])
+        elif lgRef.model == 'EZ':
+            # The detector nodes are the inP and inN nodes of the VCVS
+            if lgRef.nodes[2] == '0':
+                detP = None
+            else:
+                detP = detectors.index('V_' + lgRef.nodes[2])
+            if lgRef.nodes[3] == '0':
+                detN = None
+            else:
+                detN = detectors.index('V_' + lgRef.nodes[3])
+            if lgRef.params['zo'] != 0:
+                # A current source in parallel with Zo, hence flowing from the
+                # outN node to the outP node of the device is the new source.
+                # The gain of the reference variable needs to be divided by the
+                # value of Zo.
+                if lgRef.nodes[0] == '0':
+                    srcP = None
+                else:
+                    srcP = detectors.index('V_' + lgRef.nodes[0])
+                if lgRef.nodes[1] == '0':
+                    srcN = None
+                else:
+                    srcN = detectors.index('V_' + lgRef.nodes[1])
+            else:
+                # If Zo is zero the method for model 'E' must be applied.
+                srcP = detectors.index('Io_' + instObj.lgRef)
+                srcN = None
+        elif lgRef.model == 'F':
+            # The detector row is that of the input current of the CCCS
+            detP = detectors.index('Ii_' + instObj.lgRef)
+            detN = None
+            # The source rows correspond with those of the nodes of the
+            # controlled current source at the output of the device.
+            if lgRef.nodes[1] == '0':
+                srcP = None
+            else:
+                srcP = detectors.index('V_' + lgRef.nodes[1])
+            if lgRef.nodes[0] == '0':
+                srcN = None
+            else:
+                srcN = detectors.index('V_' + lgRef.nodes[0])
+        elif lgRef.model == 'G':
+            # The detector rows correspond with those of the input nodes
+            # of the VCCS.
+            if lgRef.nodes[2] == '0':
+                detP = None
+            else:
+                detP = detectors.index('V_' + lgRef.nodes[2])
+            if lgRef.nodes[3] == '0':
+                detN = None
+            else:
+                detN = detectors.index('V_' + lgRef.nodes[3])
+            # The source current source flows from the outN node to the
+            # outP node of the device.
+            if lgRef.nodes[0] == '0':
+                srcN = None
+            else:
+                srcN = detectors.index('V_' + lgRef.nodes[0])
+            if lgRef.nodes[1] == '0':
+                srcP = None
+            else:
+                srcP = detectors.index('V_' + lgRef.nodes[1])
+        elif lgRef.model == 'g':
+            # The detector rows correspond with those of the input nodes
+            # of the VCCS.
+            if lgRef.nodes[2] == '0':
+                detP = None
+            else:
+                detP = detectors.index('V_' + lgRef.nodes[2])
+            if lgRef.nodes[3] == '0':
+                detN = None
+            else:
+                detN = detectors.index('V_' + lgRef.nodes[3])
+            # The source current source flows from the outN node to the
+            # outP node of the device.
+            if lgRef.nodes[1] == '0':
+                srcP = None
+            else:
+                srcP = detectors.index('V_' + lgRef.nodes[1])
+            if lgRef.nodes[0] == '0':
+                srcN = None
+            else:
+                srcN = detectors.index('V_' + lgRef.nodes[0])
+        elif lgRef.model == 'H':
+            # The detector row is that of the input current of the CCVS
+            detP = detectors.index('Ii_' + instObj.lgRef)
+            detN = None
+            # The source row is that of the output current of the CCVS
+            srcP = detectors.index('Io_' + instObj.lgRef)
+            srcN = None
+        elif lgRef.model == 'HZ':
+            # The detector row is that of the input current of the CCVS
+            detP = detectors.index('Ii_' + instObj.lgRef)
+            detN = None
+            if lgRef.params['zo'] != 0:
+                # A current source in parallel with Zo, hence flowing from the
+                # outN node to the outP node of the device is the new source.
+                # The gain of the reference variable needs to be divided by the
+                # value of Zo.
+                if lgRef.nodes[0] == '0':
+                    srcP = None
+                else:
+                    srcP = detectors.index('V_' + lgRef.nodes[0])
+                if lgRef.nodes[1] == '0':
+                    srcN = None
+                else:
+                    srcN = detectors.index('V_' + lgRef.nodes[1])
+            else:
+                # If Zo equals zero the method for model 'H' must be applied.
+                srcP = detectors.index('Io_' + instObj.lgRef)
+                srcN = None
+    else:
+        # For all other gain types:
+        # The detector rows are those that correspond with the dependent
+        # variables of the detector.
+        (detP, detN) = instObj.detector
+        if detP != None:
+            detP = detectors.index(detP)
+        if detN != None:
+            detN = detectors.index(detN)
+        if instObj.source != None:
+            # If there is s source defined:
+            if instObj.source[0].upper() == 'V':
+                # The source row corresponds with that of the current through
+                # the voltage source
+                srcP = detectors.index('I_' + instObj.source)
+                srcN = None
+            elif instObj.source[0].upper() == 'I':
+                # The source rows correspond with those of the nodal voltages
+                # of the source nodes
+                nodes = instObj.circuit.elements[instObj.source].nodes
+                if nodes[0] != '0':
+                    srcN = detectors.index('V_' + nodes[0])
+                else:
+                    srcN = None
+                if nodes[1] != '0':
+                    srcP = detectors.index('V_' + nodes[1])
+                else:
+                    srcP = None
+        else:
+            # If there is no source defines, srcP and srcN are set to 'None'
+            srcP = None
+            srcN = None
+    return(detP, detN, srcP, srcN)
+
 if __name__ == "__main__":
     s = ini.Laplace
 
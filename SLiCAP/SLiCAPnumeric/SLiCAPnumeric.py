@@ -0,0 +1,1842 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SLiCAP module with numeric functions that operate on the MNA matrix without
+calculation of symbolic determinants.
+
+Imported by the module **SLiCAPpythonMaxima.py**.
+"""
+
+from SLiCAP.SLiCAPmatrices import *
+
+def polyArray(expr, var = None):
+    """
+    Returns a numpy array with the coefficients of a polynomial in 'var' with
+    numeric coefficients.
+
+    :param expr: Polynomial in 'var'
+    :type expr: sympy.Expr, int, float
+
+    :param var: Indeterminate of the polynomial, defaults to ini.Laplace
+    :type var: sympy.Symbol
+
+    :return: Array with coefficients in ascending order of 'var', or None if
+             'expr' is not a polynomial in 'var' with numeric coefficients.
+    :rtype: numpy.ndarray, NoneType
+    """
+    if var == None:
+        var = ini.Laplace
+    expr = sp.sympify(expr)
+    if len(expr.free_symbols - set([var])) != 0:
+        return None
+    try:
+        poly = sp.Poly(expr, var, domain = 'RR')
+        coeffs = np.array([float(coeff) for coeff in poly.all_coeffs()])
+    except:
+        return None
+    return np.flip(coeffs, 0)
+
+def coeffMatrices(M, var = None):
+    """
+    Splits a matrix with polynomial entries into numpy matrices with the
+    coefficients of each power of 'var':
+
+    .. math::
+
+        M(s) = A_0 + s A_1 + ... + s^d A_d
+
+    :param M: Matrix of which the entries are polynomials in 'var' with numeric
+              coefficients, such as the numeric MNA matrix.
+    :type M: sympy.Matrix
+
+    :param var: Indeterminate of the polynomials, defaults to ini.Laplace
+    :type var: sympy.Symbol
+
+    :return: List with coefficient matrices [A_0, ..., A_d], or None if an
+             entry of M is not a polynomial with numeric coefficients.
+    :rtype: list, NoneType
+    """
+    (rows, cols) = M.shape
+    coeffs = [np.zeros((rows, cols))]
+    for i in range(rows):
+        for j in range(cols):
+            if M[i, j] != 0:
+                entry = polyArray(M[i, j], var)
+                if type(entry) == type(None):
+                    return None
+                while len(coeffs) < len(entry):
+                    coeffs.append(np.zeros((rows, cols)))
+                for k in range(len(entry)):
+                    coeffs[k][i, j] = entry[k]
+    while len(coeffs) > 1 and not np.any(coeffs[-1]):
+        coeffs.pop()
+    return coeffs
+
+def evalCoeffs(coeffs, s):
+    """
+    Returns the value of the matrix polynomial A_0 + s A_1 + ... + s^d A_d.
+
+    :param coeffs: List with coefficient matrices [A_0, ..., A_d]
+    :type coeffs: list
+
+    :param s: Value of the indeterminate
+    :type s: int, float, complex
+
+    :return: Matrix A_0 + s A_1 + ... + s^d A_d
+    :rtype: numpy.ndarray
+    """
+    value = coeffs[-1].astype(complex)
+    for k in range(len(coeffs) - 2, -1, -1):
+        value = value * s + coeffs[k]
+    return value
+
+def borderCoeffs(coeffs, col, row, rowPoly = None, corner = None):
+    """
+    Borders a matrix polynomial with a column, a row and a corner element:
+
+    .. math::
+
+        \\left[\\begin{array}{cc} M(s) & col \\\\ rowPoly(s)\\,row^T & corner(s)
+        \\end{array}\\right]
+
+    The determinant of this matrix equals:
+    :math:`corner(s)\\det(M(s)) - rowPoly(s)\\,row^T\\mathrm{adj}(M(s))\\,col`.
+
+    :param coeffs: List with coefficient matrices [A_0, ..., A_d] of M(s)
+    :type coeffs: list
+
+    :param col: Constant column vector
+    :type col: numpy.ndarray
+
+    :param row: Constant row vector
+    :type row: numpy.ndarray
+
+    :param rowPoly: Coefficients of the polynomial multiplier of the row in
+                    ascending order, defaults to [1]
+    :type rowPoly: numpy.ndarray
+
+    :param corner: Coefficients of the polynomial corner element in ascending
+                   order, defaults to [0]
+    :type corner: numpy.ndarray
+
+    :return: List with coefficient matrices of the bordered matrix
+    :rtype: list
+    """
+    if type(rowPoly) == type(None):
+        rowPoly = np.array([1.])
+    if type(corner) == type(None):
+        corner = np.array([0.])
+    n = coeffs[0].shape[0]
+    order = max(len(coeffs), len(rowPoly), len(corner))
+    newCoeffs = []
+    for k in range(order):
+        A = np.zeros((n + 1, n + 1))
+        if k < len(coeffs):
+            A[:n, :n] = coeffs[k]
+        if k == 0:
+            A[:n, n] = col
+        if k < len(rowPoly):
+            A[n, :n] = rowPoly[k] * row
+        if k < len(corner):
+            A[n, n] = corner[k]
+        newCoeffs.append(A)
+    return newCoeffs
+
+def freqScale(coeffs):
+    """
+    Returns a scale factor for the indeterminate that balances the norms of the
+    lowest and the highest order coefficient matrices of a matrix polynomial.
+
+    :param coeffs: List with coefficient matrices [A_0, ..., A_d]
+    :type coeffs: list
+
+    :return: Scale factor
+    :rtype: float
+    """
+    order = len(coeffs) - 1
+    norm0 = np.linalg.norm(coeffs[0])
+    normD = np.linalg.norm(coeffs[-1])
+    if order == 0 or norm0 == 0 or normD == 0:
+        return 1.
+    return (norm0/normD)**(1/order)
+
+def pencilEig(G, C, tol = 1e-12):
+    """
+    Returns the finite generalized eigenvalues of the matrix pencil G + s C.
+
+    The infinite eigenvalues of the pencil, which are caused by algebraic
+    relations in the network equations, are removed by repeated orthogonal
+    reduction of the pencil:
+
+    #. Variables and equations without s terms are eliminated with a Schur
+       complement
+    #. Algebraic constraints and the variables that enforce them are removed
+       by projection on the null spaces of the constraints and of the
+       constraining variables, respectively
+
+    This results in a pencil with nonsingular C of which all eigenvalues are
+    finite.
+
+    :param G: Square matrix
+    :type G: numpy.ndarray
+
+    :param C: Square matrix
+    :type C: numpy.ndarray
+
+    :param tol: Relative tolerance for rank decisions
+    :type tol: float
+
+    :return: Array with the finite eigenvalues, or None if the pencil is
+             singular (det(G + s C) = 0 for all s).
+    :rtype: numpy.ndarray, NoneType
+    """
+    G = np.array(G, dtype = float)
+    C = np.array(C, dtype = float)
+    while True:
+        n = G.shape[0]
+        if n == 0:
+            return np.array([])
+        scale = max(np.linalg.norm(G, 2), np.linalg.norm(C, 2))
+        if scale == 0:
+            return None
+        U, sC, Vh = np.linalg.svd(C)
+        r = int(np.sum(sC > tol * scale))
+        if r == n:
+            return eigvals(-G, C)
+        if r == 0:
+            if np.linalg.matrix_rank(G, tol * scale) < n:
+                return None
+            return np.array([])
+        Gt = U.T @ G @ Vh.T
+        P, sG, Qh = np.linalg.svd(Gt[r:, r:])
+        q = int(np.sum(sG > tol * scale))
+        G12 = Gt[:r, r:] @ Qh.T
+        G21 = P.T @ Gt[r:, :r]
+        # Schur complement of the nonsingular part of the algebraic block
+        A = Gt[:r, :r] - G12[:, :q] @ (G21[:q, :] / sG[:q, None])
+        Ct = np.diag(sC[:r])
+        m = n - r - q
+        if m == 0:
+            G, C = A, Ct
+            continue
+        # Algebraic constraints K x = 0 with variables y that only enter
+        # the differential equations through B y
+        B = G12[:, q:]
+        K = G21[q:, :]
+        UB, sB, VBh = np.linalg.svd(B)
+        UK, sK, VKh = np.linalg.svd(K)
+        if np.sum(sB > tol * scale) < m or np.sum(sK > tol * scale) < m:
+            return None
+        W = UB[:, m:]
+        N = VKh[m:, :].T
+        G, C = W.T @ A @ N, W.T @ Ct @ N
+
+def polyEig(coeffs):
+    """
+    Returns the finite eigenvalues of the matrix polynomial
+    A_0 + s A_1 + ... + s^d A_d, hence the roots of its determinant.
+
+    The rows and columns of the matrix polynomial are equilibrated and the
+    indeterminate is scaled before the matrix polynomial is linearized to a
+    matrix pencil G + s C of which the eigenvalues are calculated with
+    **pencilEig()**.
+
+    :param coeffs: List with coefficient matrices [A_0, ..., A_d]
+    :type coeffs: list
+
+    :return: Array with eigenvalues, or None if the determinant of the matrix
+             polynomial is zero for all s.
+    :rtype: numpy.ndarray, NoneType
+    """
+    n = coeffs[0].shape[0]
+    if n == 0:
+        return np.array([])
+    # Equilibrate rows and columns
+    absSum = sum([np.abs(A) for A in coeffs])
+    rowScale = np.max(absSum, axis = 1)
+    if np.any(rowScale == 0):
+        return None
+    absSum = absSum / rowScale[:, None]
+    colScale = np.max(absSum, axis = 0)
+    if np.any(colScale == 0):
+        return None
+    coeffs = [A / rowScale[:, None] / colScale[None, :] for A in coeffs]
+    # Scale the indeterminate
+    sigma = freqScale(coeffs)
+    coeffs = [coeffs[k] * sigma**k for k in range(len(coeffs))]
+    # Linearize: x, s x, ..., s^(d-1) x
+    order = len(coeffs) - 1
+    if order == 0:
+        G = coeffs[0]
+        C = np.zeros((n, n))
+    else:
+        G = np.zeros((order * n, order * n))
+        C = np.zeros((order * n, order * n))
+        for k in range(order):
+            G[:n, k*n:(k+1)*n] = coeffs[k]
+        C[:n, (order-1)*n:] = coeffs[order]
+        for k in range(1, order):
+            C[k*n:(k+1)*n, (k-1)*n:k*n] = np.eye(n)
+            G[k*n:(k+1)*n, k*n:(k+1)*n] = -np.eye(n)
+    eigs = pencilEig(G, C)
+    if type(eigs) == type(None):
+        return None
+    return sortRoots(eigs * sigma)
+
+def sortRoots(roots):
+    """
+    Sorts roots in order of increasing magnitude. Returns a real array if all
+    roots are real.
+
+    :param roots: Array with roots
+    :type roots: numpy.ndarray
+
+    :return: Sorted array with roots
+    :rtype: numpy.ndarray
+    """
+    roots = np.array(roots, dtype = complex)
+    roots = roots[np.lexsort((np.imag(roots), np.abs(roots)))]
+    if not np.any(np.imag(roots)):
+        roots = np.real(roots)
+    return roots
+
+def srcDetVectors(instObj):
+    """
+    Returns the source vector and the detector vector of a transfer.
+
+    The transfer equals :math:`row^T M^{-1} col`, in which M is the MNA matrix,
+    col is the source vector and row is the detector vector.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: tuple: (col, row) with numpy arrays
+    :rtype: tuple
+    """
+    (detP, detN, srcP, srcN) = makeSrcDetPos(instObj)
+    n = instObj.M.shape[0]
+    col = np.zeros(n)
+    row = np.zeros(n)
+    if srcP != None:
+        col[srcP] += 1
+    if srcN != None:
+        col[srcN] -= 1
+    if detP != None:
+        row[detP] += 1
+    if detN != None:
+        row[detN] -= 1
+    return (col, row)
+
+def lgArrays(instObj):
+    """
+    Returns the coefficients of the numerator and the denominator of the gain
+    of the loop gain reference for the gain types 'loopgain' and 'servo'. For
+    other gain types both are unity.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: tuple: (lgNumer, lgDenom) with coefficients in ascending order of
+             ini.Laplace, or (None, None) if the gain is not a rational
+             function of ini.Laplace with numeric coefficients.
+    :rtype: tuple
+    """
+    lgNumer = np.array([1.])
+    lgDenom = np.array([1.])
+    if instObj.gainType == 'loopgain' or instObj.gainType == 'servo':
+        lgNumer, lgDenom = sp.fraction(sp.together(lgValue(instObj)))
+        lgNumer = polyArray(lgNumer)
+        lgDenom = polyArray(lgDenom)
+        if type(lgNumer) == type(None) or type(lgDenom) == type(None):
+            return (None, None)
+    return (lgNumer, lgDenom)
+
+def numPZ(instObj, poles = True, zeros = True):
+    """
+    Calculates the numeric poles, zeros and the zero-frequency value of a
+    transfer without calculation of the numerator and the denominator.
+
+    - The numeric MNA matrix is split into its coefficient matrices:
+      :math:`M(s) = A_0 + s A_1 + ... + s^d A_d`
+    - The poles are the finite eigenvalues of :math:`M(s)`
+    - The zeros are the finite eigenvalues of :math:`M(s)` bordered with the
+      source vector and the detector vector
+
+    For the gain types 'loopgain' and 'servo' the poles and zeros of the loop
+    gain reference are included.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param poles: True if poles need to be calculated, defaults to True
+    :type poles: Bool
+
+    :param zeros: True if zeros need to be calculated, defaults to True
+    :type zeros: Bool
+
+    :return: tuple: (poles, zeros, DCvalue), in which items that have not been
+             requested are None. The DC value is only calculated if both poles
+             and zeros are requested. Returns None if the MNA matrix has
+             entries that are not polynomials in ini.Laplace with numeric
+             coefficients, or if the gain type is 'vi'.
+    :return type: tuple, NoneType
+    """
+    if not instObj.numeric or instObj.gainType == 'vi':
+        return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        return None
+    lgNumer, lgDenom = lgArrays(instObj)
+    if type(lgNumer) == type(None):
+        return None
+    (col, row) = srcDetVectors(instObj)
+    lgRoots = lambda coeffs: np.roots(np.flip(np.trim_zeros(coeffs, 'b'), 0))
+    p = None
+    z = None
+    DCvalue = None
+    if poles:
+        if instObj.gainType == 'servo':
+            p = polyEig(borderCoeffs(coeffs, col, row, lgNumer, lgDenom))
+        else:
+            p = polyEig(coeffs)
+        if type(p) == type(None):
+            print("Error: singular MNA matrix.")
+            return None
+        if instObj.gainType == 'loopgain':
+            p = sortRoots(np.concatenate((p, lgRoots(lgDenom))))
+    if zeros:
+        z = polyEig(borderCoeffs(coeffs, col, row))
+        if type(z) != type(None) and instObj.gainType in ['loopgain', 'servo']:
+            z = sortRoots(np.concatenate((z, lgRoots(lgNumer))))
+    if poles and zeros:
+        if type(z) == type(None):
+            # The numerator equals zero
+            z = np.array([])
+            DCvalue = 0
+        else:
+            # Direct evaluation at s=0, roots at the origin are counted if
+            # the transfer cannot be evaluated at s=0
+            DCvalue = pzTransfer(instObj, coeffs, col, row, lgNumer, lgDenom, 0)
+            if DCvalue == None:
+                tol = 1e-8 * freqScale(coeffs)
+                p0 = int(np.sum(np.abs(p) < tol))
+                z0 = int(np.sum(np.abs(z) < tol))
+                if z0 > p0:
+                    DCvalue = 0
+                elif p0 > z0:
+                    DCvalue = sp.oo
+                else:
+                    # Evaluate close to zero
+                    nonZero = np.abs(np.concatenate((p, z)))
+                    nonZero = nonZero[nonZero >= tol]
+                    if len(nonZero) != 0:
+                        DCvalue = pzTransfer(instObj, coeffs, col, row, lgNumer, lgDenom, 1e-6 * np.min(nonZero))
+                    if DCvalue == None:
+                        DCvalue = sp.oo
+    elif zeros and type(z) == type(None):
+        z = np.array([])
+    return (p, z, DCvalue)
+
+def pzTransfer(instObj, coeffs, col, row, lgNumer, lgDenom, s):
+    """
+    Evaluates the transfer of a pole-zero analysis with **numPZ()** at a real
+    value of the Laplace variable.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param coeffs: Coefficient matrices of the MNA matrix.
+    :type coeffs: list
+
+    :param col: Source vector.
+    :type col: numpy.ndarray
+
+    :param row: Detector vector.
+    :type row: numpy.ndarray
+
+    :param lgNumer: Coefficients of the numerator of the gain of the loop
+                    gain reference.
+    :type lgNumer: numpy.ndarray
+
+    :param lgDenom: Coefficients of the denominator of the gain of the loop
+                    gain reference.
+    :type lgDenom: numpy.ndarray
+
+    :param s: Value of the Laplace variable.
+    :type s: float
+
+    :return: Value of the transfer, or None if the MNA matrix is singular or
+             the gain of the loop gain reference is infinite at 's'.
+    :return type: sympy.Float, NoneType
+    """
+    if instObj.gainType == 'servo':
+        K = borderCoeffs(coeffs, col, row, lgNumer, lgDenom)
+    else:
+        K = coeffs
+    K = evalCoeffs(K, s)
+    if np.linalg.cond(K) > 1/np.finfo(float).eps:
+        return None
+    if instObj.gainType == 'servo':
+        rhs = np.zeros(len(col) + 1)
+        rhs[-1] = 1
+        y = np.linalg.solve(K, rhs)[-1]
+        value = 1 - np.polyval(np.flip(lgDenom, 0), s) * y
+    else:
+        value = row @ np.linalg.solve(K, col)
+        if instObj.gainType == 'loopgain':
+            lgD = np.polyval(np.flip(lgDenom, 0), s)
+            if lgD == 0:
+                return None
+            value *= np.polyval(np.flip(lgNumer, 0), s)/lgD
+    return sp.Float(np.real(value))
+
+def numTransfer(instObj, f, derivative = False):
+    """
+    Calculates the transfer, or the detector voltage or current for the gain
+    type 'vi', at the real frequencies f by solving the complex MNA equations
+    for all frequencies at once.
+
+    If ini.Hz == True, the Laplace variable equals 2*pi*j*f, else it equals
+    j*f.
+
+    The derivative of the transfer with respect to the Laplace variable is
+    obtained from the solution of the adjoint equations:
+    :math:`dH/ds = y^T (dcol/ds - dM/ds\\,x)`, with :math:`M x = col` and
+    :math:`M^T y = row`.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param f: Frequency value (*float*), or a numpy array with frequency values
+              (*float*).
+    :type f: float, list, numpy.ndarray
+
+    :param derivative: True if the derivative with respect to the Laplace
+                       variable needs to be returned, defaults to False
+    :type derivative: Bool
+
+    :return: Array with complex values of the transfer, or a tuple with this
+             array and an array with its derivatives if derivative == True.
+             Returns None if the instruction has no numeric MNA matrix, or if
+             the source or the detector is missing.
+    :rtype: numpy.ndarray, tuple, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    if instObj.gainType not in ['loopgain', 'servo']:
+        if instObj.detector == None or (instObj.gainType != 'vi' and instObj.source == None):
+            print("Error: missing source or detector for numeric frequency sweep.")
+            return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        return None
+    lgNumer, lgDenom = lgArrays(instObj)
+    if type(lgNumer) == type(None):
+        return None
+    (col, row) = srcDetVectors(instObj)
+    n = len(col)
+    if instObj.gainType == 'vi':
+        # Source vector with independent sources, possibly a function of s
+        Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'value', numeric = True)
+        srcFuncs = []
+        for i in range(n):
+            if Iv[i] != 0:
+                if len(sp.sympify(Iv[i]).free_symbols - set([ini.Laplace])) != 0:
+                    return None
+                srcFuncs.append((i, sp.lambdify(ini.Laplace, Iv[i]),
+                                 sp.lambdify(ini.Laplace, sp.diff(Iv[i], ini.Laplace))))
+    f = np.array(f, dtype = float).reshape(-1)
+    if ini.Hz == True:
+        s = 2j*np.pi*f
+    else:
+        s = 1j*f
+    H = np.zeros(len(s), dtype = complex)
+    dH = np.zeros(len(s), dtype = complex)
+    # Limit the size of the stacked matrices
+    chunk = max(1, int(2**22/max(1, n)**2))
+    for start in range(0, len(s), chunk):
+        sc = s[start: start + chunk]
+        M = np.zeros((len(sc), n, n), dtype = complex)
+        M += coeffs[0]
+        for k in range(1, len(coeffs)):
+            M += np.multiply.outer(sc**k, coeffs[k])
+        b = np.zeros((len(sc), n), dtype = complex)
+        db = np.zeros((len(sc), n), dtype = complex)
+        if instObj.gainType == 'vi':
+            for (i, func, dFunc) in srcFuncs:
+                b[:, i] = func(sc)
+                db[:, i] = dFunc(sc)
+        else:
+            b[:, :] = col
+        x = np.linalg.solve(M, b[:, :, None])[:, :, 0]
+        H[start: start + chunk] = x @ row
+        if derivative:
+            dM = np.zeros((len(sc), n, n), dtype = complex)
+            for k in range(1, len(coeffs)):
+                dM += np.multiply.outer(k*sc**(k-1), coeffs[k])
+            y = np.linalg.solve(np.transpose(M, (0, 2, 1)), np.tile(row.astype(complex), (len(sc), 1))[:, :, None])[:, :, 0]
+            dH[start: start + chunk] = np.sum(y * (db - np.einsum('kij,kj->ki', dM, x)), axis = 1)
+    if instObj.gainType == 'loopgain' or instObj.gainType == 'servo':
+        N = np.polyval(np.flip(lgNumer, 0), s)
+        D = np.polyval(np.flip(lgDenom, 0), s)
+        dN = np.polyval(np.polyder(np.flip(lgNumer, 0)), s)
+        dD = np.polyval(np.polyder(np.flip(lgDenom, 0)), s)
+        dL = dH*N/D + H*(dN*D - N*dD)/D**2
+        L = H*N/D
+        if instObj.gainType == 'loopgain':
+            H, dH = L, dL
+        else:
+            H, dH = -L/(1 - L), -dL/(1 - L)**2
+    if derivative:
+        return (H, dH)
+    return H
+
+def numNoise(instObj, f):
+    """
+    Calculates the contributions of all noise sources to the detector-referred
+    noise and to the source-referred noise spectral density at the real
+    frequencies f (in Hz).
+
+    For each frequency, the adjoint MNA equations :math:`M^T y = row` are
+    solved once, with M the MNA matrix at :math:`s = 2\\pi jf` and row the
+    detector vector. The transfer from each noise source to the detector is
+    then obtained as the inner product of y and the vector with the positions
+    of the source in the vector with independent variables. The source-
+    referred noise is obtained by division of the detector-referred noise by
+    the squared magnitude of the transfer :math:`y^T col` from the signal
+    source to the detector.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param f: Frequency value (*float*), or a numpy array with frequency values
+              (*float*).
+    :type f: float, list, numpy.ndarray
+
+    :return: tuple (onoise, inoise, onoiseTerms, inoiseTerms):
+
+             - onoise (*numpy.ndarray*): detector-referred noise spectrum
+             - inoise (*numpy.ndarray, NoneType*): source-referred noise
+               spectrum, None if the instruction has no source
+             - onoiseTerms (*dict*): key = ID of the noise source, value =
+               contribution to onoise (*numpy.ndarray*)
+             - inoiseTerms (*dict*): key = ID of the noise source, value =
+               contribution to inoise (*numpy.ndarray*), empty if the
+               instruction has no source
+
+             Returns None if the instruction has no numeric MNA matrix or
+             if the noise spectra are not numeric functions of the frequency.
+    :rtype: tuple, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    if instObj.detector == None:
+        print("Error: missing detector for numeric noise analysis.")
+        return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        return None
+    (col, row) = srcDetVectors(instObj)
+    n = len(row)
+    # Noise sources, their positions in the vector with independent variables
+    # and their numeric spectra
+    Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'id', numeric = True)
+    instObj.circuit.resolver.update(instObj.parDefs)
+    names = []
+    spectra = []
+    srcCols = []
+    for src in instObj.circuit.indepVars:
+        params = instObj.circuit.elements[src].params
+        if 'noise' in list(params.keys()) and params['noise'] != 0:
+            value = instObj.circuit.resolver.subs(params['noise'], numeric = True)
+            if len(sp.sympify(value).free_symbols - set([ini.frequency])) != 0:
+                print("Error: cannot evaluate the noise spectrum of '{0}' numerically.".format(src))
+                return None
+            names.append(src)
+            spectra.append(sp.lambdify(ini.frequency, value))
+            srcCols.append([float(sp.diff(Iv[i], sp.Symbol(src))) for i in range(n)])
+    f = np.array(f, dtype = float).reshape(-1)
+    s = 2j*np.pi*f
+    B = np.array(srcCols, dtype = float).reshape(len(names), n).T
+    T = np.zeros((len(s), len(names)), dtype = complex)
+    H = np.zeros(len(s), dtype = complex)
+    # Limit the size of the stacked matrices
+    chunk = max(1, int(2**22/max(1, n)**2))
+    for start in range(0, len(s), chunk):
+        sc = s[start: start + chunk]
+        M = np.zeros((len(sc), n, n), dtype = complex)
+        M += coeffs[0]
+        for k in range(1, len(coeffs)):
+            M += np.multiply.outer(sc**k, coeffs[k])
+        y = np.linalg.solve(np.transpose(M, (0, 2, 1)), np.tile(row.astype(complex), (len(sc), 1))[:, :, None])[:, :, 0]
+        T[start: start + chunk] = y @ B
+        H[start: start + chunk] = y @ col
+    onoise = np.zeros(len(f))
+    onoiseTerms = {}
+    for j in range(len(names)):
+        onoiseTerms[names[j]] = np.real(spectra[j](f)) * np.abs(T[:, j])**2 * np.ones(len(f))
+        onoise += onoiseTerms[names[j]]
+    inoise = None
+    inoiseTerms = {}
+    if instObj.source != None:
+        gain2 = np.abs(H)**2
+        inoise = onoise/gain2
+        for name in names:
+            inoiseTerms[name] = onoiseTerms[name]/gain2
+    return (onoise, inoise, onoiseTerms, inoiseTerms)
+
+def numIntegrate(func, fmin, fmax, cumulative = False):
+    """
+    Integrates one or more spectra over the frequency range from fmin to fmax.
+
+    The spectra are evaluated on a grid :math:`f = f_{min} + c(e^u - 1)` with
+    equidistant values of u. If fmin > 0, this grid is logarithmically spaced
+    from fmin to fmax. If fmin == 0, the spacing is linear near zero and
+    logarithmic above fmax*1e-6. The number of grid intervals is doubled,
+    reusing all earlier function values, until the Simpson estimates of two
+    successive grids of all spectra differ less than ini.numIntTol relative
+    to their values, or until the grid has 2**20 intervals.
+
+    :param func: Function that returns the spectra at an array with frequency
+                 values as a numpy array with these frequencies along the
+                 last axis.
+    :type func: function
+
+    :param fmin: Lower limit of the frequency range.
+    :type fmin: int, float
+
+    :param fmax: Upper limit of the frequency range.
+    :type fmax: int, float
+
+    :param cumulative: True if the integrals from fmin up to the grid
+                       frequencies need to be returned, defaults to False
+    :type cumulative: Bool
+
+    :return: Array with integrals, or a tuple with this array, the array with
+             grid frequencies and the array with cumulative integrals
+             (Simpson's rule, the last values equal the integrals) if
+             cumulative == True.
+    :rtype: numpy.ndarray, tuple
+    """
+    fmin = float(fmin)
+    fmax = float(fmax)
+    if fmin > 0:
+        U = np.log(fmax/fmin)
+    else:
+        U = np.log(1 + 1e6)
+    c = (fmax - fmin)/(np.exp(U) - 1)
+    def g(u):
+        return np.real(func(fmin + c*(np.exp(u) - 1))) * c * np.exp(u)
+    n = 64
+    h = U/n
+    u = np.linspace(0, U, n + 1)
+    y = g(u)
+    T = h*(np.sum(y, axis = -1) - (y[..., 0] + y[..., -1])/2)
+    S = None
+    while n < 2**20:
+        uMid = u[:-1] + h/2
+        yMid = g(uMid)
+        TNew = T/2 + h/2*np.sum(yMid, axis = -1)
+        SNew = (4*TNew - T)/3
+        # Merge the new function values with the previous ones
+        uNew = np.zeros(2*n + 1)
+        uNew[0::2] = u
+        uNew[1::2] = uMid
+        yNew = np.zeros(y.shape[:-1] + (2*n + 1,))
+        yNew[..., 0::2] = y
+        yNew[..., 1::2] = yMid
+        u, y, T, n, h = uNew, yNew, TNew, 2*n, h/2
+        if type(S) != type(None) and np.all(np.abs(SNew - S) <= ini.numIntTol*np.abs(SNew)):
+            S = SNew
+            break
+        S = SNew
+    else:
+        print("Warning: numeric integration did not converge within the tolerance ini.numIntTol.")
+    if cumulative:
+        # Simpson's rule over pairs of intervals, and over the first interval
+        # of each pair with the parabola through its three points
+        cum = np.zeros(y.shape)
+        cum[..., 2::2] = np.cumsum(h/3*(y[..., 0:-1:2] + 4*y[..., 1::2] + y[..., 2::2]), axis = -1)
+        cum[..., 1::2] = cum[..., 0:-1:2] + h/12*(5*y[..., 0:-1:2] + 8*y[..., 1::2] - y[..., 2::2])
+        return (S, fmin + c*(np.exp(u) - 1), cum)
+    return S
+
+def numRmsNoise(noiseResult, noise, fmin, fmax, sources, cumulative = False):
+    """
+    Calculates the RMS value of numeric noise spectra over the frequency range
+    from fmin to fmax with **numIntegrate()**.
+
+    All noise sources and all runs of a stepped instruction are integrated
+    together. The spectra are evaluated with **numNoise()** if no symbolic
+    spectra have been calculated (ini.numericNoise == True), else the
+    symbolic spectra are evaluated numerically.
+
+    :param noiseResult: Results of the execution of an instruction with data
+                        type 'noise'.
+    :type noiseResult: SLiCAPprotos.allResults
+
+    :param noise: 'inoise' or 'onoise'
+    :type noise: str
+
+    :param fmin: Lower limit of the frequency range in Hz.
+    :type fmin: int, float
+
+    :param fmax: Upper limit of the frequency range in Hz.
+    :type fmax: int, float
+
+    :param sources: List with IDs of noise sources of which the contributions
+                    to the RMS noise need to be calculated. The ID None
+                    denotes the total noise.
+    :type sources: list
+
+    :param cumulative: True if the RMS noise from fmin up to the grid
+                       frequencies need to be returned, defaults to False
+    :type cumulative: Bool
+
+    :return: Array with RMS values with shape (len(sources), number of runs),
+             or a tuple with this array, the array with grid frequencies and
+             the array with cumulative RMS values if cumulative == True.
+             Returns None if the spectra cannot be evaluated numerically.
+    :rtype: numpy.ndarray, tuple, NoneType
+    """
+    if type(noiseResult.onoise) == type(None):
+        if type(numNoise(noiseResult, [fmin, fmax])) == type(None):
+            return None
+        def func(f):
+            (onoise, inoise, onoiseTerms, inoiseTerms) = numNoise(noiseResult, f)
+            if noise == 'onoise':
+                noiseTerms = onoiseTerms
+                noiseTerms[None] = onoise
+            else:
+                noiseTerms = inoiseTerms
+                noiseTerms[None] = inoise
+            return np.array([[noiseTerms[key]] for key in sources])
+    else:
+        funcs = []
+        for key in sources:
+            if key == None:
+                if noise == 'onoise':
+                    noiseData = noiseResult.onoise
+                else:
+                    noiseData = noiseResult.inoise
+            elif noise == 'onoise':
+                noiseData = noiseResult.onoiseTerms[key]
+            else:
+                noiseData = noiseResult.inoiseTerms[key]
+            if type(noiseData) != list:
+                noiseData = [noiseData]
+            for spectrum in noiseData:
+                if len(sp.sympify(spectrum).free_symbols - set([ini.frequency])) != 0:
+                    return None
+            funcs.append([sp.lambdify(ini.frequency, spectrum) for spectrum in noiseData])
+        def func(f):
+            return np.array([[np.ones(len(f))*run(f) for run in runs] for runs in funcs])
+    result = numIntegrate(func, fmin, fmax, cumulative = cumulative)
+    if cumulative:
+        (integral, f, cum) = result
+        return (np.sqrt(integral), f, np.sqrt(np.maximum(cum, 0)))
+    return np.sqrt(result)
+
+def numDCvar(instObj, samples = None, seed = None, chunk = None):
+    """
+    Estimates the variance of the DC value of the detector quantity from
+    Monte-Carlo samples of the DC values of independent sources and the
+    values of resistors (model 'r') that have a nonzero 'dcvar' parameter.
+
+    The samples are drawn from normal distributions with the nominal value as
+    mean and the value of the 'dcvar' parameter as variance. The DC systems
+    of ini.dcvarChunk samples are stacked and solved at once; the mean values,
+    the variances and the covariances with the detector quantity are
+    accumulated over these chunks, hence memory usage does not grow with the
+    number of samples.
+
+    The contribution of a varied source or resistor to the detector variance
+    is estimated as :math:`cov(y,x_j)^2/var(x_j)`, with y the detector
+    quantity and :math:`x_j` the value of the source or resistor. It equals
+    the contribution of the linear part of the dependency of y on
+    :math:`x_j`. The contributions of resistors are stored under the names of
+    the currents through the resistors, and their source variance is that of
+    the equivalent error current at the nominal operating point, as with the
+    analytic dcvar analysis.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param samples: Number of samples, defaults to ini.dcvarSamples
+    :type samples: int
+
+    :param seed: Seed of the random number generator, defaults to
+                 ini.dcvarSeed
+    :type seed: int, NoneType
+
+    :param chunk: Number of samples solved at once, defaults to
+                  ini.dcvarChunk
+    :type chunk: int
+
+    :return: tuple (ovar, ivar, ovarTerms, ivarTerms, svarTerms, dcSolution):
+
+             - ovar (*sympy.Float*): detector-referred variance
+             - ivar (*sympy.Float, NoneType*): source-referred variance, None
+               if the instruction has no source
+             - ovarTerms (*dict*): key = ID of the variance source, value =
+               contribution to ovar (*sympy.Float*)
+             - ivarTerms (*dict*): key = ID of the variance source, value =
+               contribution to ivar (*sympy.Float*), empty if the instruction
+               has no source
+             - svarTerms (*dict*): key = ID of the variance source, value =
+               variance of the source (*sympy.Float*)
+             - dcSolution (*sympy.Matrix*): mean value of the DC solution of
+               the network
+
+             Returns None if the DC matrix is not numeric.
+    :rtype: tuple, NoneType
+    """
+    if samples == None:
+        samples = ini.dcvarSamples
+    if seed == None:
+        seed = ini.dcvarSeed
+    if chunk == None:
+        chunk = ini.dcvarChunk
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    if instObj.detector == None:
+        print("Error: missing detector for Monte-Carlo dcvar analysis.")
+        return None
+    if samples < 2:
+        print("Error: Monte-Carlo dcvar analysis requires at least two samples.")
+        return None
+    try:
+        G0 = np.array(instObj.M.subs(ini.Laplace, 0), dtype = float)
+    except TypeError:
+        print("Error: cannot evaluate the DC matrix numerically.")
+        return None
+    instObj.circuit.resolver.update(instObj.parDefs)
+    try:
+        Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'dc', numeric = True)
+        b0 = np.array(Iv.subs(ini.Laplace, 0), dtype = float).reshape(-1)
+    except TypeError:
+        print("Error: cannot evaluate the DC values of the sources numerically.")
+        return None
+    (col, row) = srcDetVectors(instObj)
+    x0 = np.linalg.solve(G0, b0)
+    n = len(b0)
+    detectors = [var for var in instObj.circuit.depVars if var != 'V_0']
+    # Variance sources: (ID, source vector) for independent sources and
+    # (ID, nominal value, position of the current) for resistors
+    varSources = []
+    svarTerms = {}
+    sigmas = []
+    Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'id', numeric = True)
+    for src in instObj.circuit.indepVars:
+        params = instObj.circuit.elements[src].params
+        if 'dcvar' in list(params.keys()) and params['dcvar'] != 0:
+            variance = float(instObj.circuit.resolver.subs(params['dcvar'], numeric = True))
+            srcCol = np.array([float(sp.diff(Iv[i], sp.Symbol(src))) for i in range(n)])
+            varSources.append((src, srcCol))
+            svarTerms[src] = sp.Float(variance)
+            sigmas.append(np.sqrt(variance))
+    for refDes in list(instObj.circuit.elements.keys()):
+        elmt = instObj.circuit.elements[refDes]
+        if elmt.model == 'r' and 'dcvar' in list(elmt.params.keys()) and elmt.params['dcvar'] != 0:
+            variance = float(instObj.circuit.resolver.subs(elmt.params['dcvar'], numeric = True))
+            value = float(sp.sympify(instObj.circuit.resolver.subs(elmt.params['value'], numeric = True)).subs(ini.Laplace, 0))
+            pos = detectors.index('I_' + refDes)
+            varSources.append(('I_' + refDes, value, pos))
+            svarTerms['I_' + refDes] = sp.Float(variance * (x0[pos]/value)**2)
+            sigmas.append(np.sqrt(variance))
+    sigmas = np.array(sigmas)
+    numVar = len(varSources)
+    rng = np.random.default_rng(seed)
+    # Streaming accumulation of mean values, squared deviations and
+    # co-deviations of the samples
+    count = 0
+    meanX = np.zeros(n)
+    meanY = 0
+    sqY = 0
+    meanXi = np.zeros(numVar)
+    sqXi = np.zeros(numVar)
+    coY = np.zeros(numVar)
+    for start in range(0, samples, chunk):
+        m = min(chunk, samples - start)
+        xi = rng.standard_normal((m, numVar)) * sigmas
+        G = np.tile(G0, (m, 1, 1))
+        b = np.tile(b0, (m, 1))
+        for j in range(numVar):
+            if len(varSources[j]) == 2:
+                b += np.multiply.outer(xi[:, j], varSources[j][1])
+            else:
+                pos = varSources[j][2]
+                G[:, pos, pos] -= xi[:, j]
+        x = np.linalg.solve(G, b[:, :, None])[:, :, 0]
+        y = x @ row
+        # Chan's parallel update of the accumulated statistics
+        chunkMeanY = np.mean(y)
+        chunkMeanXi = np.mean(xi, axis = 0)
+        dY = chunkMeanY - meanY
+        dXi = chunkMeanXi - meanXi
+        total = count + m
+        sqY += np.sum((y - chunkMeanY)**2) + dY**2 * count * m / total
+        sqXi += np.sum((xi - chunkMeanXi)**2, axis = 0) + dXi**2 * count * m / total
+        coY += (y - chunkMeanY) @ (xi - chunkMeanXi) + dY * dXi * count * m / total
+        meanY += dY * m / total
+        meanXi += dXi * m / total
+        meanX += (np.mean(x, axis = 0) - meanX) * m / total
+        count = total
+    ovar = sqY/(count - 1)
+    ovarTerms = {}
+    for j in range(numVar):
+        ovarTerms[varSources[j][0]] = sp.Float(coY[j]**2/(sqXi[j] * (count - 1)))
+    ivar = None
+    ivarTerms = {}
+    if instObj.source != None:
+        gain2 = (row @ np.linalg.solve(G0, col))**2
+        ivar = sp.Float(ovar/gain2)
+        for key in list(ovarTerms.keys()):
+            ivarTerms[key] = ovarTerms[key]/gain2
+    dcSolution = sp.Matrix([sp.Float(value) for value in meanX])
+    return (sp.Float(ovar), ivar, ovarTerms, ivarTerms, svarTerms, dcSolution)
+
+def partialFractions(numer, denom, poles = None, tol = 1e-3):
+    """
+    Returns the partial fraction expansion of a rational function of the
+    Laplace variable with numeric coefficients.
+
+    Poles that differ less than tol relative to their magnitude are merged
+    into one pole with a multiplicity that equals the number of merged poles.
+    The coefficients of a pole p with multiplicity m are obtained from the
+    Taylor series of :math:`(s-p)^m numer(s)/denom(s)` at s = p.
+
+    :param numer: Coefficients of the numerator in descending order.
+    :type numer: list, numpy.ndarray
+
+    :param denom: Coefficients of the denominator in descending order.
+    :type denom: list, numpy.ndarray
+
+    :param poles: Roots of the denominator, if None, they are calculated with
+                  **numRoots()**.
+    :type poles: list, numpy.ndarray, NoneType
+
+    :param tol: Relative tolerance for merging poles, defaults to 1e-3
+    :type tol: float
+
+    :return: tuple (poles, residues, direct):
+
+             - poles (*list*): distinct poles
+             - residues (*list*): for each pole an array with the coefficients
+               of :math:`1/(s-p)^k`, k = 1 .. m
+             - direct (*numpy.ndarray*): coefficients of the polynomial part
+               in descending order
+    :rtype: tuple
+    """
+    numer = np.trim_zeros(np.array(numer, dtype = complex), 'f')
+    denom = np.trim_zeros(np.array(denom, dtype = complex), 'f')
+    if len(numer) == 0:
+        return ([], [], np.zeros(1))
+    if len(numer) >= len(denom):
+        direct, numer = np.polydiv(numer, denom)
+    else:
+        direct = np.zeros(1)
+    if type(poles) == type(None):
+        poles = np.roots(denom)
+    poles = np.array(poles, dtype = complex)
+    # Merge poles that are equal within the tolerance
+    clusters = []
+    for pole in poles[np.argsort(np.abs(poles))]:
+        for cluster in clusters:
+            if abs(pole - cluster[0]) <= tol * max(abs(pole), abs(cluster[0])):
+                cluster.append(pole)
+                break
+        else:
+            clusters.append([pole])
+    poles = [np.mean(cluster) for cluster in clusters]
+    orders = [len(cluster) for cluster in clusters]
+    residues = []
+    for i in range(len(poles)):
+        p = poles[i]
+        m = orders[i]
+        otherPoles = []
+        for j in range(len(poles)):
+            if j != i:
+                otherPoles += [poles[j]] * orders[j]
+        rest = denom[0] * np.poly(otherPoles)
+        # Taylor coefficients at s = p by repeated synthetic division
+        taylorN = np.zeros(m, dtype = complex)
+        taylorD = np.zeros(m, dtype = complex)
+        polyN = numer
+        polyD = rest
+        for k in range(m):
+            taylorN[k] = np.polyval(polyN, p)
+            taylorD[k] = np.polyval(polyD, p)
+            polyN = np.polydiv(polyN, [1, -p])[0] if len(polyN) > 1 else np.zeros(1)
+            polyD = np.polydiv(polyD, [1, -p])[0] if len(polyD) > 1 else np.zeros(1)
+        # Taylor coefficients of the quotient
+        q = np.zeros(m, dtype = complex)
+        for k in range(m):
+            q[k] = (taylorN[k] - np.dot(taylorD[1: k + 1], np.flip(q[:k], 0)))/taylorD[0]
+        residues.append(np.flip(q, 0))
+    return (poles, residues, direct)
+
+class iltFunction(object):
+    """
+    Numeric inverse Laplace transforms of rational functions of the Laplace
+    variable with numeric coefficients, for all runs of an instruction.
+
+    The time function of each run is obtained from the partial fraction
+    expansion (**partialFractions()**) of the rational function:
+
+    .. math::
+
+        f(t) = \\sum_i \\sum_{k=1}^{m_i} c_{ik} \\frac{t^{k-1}}{(k-1)!} e^{p_i t}
+
+    in which :math:`c_{ik}` is the coefficient of :math:`1/(s-p_i)^k`. The
+    terms of complex conjugated poles are combined into real functions. Dirac
+    pulses at t = 0 of improper functions are not included.
+
+    The terms of all runs are stored in two-dimensional arrays, so that the
+    responses of all runs can be evaluated at once with **evaluate()**.
+    """
+    def __init__(self, numers, denoms):
+        """
+        :param numers: Two-dimensional array of which each row holds the
+                       coefficients of the numerator of a run in descending
+                       order.
+        :type numers: list, numpy.ndarray
+
+        :param denoms: Two-dimensional array of which each row holds the
+                       coefficients of the denominator of a run in descending
+                       order.
+        :type denoms: list, numpy.ndarray
+        """
+        self.poles  = np.zeros((0, 0), dtype = complex)
+        """
+        Complex array with a row for each run and a column for each term with
+        the poles of the terms.
+        """
+
+        self.powers = np.zeros((0, 0), dtype = int)
+        """
+        Array with the powers of t of the terms.
+        """
+
+        self.coeffs = np.zeros((0, 0), dtype = complex)
+        """
+        Complex array with the coefficients of the terms. The contribution of
+        a term is the real part of coeff * t**power * exp(pole * t).
+        """
+
+        numers = np.atleast_2d(np.array(numers, dtype = float))
+        denoms = np.atleast_2d(np.array(denoms, dtype = float))
+        allPoles = batchRoots(denoms)
+        runs = []
+        dirac = False
+        for i in range(len(denoms)):
+            (poles, residues, direct) = partialFractions(numers[i], denoms[i], allPoles[i])
+            if np.any(direct != 0):
+                dirac = True
+            terms = []
+            for j in range(len(poles)):
+                p = poles[j]
+                if np.imag(p) < -1e-9*abs(p):
+                    # Included in the term of the conjugate pole
+                    continue
+                elif np.imag(p) > 1e-9*abs(p):
+                    weight = 2
+                else:
+                    weight = 1
+                for k in range(len(residues[j])):
+                    terms.append((p, k, weight*residues[j][k]/float(sp.factorial(k))))
+            runs.append(terms)
+        if dirac:
+            print("Warning: Dirac pulses at t = 0 are not included in the time response.")
+        self.setTerms(runs)
+
+    def setTerms(self, runs):
+        """
+        Stores the terms of all runs in the arrays **poles**, **powers** and
+        **coeffs**. Runs with less terms are padded with zero coefficients.
+
+        :param runs: List with for each run a list with tuples (pole, power,
+                     coeff).
+        :type runs: list
+        """
+        numTerms = max([len(terms) for terms in runs] + [0])
+        self.poles = np.zeros((len(runs), numTerms), dtype = complex)
+        self.powers = np.zeros((len(runs), numTerms), dtype = int)
+        self.coeffs = np.zeros((len(runs), numTerms), dtype = complex)
+        for i in range(len(runs)):
+            for j in range(len(runs[i])):
+                (self.poles[i, j], self.powers[i, j], self.coeffs[i, j]) = runs[i][j]
+
+    def terms(self):
+        """
+        Returns the terms of all runs.
+
+        :return: List with for each run a list with tuples (pole, power,
+                 coeff).
+        :rtype: list
+        """
+        return [[(self.poles[i, j], self.powers[i, j], self.coeffs[i, j]) for j in range(self.poles.shape[1]) if self.coeffs[i, j] != 0] for i in range(self.poles.shape[0])]
+
+    def extend(self, other):
+        """
+        Appends the runs of another **iltFunction** object.
+
+        :param other: Numeric inverse Laplace transforms of other runs.
+        :type other: SLiCAPnumeric.iltFunction
+        """
+        self.setTerms(self.terms() + other.terms())
+
+    def evaluate(self, t):
+        """
+        Evaluates the time functions of all runs.
+
+        :param t: Time value (*float*), or a numpy array with time values
+                  (*float*).
+        :type t: float, list, numpy.ndarray
+
+        :return: Array with a row for each run and a column for each time
+                 value.
+        :rtype: numpy.ndarray
+        """
+        t = np.array(t, dtype = float).reshape(-1)
+        result = np.zeros((self.poles.shape[0], len(t)))
+        for j in range(self.poles.shape[1]):
+            result += np.real(self.coeffs[:, j:j+1] * t**self.powers[:, j:j+1] * np.exp(self.poles[:, j:j+1] * t))
+        return result
+
+    def expr(self, run = 0):
+        """
+        Returns the time function of a run as a sympy expression of
+        sympy.Symbol('t').
+
+        :param run: Number of the run, defaults to 0
+        :type run: int
+
+        :return: Time function
+        :rtype: sympy.Expr
+        """
+        t = sp.Symbol('t')
+        result = 0
+        for (pole, power, coeff) in self.terms()[run]:
+            if abs(np.imag(pole)) <= 1e-9*abs(pole):
+                term = sp.Float(np.real(coeff)) * sp.exp(sp.Float(np.real(pole))*t)
+            else:
+                term = sp.exp(sp.Float(np.real(pole))*t) * (sp.Float(np.real(coeff))*sp.cos(sp.Float(np.imag(pole))*t) -
+                                                             sp.Float(np.imag(coeff))*sp.sin(sp.Float(np.imag(pole))*t))
+            result += term * t**int(power)
+        return result
+
+def numILT(numers, denoms):
+    """
+    Returns the numeric inverse Laplace transforms of a number of rational
+    functions numers[i]/denoms[i] of ini.Laplace.
+
+    :param numers: List with numerators (*sympy.Expr*), one for each run.
+    :type numers: list
+
+    :param denoms: List with denominators (*sympy.Expr*), one for each run.
+    :type denoms: list
+
+    :return: Numeric inverse Laplace transforms of all runs, or None if the
+             numerators and denominators are not polynomials of ini.Laplace
+             with numeric coefficients.
+    :rtype: SLiCAPnumeric.iltFunction, NoneType
+    """
+    polys = []
+    for i in range(len(denoms)):
+        numer = polyArray(numers[i])
+        denom = polyArray(denoms[i])
+        if type(numer) == type(None) or type(denom) == type(None):
+            return None
+        polys.append((numer, denom))
+    size = max([max(len(numer), len(denom)) for (numer, denom) in polys])
+    numers = np.zeros((len(polys), size))
+    denoms = np.zeros((len(polys), size))
+    for i in range(len(polys)):
+        (numer, denom) = polys[i]
+        numers[i, size - len(numer):] = np.flip(numer, 0)
+        denoms[i, size - len(denom):] = np.flip(denom, 0)
+    return iltFunction(numers, denoms)
+
+def pwlWave(times, values):
+    """
+    Returns a piecewise linear waveform for **numTransient()**.
+
+    Before the first time point and after the last time point the waveform
+    keeps the first and the last value, respectively.
+
+    :param times: Time points in ascending order.
+    :type times: list, numpy.ndarray
+
+    :param values: Values of the waveform at the time points.
+    :type values: list, numpy.ndarray
+
+    :return: Function that returns the values of the waveform at an array
+             with time values.
+    :rtype: function
+    """
+    times = np.array(times, dtype = float)
+    values = np.array(values, dtype = float)
+    def wave(t):
+        return np.interp(t, times, values)
+    return wave
+
+def pulseWave(v1, v2, delay = 0, rise = 0, fall = 0, width = None, period = None):
+    """
+    Returns a pulse waveform for **numTransient()**, defined as the SPICE
+    PULSE source.
+
+    :param v1: Initial value.
+    :type v1: int, float
+
+    :param v2: Pulsed value.
+    :type v2: int, float
+
+    :param delay: Delay time, defaults to 0
+    :type delay: int, float
+
+    :param rise: Rise time, defaults to 0
+    :type rise: int, float
+
+    :param fall: Fall time, defaults to 0
+    :type fall: int, float
+
+    :param width: Pulse width, defaults to None (infinite).
+    :type width: int, float, NoneType
+
+    :param period: Period of a pulse train, defaults to None (single pulse).
+    :type period: int, float, NoneType
+
+    :return: Function that returns the values of the waveform at an array
+             with time values.
+    :rtype: function
+    """
+    def wave(t):
+        tau = np.array(t, dtype = float) - delay
+        if period != None:
+            tau = np.where(tau >= 0, np.mod(tau, period), tau)
+        y = np.full(tau.shape, float(v1))
+        rising = (tau >= 0) & (tau < rise)
+        y[rising] = v1 + (v2 - v1)*tau[rising]/rise
+        if width == None:
+            y[tau >= rise] = v2
+        else:
+            y[(tau >= rise) & (tau < rise + width)] = v2
+            falling = (tau >= rise + width) & (tau < rise + width + fall)
+            y[falling] = v2 - (v2 - v1)*(tau[falling] - rise - width)/fall
+        return y
+    return wave
+
+def numTransient(instObj, t, inputs):
+    """
+    Calculates the response of the detector of a numeric instruction to input
+    waveforms of independent sources.
+
+    The MNA equations :math:`M(s)x = B u` are converted into the descriptor
+    state-space system :math:`C\\dot{z} + G z = B_z u(t)`. If M(s) is of
+    first order in s, G and C are the coefficient matrices of :math:`s^0` and
+    :math:`s^1`, and z = x. Higher orders are linearized with the state
+    :math:`z = [x, \\dot{x}, ...]`. The system is integrated with the
+    trapezoidal rule on the time grid t, with a backward Euler first step.
+    The system matrix is factorized once for each distinct time step, after
+    which each step only requires a matrix-vector product. The initial state
+    at t[0] has a zero dynamic state (:math:`C z = 0`) and algebraic
+    variables that are consistent with the inputs at t[0].
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param t: Time grid in ascending order with at least two time points.
+    :type t: list, numpy.ndarray
+
+    :param inputs: Input waveforms, a dictionary with key-value pairs:
+
+                   - key: ID of an independent source
+                   - value: Function of time (such as returned by
+                     **pwlWave()** or **pulseWave()**), array with values at
+                     the time points t, or a constant.
+
+                   If inputs is not a dictionary, it is the waveform of the
+                   source of the instruction.
+    :type inputs: dict, function, list, numpy.ndarray, int, float
+
+    :return: Array with values of the detector voltage or current at the time
+             points t, or None in case of errors.
+    :rtype: numpy.ndarray, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        print("Error: transient analysis requires a numeric MNA matrix.")
+        return None
+    if instObj.detector == None:
+        print("Error: missing detector for transient analysis.")
+        return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        print("Error: the MNA matrix is not a polynomial matrix of ini.Laplace with numeric coefficients.")
+        return None
+    if type(inputs) != dict:
+        if instObj.source == None:
+            print("Error: missing source for transient analysis.")
+            return None
+        inputs = {instObj.source: inputs}
+    (col, row) = srcDetVectors(instObj)
+    n = len(row)
+    t = np.array(t, dtype = float).reshape(-1)
+    if len(t) < 2:
+        print("Error: transient analysis requires at least two time points.")
+        return None
+    Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'id', numeric = True)
+    B = np.zeros((n, len(inputs)))
+    U = np.zeros((len(inputs), len(t)))
+    srcs = list(inputs.keys())
+    for j in range(len(srcs)):
+        if srcs[j] not in instObj.circuit.indepVars:
+            print("Error: unknown independent source: '{0}'.".format(srcs[j]))
+            return None
+        B[:, j] = [float(sp.diff(Iv[i], sp.Symbol(srcs[j]))) for i in range(n)]
+        if callable(inputs[srcs[j]]):
+            U[j] = inputs[srcs[j]](t)
+        else:
+            U[j] = np.array(inputs[srcs[j]], dtype = float) * np.ones(len(t))
+    # Descriptor system
+    if len(coeffs) == 1:
+        coeffs.append(np.zeros((n, n)))
+    d = len(coeffs) - 1
+    C = np.zeros((n*d, n*d))
+    G = np.zeros((n*d, n*d))
+    for k in range(d - 1):
+        C[k*n: (k+1)*n, k*n: (k+1)*n] = np.eye(n)
+        G[k*n: (k+1)*n, (k+1)*n: (k+2)*n] = -np.eye(n)
+    C[(d-1)*n:, (d-1)*n:] = coeffs[d]
+    for k in range(d):
+        G[(d-1)*n:, k*n: (k+1)*n] = coeffs[k]
+    rhs = np.zeros((n*d, len(t)))
+    rhs[(d-1)*n:] = B @ U
+    # Integration: z[i] = P z[i-1] + Q f[i], with the propagators P and Q
+    # of the time step of step i
+    keys = [(i == 1, float('%.12g'%(t[i] - t[i-1]))) for i in range(1, len(t))]
+    forcing = np.zeros((n*d, len(t)))
+    forcing[:, 1] = rhs[:, 1]
+    forcing[:, 2:] = rhs[:, 2:] + rhs[:, 1:-1]
+    propagators = {}
+    for key in set(keys):
+        (first, h) = key
+        if first:
+            A = C/h + G
+            R = C/h
+        else:
+            A = 2*C/h + G
+            R = 2*C/h - G
+        lu = lu_factor(A, check_finite = False)
+        if np.any(np.diag(lu[0]) == 0):
+            print("Error: singular system matrix in transient analysis.")
+            return None
+        steps = [i + 1 for i in range(len(keys)) if keys[i] == key]
+        forcing[:, steps] = lu_solve(lu, forcing[:, steps])
+        propagators[key] = lu_solve(lu, R)
+    # Initial state: C z = 0 and the algebraic equations, i.e. the projection
+    # of G z = f on the left null space of C
+    (Uc, Sc, Vc) = np.linalg.svd(C)
+    rank = int(np.sum(Sc > 1e-12*max(np.max(Sc), 1e-300)))
+    N = Uc[:, rank:]
+    A = np.vstack((np.diag(Sc[:rank]) @ Vc[:rank], N.T @ G))
+    b = np.concatenate((np.zeros(rank), N.T @ rhs[:, 0]))
+    z = np.linalg.lstsq(A, b, rcond = None)[0]
+    y = np.zeros(len(t))
+    y[0] = row @ z[:n]
+    for i in range(1, len(t)):
+        z = propagators[keys[i-1]] @ z + forcing[:, i]
+        y[i] = row @ z[:n]
+    return y
+
+def sensMatrices(instObj, value = None):
+    """
+    Returns the derivatives of the numeric MNA matrix, and of the vector with
+    independent variables, with respect to the circuit parameters.
+
+    The partial derivatives with respect to the parameters in the element
+    stamps are obtained from the symbolic MNA matrix. The derivatives with
+    respect to parameters of which other parameters depend are obtained with
+    the chain rule from the Jacobian J of the parameter definitions:
+    :math:`D = (I - J)^{-1}`, in which :math:`D_{qp}` is the total derivative
+    of parameter q with respect to parameter p.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param value: 'value' or 'dc' if the derivatives of the vector with the
+                  values or with the dc values of the independent sources need
+                  to be calculated, defaults to None
+    :type value: str, NoneType
+
+    :return: tuple (pars, dM, dIv):
+
+             - pars (*list*): parameters (*sympy.Symbol*) on which the MNA
+               matrix or the vector with independent variables depends
+             - dM (*list*): for each parameter a list with coefficient
+               matrices [A_0, ..., A_d] of the derivative of the MNA matrix
+             - dIv (*list*): for each parameter the derivative of the vector
+               with independent variables (*sympy.Matrix*), an empty list if
+               value == None
+
+             Returns None if the derivatives cannot be evaluated numerically.
+    :rtype: tuple, NoneType
+    """
+    resolver = instObj.circuit.resolver
+    resolver.update(instObj.parDefs)
+    (M, Dv) = makeMatrices(instObj.circuit, instObj.parDefs, False, instObj.gainType, instObj.lgRef)
+    if value != None:
+        Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = value, numeric = False)
+    pars = sorted(list(instObj.parDefs.keys()), key = str)
+    index = {}
+    for i in range(len(pars)):
+        index[pars[i]] = i
+    # Jacobian of the parameter definitions
+    J = np.zeros((len(pars), len(pars)))
+    for q in pars:
+        definition = sp.sympify(instObj.parDefs[q])
+        for r in definition.free_symbols:
+            if r in index:
+                try:
+                    J[index[q], index[r]] = float(resolver.subs(sp.diff(definition, r), numeric = True))
+                except TypeError:
+                    print("Error: cannot evaluate the derivative of '{0}' with respect to '{1}' numerically.".format(q, r))
+                    return None
+    try:
+        D = np.linalg.inv(np.eye(len(pars)) - J)
+    except np.linalg.LinAlgError:
+        print("Error: circular parameter definitions.")
+        return None
+    # Partial derivatives with respect to the parameters in the stamps
+    n = M.shape[0]
+    partialM = {}
+    partialIv = {}
+    for i in range(n):
+        for j in range(n):
+            if M[i, j] != 0:
+                for q in sp.sympify(M[i, j]).free_symbols:
+                    if q in index:
+                        entry = polyArray(resolver.subs(sp.diff(M[i, j], q), numeric = True))
+                        if type(entry) == type(None):
+                            print("Error: cannot evaluate the derivative of the MNA matrix with respect to '{0}' numerically.".format(q))
+                            return None
+                        if q not in partialM:
+                            partialM[q] = [np.zeros((n, n))]
+                        while len(partialM[q]) < len(entry):
+                            partialM[q].append(np.zeros((n, n)))
+                        for k in range(len(entry)):
+                            partialM[q][k][i, j] += entry[k]
+        if value != None and Iv[i] != 0:
+            for q in sp.sympify(Iv[i]).free_symbols:
+                if q in index:
+                    if q not in partialIv:
+                        partialIv[q] = sp.zeros(n, 1)
+                    partialIv[q][i] = resolver.subs(sp.diff(Iv[i], q), numeric = True)
+    # Total derivatives
+    direct = set(partialM.keys()) | set(partialIv.keys())
+    dPars = []
+    dM = []
+    dIv = []
+    for p in pars:
+        terms = [q for q in direct if D[index[q], index[p]] != 0]
+        if len(terms) == 0:
+            continue
+        coeffs = [np.zeros((n, n))]
+        vector = sp.zeros(n, 1)
+        for q in terms:
+            factor = D[index[q], index[p]]
+            if q in partialM:
+                while len(coeffs) < len(partialM[q]):
+                    coeffs.append(np.zeros((n, n)))
+                for k in range(len(partialM[q])):
+                    coeffs[k] += factor * partialM[q][k]
+            if q in partialIv:
+                vector += factor * partialIv[q]
+        dPars.append(p)
+        dM.append(coeffs)
+        if value != None:
+            dIv.append(vector)
+    return (dPars, dM, dIv)
+
+def sensValues(dM, dIv, s, x, y):
+    """
+    Returns the derivatives :math:`y^T (dIv/dp - dM/dp\\,x)` of the detector
+    quantity with respect to the parameters p, at the values s of the Laplace
+    variable.
+
+    :param dM: For each parameter a list with coefficient matrices of the
+               derivative of the MNA matrix, as returned by
+               **sensMatrices()**.
+    :type dM: list
+
+    :param dIv: For each parameter the derivative of the vector with
+                independent variables, as returned by **sensMatrices()**, or
+                an empty list.
+    :type dIv: list
+
+    :param s: Array with values of the Laplace variable
+    :type s: numpy.ndarray
+
+    :param x: Array with the solutions of the MNA equations for each value of
+              s, with shape (len(s), n)
+    :type x: numpy.ndarray
+
+    :param y: Array with the solutions of the adjoint equations for each
+              value of s, with shape (len(s), n)
+    :type y: numpy.ndarray
+
+    :return: Array with derivatives with shape (number of parameters, len(s))
+    :rtype: numpy.ndarray
+    """
+    values = np.zeros((len(dM), len(s)), dtype = complex)
+    for i in range(len(dM)):
+        # dM/dp x for all values of s
+        dMx = np.zeros(x.shape, dtype = complex)
+        for k in range(len(dM[i]) - 1, -1, -1):
+            dMx = dMx * s[:, None] + x @ dM[i][k].T
+        values[i] = -np.sum(y * dMx, axis = 1)
+        if len(dIv) != 0 and dIv[i] != sp.zeros(*dIv[i].shape):
+            db = sp.lambdify(ini.Laplace, dIv[i])
+            db = np.array([np.array(db(sk), dtype = complex).reshape(-1) for sk in s])
+            values[i] += np.sum(y * db, axis = 1)
+    return values
+
+def numTransferSens(instObj, f):
+    """
+    Calculates the derivatives of the transfer, or of the detector voltage or
+    current for the gain type 'vi', with respect to all circuit parameters at
+    the real frequencies f.
+
+    For each frequency the MNA equations :math:`M x = col` and the adjoint
+    equations :math:`M^T y = row` are solved once. The derivative with
+    respect to parameter p then equals :math:`y^T (dcol/dp - dM/dp\\,x)`.
+
+    If ini.Hz == True, the Laplace variable equals 2*pi*j*f, else it equals
+    j*f.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param f: Frequency value (*float*), or a numpy array with frequency values
+              (*float*).
+    :type f: float, list, numpy.ndarray
+
+    :return: Dict with key-value pairs:
+
+             - key (*sympy.Symbol*): name of the parameter
+             - value (*numpy.ndarray*): complex derivatives at f
+
+             Returns None if the instruction has no numeric MNA matrix, if the
+             gain type is not 'gain' or 'vi', or if the source or the detector
+             is missing.
+    :rtype: dict, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    if instObj.gainType not in ['gain', 'vi']:
+        print("Error: sensitivities are only available for the gain types 'gain' and 'vi'.")
+        return None
+    if instObj.detector == None or (instObj.gainType != 'vi' and instObj.source == None):
+        print("Error: missing source or detector for sensitivity analysis.")
+        return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        return None
+    if instObj.gainType == 'vi':
+        sens = sensMatrices(instObj, value = 'value')
+    else:
+        sens = sensMatrices(instObj)
+    if type(sens) == type(None):
+        return None
+    (pars, dM, dIv) = sens
+    (col, row) = srcDetVectors(instObj)
+    n = len(col)
+    if instObj.gainType == 'vi':
+        Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'value', numeric = True)
+        if len(sp.sympify(sum(Iv)).free_symbols - set([ini.Laplace])) != 0:
+            return None
+        srcFunc = sp.lambdify(ini.Laplace, Iv)
+    f = np.array(f, dtype = float).reshape(-1)
+    if ini.Hz == True:
+        s = 2j*np.pi*f
+    else:
+        s = 1j*f
+    values = np.zeros((len(pars), len(s)), dtype = complex)
+    # Limit the size of the stacked matrices
+    chunk = max(1, int(2**22/max(1, n)**2))
+    for start in range(0, len(s), chunk):
+        sc = s[start: start + chunk]
+        M = np.zeros((len(sc), n, n), dtype = complex)
+        M += coeffs[0]
+        for k in range(1, len(coeffs)):
+            M += np.multiply.outer(sc**k, coeffs[k])
+        if instObj.gainType == 'vi':
+            b = np.array([np.array(srcFunc(sk), dtype = complex).reshape(-1) for sk in sc])
+        else:
+            b = np.tile(col.astype(complex), (len(sc), 1))
+        x = np.linalg.solve(M, b[:, :, None])[:, :, 0]
+        y = np.linalg.solve(np.transpose(M, (0, 2, 1)), np.tile(row.astype(complex), (len(sc), 1))[:, :, None])[:, :, 0]
+        values[:, start: start + chunk] = sensValues(dM, dIv, sc, x, y)
+    result = {}
+    for i in range(len(pars)):
+        result[pars[i]] = values[i]
+    return result
+
+def numDCsens(instObj):
+    """
+    Calculates the derivatives of the DC value of the detector quantity
+    (gain type 'vi'), or of the DC value of the transfer (gain type 'gain'),
+    with respect to all circuit parameters, from one solution of the MNA
+    equations and one solution of the adjoint equations at s = 0.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: Dict with key-value pairs:
+
+             - key (*sympy.Symbol*): name of the parameter
+             - value (*sympy.Float*): derivative of the DC value
+
+             Returns None if the DC matrix cannot be evaluated numerically, or
+             if it is singular.
+    :rtype: dict, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    if instObj.gainType == 'vi':
+        sens = sensMatrices(instObj, value = 'dc')
+    else:
+        sens = sensMatrices(instObj)
+    if type(sens) == type(None):
+        return None
+    (pars, dM, dIv) = sens
+    (col, row) = srcDetVectors(instObj)
+    try:
+        M = np.array(instObj.M.subs(ini.Laplace, 0), dtype = float)
+        if instObj.gainType == 'vi':
+            Iv = makeSrcVector(instObj.circuit, instObj.parDefs, 'all', value = 'dc', numeric = True)
+            col = np.array(Iv.subs(ini.Laplace, 0), dtype = float).reshape(-1)
+    except TypeError:
+        print("Error: cannot evaluate the DC equations numerically.")
+        return None
+    try:
+        x = np.linalg.solve(M, col)
+        y = np.linalg.solve(M.T, row)
+    except np.linalg.LinAlgError:
+        print("Error: singular DC matrix.")
+        return None
+    values = np.real(sensValues(dM, dIv, np.zeros(1), x[None, :], y[None, :]))
+    result = {}
+    for i in range(len(pars)):
+        result[pars[i]] = sp.Float(values[i, 0])
+    return result
+
+def numPoleSens(instObj):
+    """
+    Calculates the derivatives of the dominant pole of the network with
+    respect to all circuit parameters.
+
+    The dominant pole is the root of the determinant of the MNA matrix with
+    the smallest magnitude; of a complex pair the pole with a positive
+    imaginary part is taken. With v and u the right and left null vectors of
+    :math:`M(p)`, the derivative of the pole p with respect to parameter q
+    equals :math:`-u^T (dM/dq)\\,v / (u^T (dM/ds)\\,v)`.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :return: tuple (pole, poleSens) with the dominant pole (*float, complex*)
+             and a dict with key-value pairs:
+
+             - key (*sympy.Symbol*): name of the parameter
+             - value (*float, complex*): derivative of the dominant pole
+
+             Returns None if the network has no poles, or if the MNA matrix
+             cannot be evaluated numerically.
+    :rtype: tuple, NoneType
+    """
+    if not instObj.numeric or type(instObj.M) == type(None):
+        return None
+    coeffs = coeffMatrices(instObj.M)
+    if type(coeffs) == type(None):
+        return None
+    poles = polyEig(coeffs)
+    if type(poles) == type(None) or len(poles) == 0:
+        return None
+    pole = complex(poles[0])
+    if pole.imag < 0:
+        pole = pole.conjugate()
+    sens = sensMatrices(instObj)
+    if type(sens) == type(None):
+        return None
+    (pars, dM, dIv) = sens
+    (U, S, Vh) = np.linalg.svd(evalCoeffs(coeffs, pole))
+    v = np.conj(Vh[-1])
+    u = np.conj(U[:, -1])
+    dMds = np.zeros(coeffs[0].shape, dtype = complex)
+    for k in range(1, len(coeffs)):
+        dMds += k * pole**(k-1) * coeffs[k]
+    values = sensValues(dM, [], np.array([pole]), v[None, :], u[None, :])[:, 0] / (u @ dMds @ v)
+    if pole.imag == 0:
+        pole = pole.real
+        values = np.real(values)
+    result = {}
+    for i in range(len(pars)):
+        result[pars[i]] = values[i].item()
+    return (pole, result)
+
+def numFunc_f(instObj, f, funcType):
+    """
+    Calculates the magnitude, the dB magnitude, the phase or the group delay
+    of a transfer at the real frequencies f with **numTransfer()**.
+
+    The phase is in degrees if ini.Hz == True, else in radians. The group
+    delay is calculated from the derivative of the transfer:
+    :math:`\\tau = -\\Re(H'(s)/H(s))`.
+
+    :param instObj: **allResults()** object that holds instruction data.
+    :type instObj: :class:`allResult()`
+
+    :param f: Frequency value (*float*), or a numpy array with frequency values
+              (*float*).
+    :type f: float, list, numpy.ndarray
+
+    :param funcType: 'mag', 'dBmag', 'phase' or 'delay'
+    :type funcType: str
+
+    :return: Array with function values, or None if the transfer cannot be
+             evaluated numerically.
+    :rtype: numpy.ndarray, NoneType
+    """
+    result = numTransfer(instObj, f, derivative = (funcType == 'delay'))
+    if type(result) == type(None):
+        return None
+    if funcType == 'mag':
+        return np.abs(result)
+    elif funcType == 'dBmag':
+        return 20*np.log10(np.abs(result))
+    elif funcType == 'phase':
+        phase = np.unwrap(np.angle(result))
+        if ini.Hz:
+            phase = phase * 180/np.pi
+        return phase
+    elif funcType == 'delay':
+        (H, dH) = result
+        return -np.real(dH/H)
+    print("Error: unknown funcType: '{0}'.".format(funcType))
+    return None
+
+if __name__ == "__main__":
+    s = ini.Laplace
+
+    MNA = matrix([[5.0e-12*s + 0.01, 0, 0, -5.0e-12*s - 0.01, 0, 0, 0, 0, 1],
+                  [0, 1.98e-11*s + 0.0001, -1.2e-11*s, -1.8e-12*s - 1.0e-5, 0, 0, 0, 0, 0],
+                  [0, -1.2e-11*s, 2.8e-11*s + 0.001, 0, -1.0e-11*s - 0.001, 0, 0, -1, 0],
+                  [-5.0e-12*s - 0.01, -1.8e-12*s - 1.0e-5, 0, 1.0068e-9*s + 0.01101, 0, 0, 1, 0, 0],
+                  [0, 0, -1.0e-11*s - 0.001, 0, 1.0e-11*s + 0.001, 1, 0, 1, 0],
+                  [0, 0, 0, 0, 1, 0, 0, 0, 0],
+                  [0, 0, 0, 1, 0, 0, -1.0e-6*s, -3.1623e-11*s, 0],
+                  [0, 0, -1, 0, 1, 0, -3.1623e-11*s, -1.0e-9*s, 0],
+                  [2.048e-20*s**3 + 2.688e-11*s**2 + 0.0016*s + 1, 0, 0, 0, 0, 0, 0, 0, 0]])
+
+    print(polyEig(coeffMatrices(MNA)))
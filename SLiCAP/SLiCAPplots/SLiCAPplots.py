@@ -395,6 +395,120 @@ def defaultsPlot():
             for tick in fig.axes[i].yaxis.get_major_ticks():
                 tick.label.set_fontsize(ini.plotFontSize)
 
+def sweepFunc_f(result, yData, x, funcType):
+    """
+    Returns the magnitude, the dB magnitude, the phase or the group delay of
+    a non-stepped frequency domain result for **plotSweep()**.
+
+    If ini.numericSweep == True, the function values of numeric results of the
+    data types 'laplace' and 'matrix' are calculated with
+    **SLiCAPnumeric.numFunc_f()**. Else the Laplace transform 'yData' will be
+    evaluated.
+
+    :param result: Results of the execution of an instruction.
+    :type result: SLiCAPprotos.allResults
+
+    :param yData: Laplace transform of the result.
+    :type yData: sympy.Expr, NoneType
+
+    :param x: Numpy array with frequency values
+    :type x: numpy.array
+
+    :param funcType: 'mag', 'dBmag', 'phase' or 'delay'
+    :type funcType: str
+
+    :return: Function values at the frequencies x
+    :rtype: numpy.array
+    """
+    if ini.numericSweep and result.numeric and not result.step and \
+    result.dataType in ['laplace', 'matrix'] and result.gainType != 'asymptotic':
+        y = numFunc_f(result, x, funcType)
+        if type(y) != type(None):
+            return y
+    if yData == None:
+        print("Error: cannot evaluate the transfer of dataType '{0}'.".format(result.dataType))
+        return np.full(len(x), np.nan)
+    if funcType == 'mag':
+        return magFunc_f(yData, x)
+    elif funcType == 'dBmag':
+        return dBmagFunc_f(yData, x)
+    elif funcType == 'phase':
+        return phaseFunc_f(yData, x)
+    elif funcType == 'delay':
+        return delayFunc_f(yData, x)
+
+def sweepNoise_f(result, x, funcType, sources):
+    """
+    Returns the detector-referred or the source-referred noise spectrum, or
+    the contributions of noise sources to it, of a non-stepped noise result
+    for **plotSweep()**.
+
+    If ini.numericSweep == True, or if no symbolic spectra have been calculated
+    (ini.numericNoise == True), the spectra of numeric results are calculated
+    with **SLiCAPnumeric.numNoise()**. Else the symbolic spectra will be
+    evaluated.
+
+    :param result: Results of the execution of an instruction with data type
+                   'noise'.
+    :type result: SLiCAPprotos.allResults
+
+    :param x: Numpy array with frequency values in Hz
+    :type x: numpy.array
+
+    :param funcType: 'onoise' or 'inoise'
+    :type funcType: str
+
+    :param sources: List with IDs of noise sources of which the contributions
+                    are to be returned, or None for the total noise spectrum.
+    :type sources: list, NoneType
+
+    :return: Dictionary with key-value pairs:
+
+             - key: ID of the noise source, or None for the total spectrum
+             - value: Spectral density at the frequencies x (*numpy.array*)
+    :rtype: dict
+    """
+    noiseData = {}
+    if sources == None:
+        keys = [None]
+    else:
+        keys = sources
+    if result.numeric and (ini.numericSweep or type(result.onoise) == type(None)):
+        noise = numNoise(result, x)
+        if type(noise) != type(None):
+            (onoise, inoise, onoiseTerms, inoiseTerms) = noise
+            if funcType == 'onoise':
+                noiseTerms = onoiseTerms
+                noiseTerms[None] = onoise
+            else:
+                noiseTerms = inoiseTerms
+                noiseTerms[None] = inoise
+            for key in keys:
+                if type(noiseTerms.get(key)) == type(None):
+                    noiseData[key] = np.full(len(x), np.nan)
+                else:
+                    noiseData[key] = noiseTerms[key]
+            return noiseData
+    for key in keys:
+        if key == None:
+            if funcType == 'onoise':
+                yData = result.onoise
+            elif funcType == 'inoise':
+                yData = result.inoise
+        elif funcType == 'onoise':
+            yData = result.onoiseTerms.get(key)
+        elif funcType == 'inoise':
+            yData = result.inoiseTerms.get(key)
+        if type(yData) == type(None) or yData == []:
+            print("Error: cannot evaluate the noise spectrum.")
+            noiseData[key] = np.full(len(x), np.nan)
+        elif ini.frequency in list(sp.sympify(yData).atoms(sp.Symbol)):
+            func = sp.lambdify(ini.frequency, yData)
+            noiseData[key] = func(x)
+        else:
+            noiseData[key] = [yData for i in range(len(x))]
+    return noiseData
+
 def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVar = 'auto', sweepScale = '', xVar = 'auto', xScale = '', xUnits = '', xLim = [], yLim = [], axisType = 'auto', funcType = 'auto', yVar = 'auto', yScale = '', yUnits = '', noiseSources = None, show = False, flipX = False, flipY = False):
     """
     Plots a function by sweeping one variable and optionally stepping another.
@@ -498,10 +612,10 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
     :return: fig
     :rtype: SLiCAPplots.figure
     """
-    plotDataTypes = ['laplace', 'numer', 'denom', 'noise', 'step', 'impulse', 'time', 'params', None]
+    plotDataTypes = ['laplace', 'numer', 'denom', 'noise', 'step', 'impulse', 'time', 'params', 'matrix', None]
     funcTypes  = ['mag', 'dBmag', 'phase', 'delay', 'time', 'onoise', 'inoise', 'param']
     axisTypes  = ['lin', 'log', 'semilogx', 'semilogy', 'polar']
-    freqTypes  = ['laplace', 'numer', 'denom', 'noise']
+    freqTypes  = ['laplace', 'numer', 'denom', 'noise', 'matrix']
     timeTypes  = ['time', 'impulse', 'step']
     fig = figure(fileName)
     fig.show = show
@@ -535,6 +649,9 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
     elif funcType not in funcTypes:
         print("Error: unknown funcType: '{0}'.".format(funcType))
         return fig
+    if result.dataType == 'matrix' and (not result.numeric or funcType not in ['mag', 'dBmag', 'phase', 'delay']):
+        print("Error: dataType 'matrix' can only be plotted with 'plotSweep()' for simType 'numeric' and funcType 'mag', 'dBmag', 'phase' or 'delay'.")
+        return fig
     if axisType == 'auto':
         if funcType == 'param':
             axisType = 'lin'
@@ -664,6 +781,9 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
                 elif result.dataType == 'laplace':
                     yData = result.laplace
                     yLabel = ''
+                elif result.dataType == 'matrix':
+                    yData = None
+                    yLabel = ''
                 elif result.dataType == 'time':
                     yData = result.time
                     yLabel = '$' + sp.latex(sp.Symbol(result.detLabel)) + '$'
@@ -675,31 +795,33 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
                     yLabel = '$' + sp.latex(sp.Symbol(result.detLabel)) + '$'
                 if funcType == 'mag':
                     if ax.polar:
-                        radius = magFunc_f(yData, x)
-                        angle = phaseFunc_f(yData, x)
+                        radius = sweepFunc_f(result, yData, x, 'mag')
+                        angle = sweepFunc_f(result, yData, x, 'phase')
                         if ini.Hz:
                             angle = angle/180*np.pi
                         newTrace = trace([angle, radius])
                     else:
-                        newTrace = trace([x, magFunc_f(yData, x)])
+                        newTrace = trace([x, sweepFunc_f(result, yData, x, 'mag')])
                 elif funcType == 'dBmag':
                     if ax.polar:
-                        radius = dBmagFunc_f(yData, x)
-                        angle = phaseFunc_f(yData, x)
+                        radius = sweepFunc_f(result, yData, x, 'dBmag')
+                        angle = sweepFunc_f(result, yData, x, 'phase')
                         if ini.Hz:
                             angle = angle/180*np.pi
                         newTrace = trace([angle, radius])
                     else:
-                        newTrace = trace([x, dBmagFunc_f(yData, x)])
+                        newTrace = trace([x, sweepFunc_f(result, yData, x, 'dBmag')])
                 elif funcType == 'phase':
                     if not ax.polar:
-                        newTrace = trace([x, phaseFunc_f(yData, x)])
+                        newTrace = trace([x, sweepFunc_f(result, yData, x, 'phase')])
                 elif funcType == 'delay':
                     if not ax.polar:
-                        newTrace = trace([x, delayFunc_f(yData, x)])
+                        newTrace = trace([x, sweepFunc_f(result, yData, x, 'delay')])
                 elif funcType == 'time':
                     if not ax.polar:
-                        if sp.Symbol('t') in list(yData.atoms(sp.Symbol)):
+                        if type(result.timeFunc) != type(None):
+                            y = result.timeFunc.evaluate(x)[0]
+                        elif sp.Symbol('t') in list(yData.atoms(sp.Symbol)):
                             func = sp.lambdify(sp.Symbol('t'), yData)
                             y = np.real(func(x))
                         else:
@@ -724,80 +846,40 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
                     except:
                         pass
                 else:
-                    keys = list(result.onoiseTerms.keys())
+                    keys = list(result.snoiseTerms.keys())
                     if noiseSources == None:
-                        if funcType == 'onoise':
-                            yData = result.onoise
-                        elif funcType == 'inoise':
-                            yData = result.inoise
-                        func = sp.lambdify(ini.frequency, yData)
-                        # y = [func(x[j]) for j in range(len(x))]
-                        if ini.frequency in list(yData.atoms(sp.Symbol)):
-                            y = func(x)
-                        else:
-                            y = [yData for i in range(len(x))]
-                        newTrace = trace([x, y])
+                        sources = None
+                    elif noiseSources == 'all':
+                        sources = keys
+                    elif type(noiseSources) == list:
+                        sources = [srcName for srcName in noiseSources if srcName in keys]
+                    elif noiseSources in keys:
+                        sources = [noiseSources]
+                    else:
+                        print("Error: cannot understand 'sources={0}'.".format(str(noiseSources)))
+                        return fig
+                    noiseData = sweepNoise_f(result, x, funcType, sources)
+                    if sources == None:
+                        newTrace = trace([x, noiseData[None]])
                         newTrace.label = funcType
                         ax.traces.append(newTrace)
-                    elif noiseSources == 'all':
-                        for srcName in keys:
-                            if funcType == 'onoise':
-                                yData = result.onoiseTerms[srcName]
-                            elif funcType == 'inoise':
-                                yData = result.inoiseTerms[srcName]
-                            func = sp.lambdify(ini.frequency, yData)
-                            # y = [func(x[j]) for j in range(len(x))]
-                            if ini.frequency in list(yData.atoms(sp.Symbol)):
-                                y = func(x)
-                            else:
-                                y = [yData for i in range(len(x))]
-                            noiseTrace = trace([x, y])
+                    else:
+                        for srcName in sources:
+                            noiseTrace = trace([x, noiseData[srcName]])
                             noiseTrace.color = ini.defaultColors[colNum % numColors]
                             noiseTrace.label = funcType + ': ' + srcName
                             ax.traces.append(noiseTrace)
                             colNum += 1
-                    elif noiseSources in keys:
-                        if funcType == 'onoise':
-                            yData = result.onoiseTerms[noiseSources]
-                        elif funcType == 'inoise':
-                            yData = result.inoiseTerms[noiseSources]
-                        func = sp.lambdify(ini.frequency, yData)
-                        # y = [func(x[j]) for j in range(len(x))]
-                        if ini.frequency in list(yData.atoms(sp.Symbol)):
-                            y = func(x)
-                        else:
-                            y = [yData for i in range(len(x))]
-                        noiseTrace = trace([x, y])
-                        noiseTrace.color = ini.defaultColors[colNum % numColors]
-                        noiseTrace.label = funcType + ': ' + noiseSources
-                        ax.traces.append(noiseTrace)
-                        colNum += 1
-                    elif type(noiseSources) == list:
-                        for srcName in noiseSources:
-                            if srcName in keys:
-                                if funcType == 'onoise':
-                                    yData = result.onoiseTerms[srcName]
-                                elif funcType == 'inoise':
-                                    yData = result.inoiseTerms[srcName]
-                                func = sp.lambdify(ini.frequency, yData)
-                                # y = [func(x[j]) for j in range(len(x))]
-                                if ini.frequency in list(yData.atoms(sp.Symbol)):
-                                    y = func(x)
-                                else:
-                                    y = [yData for i in range(len(x))]
-                                noiseTrace = trace([x, y])
-                                noiseTrace.color = ini.defaultColors[colNum % numColors]
-                                noiseTrace.label = funcType + ': ' + srcName
-                                ax.traces.append(noiseTrace)
-                                colNum += 1
-                    else:
-                        print("Error: cannot understand 'sources={0}'.".format(str(sources)))
-                        return fig
             else:
                 if result.stepMethod != 'array':
                     stepNum = len(result.stepList)
                 else:
                     stepNum = len(result.stepArray[0])
+                if funcType == 'time' and type(result.timeFunc) != type(None):
+                    # Numeric time functions of all runs
+                    timeData = result.timeFunc.evaluate(x)
+                else:
+                    timeData = None
                 for i in range(stepNum):
                     if result.dataType == 'numer':
                         yData = result.numer[i]
@@ -856,7 +938,9 @@ def plotSweep(fileName, title, results, sweepStart, sweepStop, sweepNum, sweepVa
                             newTrace = trace([x, delayFunc_f(yData, x)])
                     elif funcType == 'time':
                         if not ax.polar:
-                            if sp.Symbol('t') in list(yData.atoms(sp.Symbol)):
+                            if type(timeData) != type(None):
+                                y = timeData[i]
+                            elif sp.Symbol('t') in list(yData.atoms(sp.Symbol)):
                                 func = sp.lambdify(sp.Symbol('t'), yData)
                                 y = np.real(func(x))
                             else:
@@ -1040,30 +1124,31 @@ def plotPZ(fileName, title, results, xmin = None, xmax = None, ymin = None, ymax
                 else:
                     polesTrace.label += ', %s = %8.1e'%(result.stepVar, result.stepList[-1])
                 pzTraces.append(polesTrace)
-                # root locus
-                allPoles = np.array([])
-                for i in range(len(poles)):
-                    allPoles = np.concatenate((allPoles, poles[i]), axis = None)
+                # root locus: one continuous trace for each branch
+                branches = trackRoots(poles)
                 if ini.Hz == True:
-                    polesTrace = trace([np.real(allPoles)/2/np.pi/xScaleFactor, np.imag(allPoles)/2/np.pi/yScaleFactor])
-                else:
-                    polesTrace = trace([np.real(allPoles)/xScaleFactor, np.imag(allPoles)/yScaleFactor])
-                try:
-                    polesTrace.markerColor = ini.gainColors[result.gainType]
-                except:
-                    polesTrace.markerColor = ini.defaultColors[colNum % numColors]
-                polesTrace.color = ''
-                polesTrace.marker = '.'
-                polesTrace.lineWidth = '0'
-                polesTrace.markerSize = 2
-                polesTrace.markerFaceColor = polesTrace.markerColor
-                polesTrace.label = 'poles ' + result.gainType
-                if result.stepMethod == 'array':
-                    polesTrace.label += ', run: 1 ... %s'%(len(poles))
-                else:
-                    polesTrace.label += ', %s = %8.1e ... %8.1e'%(result.stepVar, result.stepList[0], result.stepList[-1])
-                pzTraces.append(polesTrace)
-        elif result.dataType == 'zeros' or result.dataType == 'pz':
+                    branches = branches/2/np.pi
+                for i in range(branches.shape[1]):
+                    polesTrace = trace([np.real(branches[:, i])/xScaleFactor, np.imag(branches[:, i])/yScaleFactor])
+                    try:
+                        polesTrace.markerColor = ini.gainColors[result.gainType]
+                    except:
+                        polesTrace.markerColor = ini.defaultColors[colNum % numColors]
+                    polesTrace.color = polesTrace.markerColor
+                    polesTrace.marker = '.'
+                    polesTrace.lineWidth = 1
+                    polesTrace.markerSize = 2
+                    polesTrace.markerFaceColor = polesTrace.markerColor
+                    if i == 0:
+                        polesTrace.label = 'poles ' + result.gainType
+                        if result.stepMethod == 'array':
+                            polesTrace.label += ', run: 1 ... %s'%(len(poles))
+                        else:
+                            polesTrace.label += ', %s = %8.1e ... %8.1e'%(result.stepVar, result.stepList[0], result.stepList[-1])
+                    else:
+                        polesTrace.label = ''
+                    pzTraces.append(polesTrace)
+        if result.step and (result.dataType == 'zeros' or result.dataType == 'pz'):
             zeros = result.zeros
             if len(zeros) != 0:
                 # start of zeros locus
@@ -1102,29 +1187,30 @@ def plotPZ(fileName, title, results, xmin = None, xmax = None, ymin = None, ymax
                 else:
                     zerosTrace.label += ', %s = %8.1e'%(result.stepVar, result.stepList[-1])
                 pzTraces.append(zerosTrace)
-                # zeros locus
-                allZeros = np.array([])
-                for i in range(len(zeros)):
-                    allZeros = np.concatenate((allZeros, result.zeros[i]), axis = None)
+                # zeros locus: one continuous trace for each branch
+                branches = trackRoots(zeros)
                 if ini.Hz == True:
-                    zerosTrace = trace([np.real(allZeros)/2/np.pi/xScaleFactor, np.imag(allZeros)/2/np.pi/yScaleFactor])
-                else:
-                    zerosTrace = trace([np.real(allZeros)/xScaleFactor, np.imag(allZeros)/yScaleFactor])
-                try:
-                    zerosTrace.markerColor = ini.gainColors[result.gainType]
-                except:
-                    zerosTrace.markerColor = ini.defaultColors[colNum % numColors]
-                zerosTrace.color = ''
-                zerosTrace.marker = '.'
-                zerosTrace.lineWidth = '0'
-                zerosTrace.markerSize = 2
-                zerosTrace.markerFaceColor = zerosTrace.markerColor
-                zerosTrace.label = 'zeros ' + result.gainType
-                if result.stepMethod == 'array':
-                    zerosTrace.label += ', run: 1 ... %s'%(len(zeros))
-                else:
-                    zerosTrace.label += ', %s = %8.1e ... %8.1e'%(result.stepVar, result.stepList[0], result.stepList[-1])
-                pzTraces.append(zerosTrace)
+                    branches = branches/2/np.pi
+                for i in range(branches.shape[1]):
+                    zerosTrace = trace([np.real(branches[:, i])/xScaleFactor, np.imag(branches[:, i])/yScaleFactor])
+                    try:
+                        zerosTrace.markerColor = ini.gainColors[result.gainType]
+                    except:
+                        zerosTrace.markerColor = ini.defaultColors[colNum % numColors]
+                    zerosTrace.color = zerosTrace.markerColor
+                    zerosTrace.marker = '.'
+                    zerosTrace.lineWidth = 1
+                    zerosTrace.markerSize = 2
+                    zerosTrace.markerFaceColor = zerosTrace.markerColor
+                    if i == 0:
+                        zerosTrace.label = 'zeros ' + result.gainType
+                        if result.stepMethod == 'array':
+                            zerosTrace.label += ', run: 1 ... %s'%(len(zeros))
+                        else:
+                            zerosTrace.label += ', %s = %8.1e ... %8.1e'%(result.stepVar, result.stepList[0], result.stepList[-1])
+                    else:
+                        zerosTrace.label = ''
+                    pzTraces.append(zerosTrace)
         colNum += 1
     pz.traces = pzTraces
     fig.axes = [[pz]]
@@ -1361,6 +1447,41 @@ def traces2fig(traceDict, figObject, axis = [0, 0]):
         figObject.axes[axis[0]][axis[0]].traces.append(traceDict[label])
     return figObject
 
+def transient2traces(result, t, inputs, label = None):
+    """
+    Generates a dictionary with a trace (key = label, value = trace object) of
+    the response of the detector of a numeric instruction to input waveforms,
+    calculated with **SLiCAPnumeric.numTransient()**.
+
+    :param result: Results of the execution of an instruction with simType
+                   'numeric'.
+    :type result: SLiCAPprotos.allResults
+
+    :param t: Time grid in ascending order.
+    :type t: list, numpy.ndarray
+
+    :param inputs: Input waveforms, see **SLiCAPnumeric.numTransient()**.
+    :type inputs: dict, function, list, numpy.ndarray, int, float
+
+    :param label: Label of the trace, defaults to the detector label.
+    :type label: str, NoneType
+
+    :return: Dictionary with key-value pairs:
+
+             - key: *str*: label of the trace
+             - value: *SLiCAPplots.trace* trace object
+
+    :rtype: dict
+    """
+    y = numTransient(result, t, inputs)
+    if type(y) == type(None):
+        return {}
+    if label == None:
+        label = result.detLabel
+    newTrace = trace([np.array(t, dtype = float), y])
+    newTrace.label = label
+    return {label: newTrace}
+
 def LTspiceData2Traces(txtFile):
     """
     Generates a dictionary with traces (key = label, value = trace object) from
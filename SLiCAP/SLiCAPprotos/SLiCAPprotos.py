@@ -103,6 +103,17 @@ class circuit(object):
         - value: Associated circuit object (*SLiCAPprotos.circuit*).
         """
 
+        self.instances  = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: Reference designator (*str*) of an expanded sub circuit or
+          model instance.
+        - value: (*tuple*) with the list with the names (*str*) of the nodes
+          to which the instance is connected and the list with the reference
+          designators (*str*) of the elements of the instance.
+        """
+
         self.errors     = 0
         """
         Number (*int*) of errors found during checking of the circuit.
@@ -115,6 +126,13 @@ class circuit(object):
         starting with ',lib' or '.inc'.
         """
 
+        self.libHashes  = {}
+        """
+        (*dict*) with the content hashes (*str*) of the library files in
+        self.libs at the moment the circuit has been stored in the circuit
+        cache; keys are the names (*str*) of the library files.
+        """
+
         self.indepVars  = []
         """
         (*list*) with reference designators (*str*) of independent variables:
@@ -161,6 +179,22 @@ class circuit(object):
           reference node '0'.
         """
 
+        self.resolver   = parResolver()
+        """
+        Parameter resolver (*SLiCAPmath.parResolver*) for substitution of
+        the parameter definitions.
+        """
+
+        self.mnaTemplates = {}
+        """
+        (*dict*) with key-value pairs:
+
+        - key: (*tuple*) with simulation type, gain type, loop gain reference
+          and dependent variables.
+        - value: MNA template (*SLiCAPmatrices.mnaTemplate*) created by
+          **SLiCAPmatrices.makeMatrices()**.
+        """
+
     def delPar(self, parName):
         """
         Deletes a parameter definition and updates the list
@@ -286,6 +320,7 @@ class circuit(object):
         >>> my_instr.symType = 'numeric'
         >>> my_instr.getParValues(['R', 'C'])
         """
+        self.resolver.update(self.parDefs)
         if type(parNames) == list:
             parValues = {}
             for par in parNames:
@@ -293,14 +328,14 @@ class circuit(object):
                 for key in list(self.parDefs.keys()):
                     if par == key:
                         if numeric == True:
-                            parValues[par] = fullSubs(self.parDefs[key], self.parDefs)
+                            parValues[par] = self.resolver.subs(self.parDefs[key])
                         else:
                            parValues[par] = self.parDefs[key]
             return parValues
         parNames = sp.Symbol(str(parNames))
         try:
             if numeric:
-                parValue = sp.N(fullSubs(self.parDefs[parNames], self.parDefs))
+                parValue = sp.N(self.resolver.subs(self.parDefs[parNames]))
             else:
                 parValue = self.parDefs[parNames]
         except:
@@ -383,6 +418,8 @@ class circuit(object):
         >>> print my_instr.getElementValue(['R1', 'C1'])
         {'C1': 5.0e-7/pi, 'R1': 1000.00000000000}
         """
+        if numeric:
+            self.resolver.update(self.parDefs)
         if type(elementID) == list:
             elementValues = {}
             for elID in elementID:
@@ -390,7 +427,7 @@ class circuit(object):
                     if param in list(self.elements[elID].params.keys()):
                         value = self.elements[elID].params[param]
                         if numeric:
-                            value = fullSubs(value, self.parDefs)
+                            value = self.resolver.subs(value)
                         elementValues[elID] = value
                     else:
                         print("Error: Parameter '{0}' undefined for element '{1}'.".format(param, elID))
@@ -402,7 +439,7 @@ class circuit(object):
                 if param in list(self.elements[elementID].params.keys()):
                     value = self.elements[elementID].params[param]
                     if numeric:
-                        value = fullSubs(value, self.parDefs)
+                        value = self.resolver.subs(value)
                     elementValues = value
                 else:
                     print("Error: Parameter '{0}' undefined for element '{1}'.".format(param, elementID))
@@ -926,6 +963,23 @@ class allResults(object):
         DC solution at the detector.
         """
 
+        self.dcSens      = {}
+        """
+        Dict with (lists with) derivatives of the DC value of the detector
+        quantity or of the transfer with respect to the circuit parameters.
+        """
+
+        self.poleSens    = {}
+        """
+        Dict with (lists with) derivatives of the dominant pole with respect
+        to the circuit parameters.
+        """
+
+        self.domPole     = []
+        """
+        Dominant pole(s) of the network.
+        """
+
         self.snoiseTerms = {}
         """
         Dict with lists with source noise spectra.
@@ -965,6 +1019,20 @@ class allResults(object):
         Vector with dependent variables.
         """
 
+        self.cofactors   = None
+        """
+        Determinant and cofactors of the MNA matrix
+        (*SLiCAPpythonMaxima.matrixCofactors*). These are calculated once and
+        reused during the execution of the instruction.
+        """
+
+        self.pruneError  = 0
+        """
+        Largest relative error of the coefficients of the Laplace variable of
+        the determinants and numerators that have been pruned with
+        ini.pruneTolerance > 0.
+        """
+
         self.denom       = []
         """
         Laplace poly of denominator.
@@ -1000,6 +1068,13 @@ class allResults(object):
         Unit step responses.
         """
 
+        self.timeFunc    = None
+        """
+        Numeric inverse Laplace transforms (*SLiCAPnumeric.iltFunction*) of
+        the step, impulse or time responses of all runs of a numeric
+        instruction, None if these are calculated with Maxima CAS.
+        """
+
         self.params      = {}
         """
         Results of parameter sweep (dataType = 'param').
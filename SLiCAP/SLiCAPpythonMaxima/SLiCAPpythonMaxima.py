@@ -5,7 +5,7 @@ SLiCAP module with symbolic math functions executed by maxima CAS.
 
 Imported by the module **SLiCAPplots.py**.
 """
-from SLiCAP.SLiCAPmatrices import *
+from SLiCAP.SLiCAPnumeric import *
 
 def sympy2maximaMatrix(M):
     """
@@ -19,16 +19,468 @@ def sympy2maximaMatrix(M):
     """
     return(str(M).replace('Matrix([','matrix(').replace(']])','])'))
 
+def _readMaximaOutput(pipe, lines):
+    """
+    Reads the output of a Maxima session line by line and puts it in the
+    queue 'lines'. A None value is put in the queue if the output pipe is
+    closed.
+    """
+    for line in iter(pipe.readline, ''):
+        lines.put(line)
+    lines.put(None)
+
+class maximaSession(object):
+    """
+    Persistent Maxima CAS process that evaluates expressions over pipes.
+
+    Each request is sent to the interactive Maxima session, followed by a LISP
+    command that prints the string representation of the variable 'result'
+    between two unique markers. The session is started at its first use and
+    restarted automatically after a time out or a crash.
+    """
+    def __init__(self):
+        self.process  = None
+        """
+        Maxima process (*subprocess.Popen*).
+        """
+        self.command  = None
+        """
+        Command (*str*) used for starting the Maxima process.
+        """
+        self.output   = None
+        """
+        Queue (*queue.Queue*) with output lines of the Maxima process.
+        """
+        self.requests = 0
+        """
+        Number (*int*) of requests sent to the Maxima process.
+        """
+
+    def alive(self):
+        """
+        Returns True if the Maxima process is running with the command
+        given by ini.maxima.
+
+        :return: True if the process is alive.
+        :rtype: bool
+        """
+        return self.process != None and self.process.poll() == None and self.command == ini.maxima
+
+    def start(self):
+        """
+        Starts a new Maxima process.
+
+        :return: True if the process could be started.
+        :rtype: bool
+        """
+        self.stop()
+        try:
+            self.process = subprocess.Popen([ini.maxima, '--very-quiet'],
+                                            stdin=subprocess.PIPE,
+                                            stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT,
+                                            text=True, bufsize=1)
+        except:
+            self.process = None
+            return False
+        self.command = ini.maxima
+        self.output = queue.Queue()
+        reader = threading.Thread(target=_readMaximaOutput,
+                                  args=(self.process.stdout, self.output),
+                                  daemon=True)
+        reader.start()
+        return True
+
+    def stop(self):
+        """
+        Stops the Maxima process.
+        """
+        if self.process != None:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=1)
+            except:
+                pass
+        self.process = None
+
+    def evaluate(self, maxInput, timeOut):
+        """
+        Evaluates 'maxInput' and returns the output lines of the evaluation.
+
+        If the Maxima process stops during the evaluation, or if the request
+        cannot be sent, it will be restarted and the evaluation will be
+        repeated once.
+
+        :param maxInput: Maxima input, the variable that needs to be output
+                         must be named: 'result'.
+        :type maxInput: str
+
+        :param timeOut: Maximum evaluation time in seconds.
+        :type timeOut: int, float
+
+        :return: List with output lines, or None if no Maxima process could
+                 be started or if the evaluation failed twice.
+        :rtype: list, NoneType
+
+        :raises subprocess.TimeoutExpired: if the evaluation took more time
+                                           than 'timeOut'; the Maxima process
+                                           will be restarted.
+        """
+        for attempt in range(2):
+            if not self.alive() and not self.start():
+                return None
+            self.requests += 1
+            marker = '<<SLiCAP:%s:%s>>'%(self.process.pid, self.requests)
+            # Remove output of earlier requests
+            while not self.output.empty():
+                self.output.get()
+            request = 'kill(all)$display2d:false$\n' + maxInput + '\n'
+            request += ':lisp (progn (format t "~%%~a~%%~a~%%~a~%%" "%s" (mfuncall \'$string $result) "%s/") (finish-output))\n'%(marker, marker)
+            try:
+                self.process.stdin.write(request)
+                self.process.stdin.flush()
+            except:
+                self.stop()
+                continue
+            lines = []
+            started = False
+            endTime = time() + timeOut
+            while True:
+                try:
+                    line = self.output.get(timeout=max(endTime - time(), 0))
+                except queue.Empty:
+                    self.stop()
+                    raise subprocess.TimeoutExpired(ini.maxima, timeOut)
+                if line == None:
+                    # Maxima process stopped
+                    self.stop()
+                    break
+                line = line.strip()
+                if line == marker:
+                    started = True
+                    lines = []
+                elif line == marker + '/':
+                    return lines
+                elif started or line:
+                    lines.append(line)
+        # Incomplete output is never returned
+        return None
+
+class maximaPool(object):
+    """
+    Pool with persistent Maxima sessions. The number of sessions is given by
+    ini.MaximaSessions.
+    """
+    def __init__(self):
+        self.sessions = []
+        """
+        List with all sessions (*maximaSession*) of the pool.
+        """
+        self.idle     = queue.Queue()
+        """
+        Queue (*queue.Queue*) with sessions that are available for requests.
+        """
+        self.pid      = os.getpid()
+        """
+        Process ID (*int*) of the process that owns the sessions.
+        """
+        self.lock     = threading.Lock()
+
+    def resize(self):
+        """
+        Adapts the number of sessions to ini.MaximaSessions.
+        """
+        with self.lock:
+            if self.pid != os.getpid():
+                # Sessions of a parent process cannot be shared
+                self.sessions = []
+                self.idle     = queue.Queue()
+                self.pid      = os.getpid()
+            while len(self.sessions) < ini.MaximaSessions:
+                session = maximaSession()
+                self.sessions.append(session)
+                self.idle.put(session)
+
+    def evaluate(self, maxInput, timeOut):
+        """
+        Evaluates 'maxInput' with the first available session.
+
+        :param maxInput: Maxima input, the variable that needs to be output
+                         must be named: 'result'.
+        :type maxInput: str
+
+        :param timeOut: Maximum evaluation time in seconds.
+        :type timeOut: int, float
+
+        :return: List with output lines, or None if no Maxima session could
+                 be started or if the evaluation failed.
+        :rtype: list, NoneType
+        """
+        self.resize()
+        session = self.idle.get()
+        if session not in self.sessions[0: ini.MaximaSessions]:
+            # The number of sessions has been reduced
+            with self.lock:
+                if session in self.sessions:
+                    self.sessions.remove(session)
+            session.stop()
+            return self.evaluate(maxInput, timeOut)
+        try:
+            return session.evaluate(maxInput, timeOut)
+        finally:
+            self.idle.put(session)
+
+    def close(self):
+        """
+        Stops all sessions of the pool.
+        """
+        if self.pid == os.getpid():
+            for session in self.sessions:
+                session.stop()
+        self.sessions = []
+        self.idle     = queue.Queue()
+
+MAXIMAPOOL = maximaPool()
+atexit.register(MAXIMAPOOL.close)
+
+def stopMaximaSessions():
+    """
+    Stops all persistent Maxima sessions. New sessions will be started at the
+    next call of **maxEval()**.
+    """
+    MAXIMAPOOL.close()
+
+MAXIMAVERSIONS = {}
+
+def maximaVersion():
+    """
+    Returns the version string of the Maxima CAS started with ini.maxima.
+
+    :return: Maxima version, or an empty string if it could not be determined.
+    :rtype: str
+    """
+    if ini.maxima not in list(MAXIMAVERSIONS.keys()):
+        try:
+            version = subprocess.run([ini.maxima, '--version'], capture_output=True, timeout=ini.MaximaTimeOut, text=True).stdout.strip()
+        except:
+            version = ''
+        MAXIMAVERSIONS[ini.maxima] = version
+    return MAXIMAVERSIONS[ini.maxima]
+
+class maximaCache(object):
+    """
+    Disk cache with results of **maxEval()**.
+
+    Each result is stored in a file in the directory ini.cachePath + 'maxima/'.
+    The file name is a hash of the Maxima expression, the Maxima version and
+    ini.MaximaMatrixDim. If the size of the cache exceeds ini.MaximaCacheSize,
+    the least recently used results are removed.
+    """
+    def __init__(self):
+        self.path    = None
+        """
+        Directory (*str*) with the cached results.
+        """
+        self.entries = {}
+        """
+        Dictionary with key-value pairs:
+
+        - key: hash (*str*) of the Maxima input
+        - value: list with the file size (*int*) and the time (*float*) of the
+          last use of the result
+        """
+        self.size    = 0
+        """
+        Total size (*int*) of the cached results in bytes.
+        """
+        self.hits    = 0
+        """
+        Number (*int*) of results read from the cache.
+        """
+        self.misses  = 0
+        """
+        Number (*int*) of results not found in the cache.
+        """
+
+    def open(self):
+        """
+        Reads the index of the cache directory if ini.cachePath has changed.
+
+        :return: True if the cache directory is available.
+        :rtype: bool
+        """
+        if ini.cachePath == None:
+            return False
+        path = ini.cachePath + 'maxima/'
+        if path != self.path:
+            try:
+                if not os.path.exists(path):
+                    os.makedirs(path)
+            except:
+                print("Error: could not create the cache directory: '%s'."%(path))
+                return False
+            self.path    = path
+            self.entries = {}
+            self.size    = 0
+            for entry in os.scandir(path):
+                if entry.name.endswith('.txt'):
+                    stat = entry.stat()
+                    self.entries[entry.name[0:-4]] = [stat.st_size, stat.st_mtime]
+                    self.size += stat.st_size
+        return True
+
+    def key(self, maxExpr):
+        """
+        Returns the key for the Maxima expression 'maxExpr'.
+
+        :param maxExpr: Expression in Maxima format.
+        :type maxExpr: str
+
+        :return: Hash of maxExpr, the Maxima version and ini.MaximaMatrixDim.
+        :rtype: str
+        """
+        text = '\n'.join([maximaVersion(), str(ini.MaximaMatrixDim), maxExpr])
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, maxExpr):
+        """
+        Returns the cached result of 'maxExpr'.
+
+        :param maxExpr: Expression in Maxima format.
+        :type maxExpr: str
+
+        :return: Cached result or None if the result has not been cached.
+        :rtype: str, NoneType
+        """
+        if not self.open():
+            return None
+        key = self.key(maxExpr)
+        result = None
+        if key in list(self.entries.keys()):
+            try:
+                f = open(self.path + key + '.txt', 'r')
+                result = f.read()
+                f.close()
+                os.utime(self.path + key + '.txt')
+                self.entries[key][1] = time()
+            except:
+                self.remove(key)
+        if result == None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, maxExpr, result):
+        """
+        Stores the result of 'maxExpr' in the cache and removes the least
+        recently used results if the cache exceeds ini.MaximaCacheSize.
+
+        :param maxExpr: Expression in Maxima format.
+        :type maxExpr: str
+
+        :param result: Result returned by **maxEval()**.
+        :type result: str
+        """
+        if not self.open():
+            return
+        key = self.key(maxExpr)
+        fileName = self.path + key + '.txt'
+        try:
+            f = open(fileName + '.%s'%(os.getpid()), 'w')
+            f.write(result)
+            f.close()
+            os.replace(fileName + '.%s'%(os.getpid()), fileName)
+        except:
+            print("Error: could not write to the cache directory: '%s'."%(self.path))
+            return
+        if key in list(self.entries.keys()):
+            self.size -= self.entries[key][0]
+        self.entries[key] = [os.path.getsize(fileName), time()]
+        self.size += self.entries[key][0]
+        maxSize = ini.MaximaCacheSize * 1e6
+        if self.size > maxSize:
+            keys = sorted(list(self.entries.keys()), key=lambda k: self.entries[k][1])
+            for oldKey in keys:
+                if self.size <= maxSize or oldKey == key:
+                    break
+                self.remove(oldKey)
+
+    def remove(self, key):
+        """
+        Removes the result with key 'key' from the cache.
+
+        :param key: Key of the result.
+        :type key: str
+        """
+        if key in list(self.entries.keys()):
+            self.size -= self.entries[key][0]
+            del self.entries[key]
+        try:
+            os.remove(self.path + key + '.txt')
+        except:
+            pass
+
+    def clear(self):
+        """
+        Removes all results from the cache and resets the statistics.
+        """
+        if self.open():
+            for key in list(self.entries.keys()):
+                self.remove(key)
+        self.hits   = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        :return: Dictionary with the number of hits, misses, entries and the
+                 size of the cache in bytes.
+        :rtype: dict
+        """
+        self.open()
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self.entries), 'size': self.size}
+
+MAXIMACACHE = maximaCache()
+
+def clearMaximaCache():
+    """
+    Removes all results from the Maxima disk cache.
+    """
+    MAXIMACACHE.clear()
+
+def maximaCacheStats():
+    """
+    Returns the statistics of the Maxima disk cache.
+
+    :return: Dictionary with the number of hits, misses, entries and the
+             size of the cache in bytes.
+    :rtype: dict
+
+    :Example:
+
+    >>> maximaCacheStats()
+    {'hits': 12, 'misses': 4, 'entries': 4, 'size': 5120}
+    """
+    return MAXIMACACHE.stats()
+
 def maxEval(maxExpr):
     """
     Evaluates the expression 'maxExpr' with Maxima CAS and returns the result.
 
-    Starts a subprocess that evaluates maxExpr with Maxima CAS and returns the
-    resulting expression in text format. The variable that needs to be output
-    must be named: 'result'.
+    Sends maxExpr to a persistent Maxima session and returns the resulting
+    expression in text format. If ini.MaximaSessions equals zero, or the
+    session failed, maxEval starts a subprocess that evaluates maxExpr. The
+    variable that needs to be output must be named: 'result'.
+
+    If ini.MaximaCache is True, results that can be converted into a sympy
+    expression are stored in a disk cache and identical expressions are not
+    evaluated again.
 
     In some cases Maxima CAS will ask for extra input.
-    This will be ignored and a time out will kill the subprocess.
+    This will be ignored and a time out will kill the (sub)process.
 
     :param maxExpr: Expression in Maxima format to be evaluated.
     :type maxExpr: str
@@ -44,9 +496,17 @@ def maxEval(maxExpr):
     # LISP command for a  a single-line output in text format:
     maxStringConv = ":lisp (mfuncall '$string $result);"
     maxAssume = "assume_pos:true$assume_pos_pred:symbolp$"
-    maxInput = maxAssume + maxExpr + maxStringConv
-    # Read the output
-    result = subprocess.run([ini.maxima, '--very-quiet', '-batch-string', maxInput], capture_output=True, timeout=ini.MaximaTimeOut, text=True).stdout.split('\n')
+    if ini.MaximaCache:
+        result = MAXIMACACHE.get(maxExpr)
+        if result != None:
+            return result
+    result = None
+    if ini.MaximaSessions > 0:
+        result = MAXIMAPOOL.evaluate(maxAssume + maxExpr, ini.MaximaTimeOut)
+    if result == None:
+        maxInput = maxAssume + maxExpr + maxStringConv
+        # Read the output
+        result = subprocess.run([ini.maxima, '--very-quiet', '-batch-string', maxInput], capture_output=True, timeout=ini.MaximaTimeOut, text=True).stdout.split('\n')
     # Convert the result such that it can be 'sympified' by sympy
     result = [i for i in result if i] # Added due to variability of trailing '\n'
     if result != '' and len(result) > 0:
@@ -64,6 +524,13 @@ def maxEval(maxExpr):
         result = result.replace('])', ']])')
         # ToDo
         # Other conversions
+        if ini.MaximaCache and result != '':
+            # Error messages and incomplete output are not cached
+            try:
+                sp.sympify(result)
+                MAXIMACACHE.put(maxExpr, result)
+            except:
+                pass
     else:
         print("Error: maxima CAS could not evaluate:\n", maxExpr)
     return result
@@ -149,10 +616,18 @@ def maxDet(M, numeric = True):
     :param M: Matrix of which the determinant needs to be evaluated
     :type M: sympy.Matrix
 
+    If ini.detMethod is not 'maxima', the determinant is calculated with
+    **matrixDet()**.
+
     :param numeric: True will force Maxima to use (big) floats for numeric
                     values.
     :type numeric: bool
     """
+    if ini.detMethod != 'maxima':
+        result = matrixDet(M)
+        if numeric:
+            result = sp.N(result)
+        return result
     if numeric:
         numeric = 'bfloat'
     else:
@@ -179,7 +654,8 @@ def maxNumer(M, detP, detN, srcP, srcN, numeric = True):
     - cofactor(i,j) = (-1)^(i+j)*det(minor(i,j))
 
     The minor matrices and the multiplication factors are determined with Sympy,
-    the determinants are calculated with Maxima.
+    the determinants are calculated with Maxima, or with **matrixDet()** if
+    ini.detMethod is not 'maxima'.
 
     :Note: In Sympy a minor is defined as the determinant of the minor
            matrix. Use sympy.Matrix.minor_submatrix to get the matrix only.
@@ -221,6 +697,17 @@ def maxNumer(M, detP, detN, srcP, srcN, numeric = True):
     :return: Numerator of a transfer function
     :rtype: sympy.Expr
     """
+    if ini.detMethod != 'maxima':
+        result = 0
+        for (row, col, sign) in [(srcP, detP, 1), (srcN, detP, -1), (srcP, detN, -1), (srcN, detN, 1)]:
+            if row != None and col != None:
+                if (row + col)%2 != 0:
+                    sign = -sign
+                result += sign*matrixDet(M.minor_submatrix(row, col))
+        result = sp.expand(result)
+        if numeric:
+            result = sp.N(result)
+        return result
     # Create a list of matrices of which the determinant needt to be calculated
     if numeric:
         numeric = 'bfloat'
@@ -329,6 +816,16 @@ def maxCramerNumer(M, Iv, detP, detN, numeric = True):
     :return: Numerator of a response
     :rtype: sympy.Expr
     """
+    if ini.detMethod != 'maxima':
+        result = 0
+        if detP != None:
+            result += matrixDet(M.Cramer(Iv, detP))
+        if detN != None:
+            result -= matrixDet(M.Cramer(Iv, detN))
+        result = sp.expand(result)
+        if numeric:
+            result = sp.N(result)
+        return result
     if numeric:
         numeric = 'bfloat'
     else:
@@ -352,6 +849,493 @@ def maxCramerNumer(M, Iv, detP, detN, numeric = True):
     except:
         print('Maxima error:', result)
 
+PORTMODELS = {}
+"""
+Dictionary with port descriptions of sub circuit instances, see
+**portModel()**.
+"""
+
+def portModel(M, suffix, internal, ports):
+    """
+    Returns the port description of a sub circuit instance, obtained by
+    elimination of its internal variables from the matrix 'M'.
+
+    With A = M[internal, internal], B = M[internal, ports] and
+    C = M[ports, internal], the description consists of d = det(A) and the
+    matrix Q = C.adj(A).B, such that the Schur complement of A in M equals
+    M[ports, ports] - Q/d.
+
+    The description is stored in PORTMODELS with the instance suffix removed
+    from the names of the parameters, and reused for all instances with the
+    same matrices A, B and C, apart from this suffix.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :param suffix: Suffix of the names of local parameters of the instance.
+    :type suffix: str
+
+    :param internal: Row and column numbers of the internal variables.
+    :type internal: list
+
+    :param ports: Row and column numbers of the port variables.
+    :type ports: list
+
+    :return: Tuple with d (*sympy.Expr*) and Q (*sympy.Matrix*)
+    :rtype: tuple
+    """
+    A = M.extract(internal, internal)
+    B = M.extract(internal, ports)
+    C = M.extract(ports, internal)
+    names = {}
+    for symbol in A.free_symbols.union(B.free_symbols, C.free_symbols):
+        if symbol.name.endswith(suffix):
+            names[symbol] = sp.Symbol(symbol.name[0: -len(suffix)] + '#')
+    key = str((A.xreplace(names), B.xreplace(names), C.xreplace(names)))
+    if key not in PORTMODELS:
+        cofactors = matrixCofactors(A)
+        rows = [i for i in range(len(internal)) if any([B[i, q] != 0 for q in range(len(ports))])]
+        cols = [j for j in range(len(internal)) if any([C[p, j] != 0 for p in range(len(ports))])]
+        cofactors.request([(i, j) for i in rows for j in cols])
+        d = cofactors.det(numeric = False)
+        # adj(A)[j, i] = cofactor(i, j)
+        Q = sp.zeros(len(ports))
+        for p in range(len(ports)):
+            for q in range(len(ports)):
+                terms = [C[p, j]*cofactors.cofactor(i, j, numeric = False)*B[i, q] for i in rows for j in cols if B[i, q] != 0 and C[p, j] != 0]
+                Q[p, q] = sp.expand(sp.Add(*terms))
+        PORTMODELS[key] = (d.xreplace(names), Q.xreplace(names))
+    back = {names[symbol]: symbol for symbol in names}
+    (d, Q) = PORTMODELS[key]
+    return (d.xreplace(back), Q.xreplace(back))
+
+class matrixCofactors(object):
+    """
+    Determinant and cofactors of a square matrix.
+
+    All requested determinants of the matrix and its minor matrices are
+    calculated in one pass: with Maxima CAS in a single evaluation (or with
+    the Python minor expansion if Maxima fails), in Python with a single
+    memoized minor expansion, with one set of batched LU
+    decompositions if ini.detMethod == 'fft' (see **minorsFFT()**), by
+    sparse interpolation if ini.detMethod == 'zippel' (see
+    **minorsZippel()**), or from a single determinant decision diagram if
+    ini.detMethod == 'ddd' (see **DDD()**). The results are stored and reused
+    for subsequent requests.
+
+    If ini.schurReduction is True and sub circuit instances are given, their
+    internal variables are eliminated first: each instance is replaced with
+    its port description (see **portModel()**), and the determinant and the
+    cofactors of the rows and columns of the other variables are obtained
+    from the reduced matrix S with det(M) = prod(det(A_k))*det(S). The rows
+    of S are multiplied with the determinants of the instances connected to
+    them, which makes its entries polynomial; this factor is divided out of
+    the results. Minors with rows or columns of internal variables are
+    calculated from the full matrix.
+
+    If ini.pruneTolerance > 0 and nominal parameter values are given, terms
+    that are numerically insignificant at these values are removed from the
+    results of **det()**, **numer()** and **cramer()**, see **pruneTerms()**.
+    Numerators are pruned after combination of their cofactors. The largest
+    relative error of the pruned coefficients is stored in the attribute
+    'pruneError'.
+
+    :param M: Square matrix
+    :type M: sympy.Matrix
+
+    :param blocks: List with a (suffix, internal, ports) tuple for each sub
+                   circuit instance, see **portModel()**, or None.
+    :type blocks: list, NoneType
+
+    :param nominal: Dictionary with nominal numeric values of the parameters
+                    in the matrix, or None.
+    :type nominal: dict, NoneType
+
+    :Example:
+
+    >>> cof = matrixCofactors(M)
+    >>> cof.request([(0, 2), (1, 2)])
+    >>> denom = cof.det()       # Calculates det(M), C(0,2) and C(1,2)
+    >>> numer = cof.cofactor(0, 2) - cof.cofactor(1, 2)
+    """
+    def __init__(self, M, blocks = None, nominal = None):
+        self.M       = M
+        """
+        Square matrix (*sympy.Matrix*).
+        """
+        self.nominal = nominal
+        """
+        Dictionary with nominal numeric values of the parameters for pruning
+        of the results, or None.
+        """
+        self.pruneError = 0
+        """
+        Largest relative error (*float*) of the coefficients of the Laplace
+        variable of the pruned results at the nominal parameter values.
+        """
+        self.blocks  = blocks
+        """
+        List with (suffix, internal, ports) (*tuple*) of sub circuit
+        instances, or None.
+        """
+        self.reduced = None
+        """
+        **matrixCofactors()** object of the reduced matrix, False if the
+        matrix cannot be reduced, or None if the reduction has not yet been
+        attempted.
+        """
+        self.retained = []
+        """
+        Row and column numbers of the matrix that are retained in the reduced
+        matrix.
+        """
+        self.scales  = []
+        """
+        Multiplication factors (*sympy.Expr*) of the rows of the reduced
+        matrix.
+        """
+        self.divisor = 1
+        """
+        Factor (*sympy.Expr*) to be divided out of the determinants of the
+        reduced matrix.
+        """
+        self.dets    = {}
+        """
+        Dictionary with calculated determinants:
+
+        - key: (row, col, numeric) (*tuple*); row and col are the numbers of
+          the deleted row and column of the minor matrix, or None for the
+          determinant of the matrix itself.
+        - value: determinant (*sympy.Expr*)
+        """
+        self.pending = []
+        """
+        List with (row, col) (*tuple*) of requested minors.
+        """
+        self.entries = None
+        self.memo    = None
+        self.ddd     = None
+        """
+        Determinant decision diagram (*DDD*) of the matrix, created at the
+        first evaluation if ini.detMethod == 'ddd'.
+        """
+
+    def request(self, minors):
+        """
+        Adds minors to the list of minors that will be calculated at the next
+        evaluation.
+
+        :param minors: List with (row, col) tuples of minors, (None, None)
+                       for the determinant of the matrix.
+        :type minors: list
+        """
+        for minor in minors:
+            if minor not in self.pending:
+                self.pending.append(minor)
+
+    def evaluate(self, numeric = True):
+        """
+        Calculates all pending minors and the determinant of the matrix.
+
+        :param numeric: True will force Maxima to use (big) floats for numeric
+                        values.
+        :type numeric: bool
+        """
+        self.request([(None, None)])
+        minors = [minor for minor in self.pending if (minor[0], minor[1], numeric) not in self.dets]
+        self.pending = []
+        self.calculate(minors, numeric)
+
+    def prune(self, expr):
+        """
+        Removes numerically insignificant terms from a determinant or a
+        numerator if ini.pruneTolerance > 0 and nominal parameter values are
+        given, and updates self.pruneError.
+
+        :param expr: Determinant or numerator
+        :type expr: sympy.Expr
+
+        :return: Pruned expression
+        :rtype: sympy.Expr
+        """
+        if self.nominal == None or ini.pruneTolerance <= 0:
+            return expr
+        (expr, error) = pruneTerms(expr, self.nominal, ini.pruneTolerance)
+        self.pruneError = max(self.pruneError, error)
+        return expr
+
+    def calculate(self, minors, numeric = True):
+        """
+        Calculates minors of the matrix.
+
+        :param minors: List with (row, col) tuples of minors, (None, None)
+                       for the determinant of the matrix.
+        :type minors: list
+
+        :param numeric: True will force Maxima to use (big) floats for numeric
+                        values.
+        :type numeric: bool
+        """
+        if self.blocks != None and ini.schurReduction and ini.detMethod != 'fft' and self.reduce():
+            reducible = [minor for minor in minors if minor[0] == None or (minor[0] in self.retained and minor[1] in self.retained)]
+            self.evaluateReduced(reducible, numeric)
+            minors = [minor for minor in minors if minor not in reducible]
+        if len(minors) == 0:
+            return
+        dim = self.M.shape[0]
+        results = None
+        if ini.detMethod == 'maxima':
+            if numeric:
+                bfloat = 'bfloat'
+            else:
+                bfloat = ''
+            if dim <= ini.MaximaMatrixDim:
+                maxExpr = 'm:' + sympy2maximaMatrix(self.M) + ';'
+                func = 'newdet'
+            else:
+                maxExpr = detFunc() + 'm:' + sympy2maximaMatrix(self.M) + ';'
+                func = 'det'
+            items = []
+            for (row, col) in minors:
+                if row == None:
+                    items.append('%s(expand(%s(m)))'%(bfloat, func))
+                elif dim == 1:
+                    items.append('1')
+                else:
+                    items.append('%s(expand(%s(minor(m,%s,%s))))'%(bfloat, func, row + 1, col + 1))
+            maxExpr += 'result:[' + ','.join(items) + '];'
+            result = maxEval(maxExpr)
+            try:
+                values = sp.sympify(result)
+                results = {minors[i]: values[i] for i in range(len(minors))}
+            except:
+                print('Maxima error:', result)
+                print("Error: Maxima could not calculate the determinants, using 'minors'.")
+        elif ini.detMethod == 'ddd':
+            if self.ddd == None:
+                self.ddd = DDD(self.M)
+            results = {minor: self.ddd.expr(minor[0], minor[1]) for minor in minors}
+        elif ini.detMethod == 'fft':
+            results = minorsFFT(self.M, minors)
+        elif ini.detMethod == 'zippel':
+            results = minorsZippel(self.M, minors)
+        if results != None:
+            for minor in minors:
+                result = results[minor]
+                if numeric:
+                    result = sp.N(result)
+                self.dets[(minor[0], minor[1], numeric)] = result
+            return
+        # Matrices that are not suited for ini.detMethod == 'fft' or
+        # 'zippel', and matrices of which Maxima failed to calculate the
+        # determinants are expanded by minors
+        useMinors = ini.detMethod != 'bareiss'
+        if useMinors and self.memo == None:
+            self.entries, poly = detEntries(self.M)
+            if poly:
+                self.memo = {'one': sp.Poly(1, ini.Laplace)}
+            else:
+                self.memo = {'one': sp.Integer(1)}
+        for (row, col) in minors:
+            if useMinors:
+                rows = tuple([i for i in range(dim) if i != row])
+                cols = tuple([i for i in range(dim) if i != col])
+                result = minorDet(self.entries, rows, cols, self.memo)
+                if isinstance(result, sp.Poly):
+                    result = result.as_expr()
+            elif row == None:
+                result = matrixDet(self.M)
+            else:
+                result = matrixDet(self.M.minor_submatrix(row, col))
+            if numeric:
+                result = sp.N(result)
+            self.dets[(row, col, numeric)] = result
+
+    def reduce(self):
+        """
+        Creates the reduced matrix by elimination of the internal variables
+        of the sub circuit instances in self.blocks.
+
+        Instances of which the internal variables are coupled to other
+        variables than their ports, or to variables of other instances, and
+        instances with a zero determinant are not eliminated.
+
+        :return: True if the matrix has been reduced.
+        :rtype: bool
+        """
+        if self.reduced != None:
+            return self.reduced != False
+        self.reduced = False
+        M = self.M.xreplace({number: sp.Rational(str(number)) for number in self.M.atoms(sp.Float)})
+        dim = M.shape[0]
+        taken = set()
+        portVars = set()
+        models = []
+        for (suffix, internal, ports) in self.blocks:
+            inside = set(internal)
+            if len(inside) == 0 or len(inside.intersection(taken.union(portVars))) != 0 or len(taken.intersection(ports)) != 0:
+                continue
+            coupled = set([j for i in internal for j in range(dim) if j not in inside and (M[i, j] != 0 or M[j, i] != 0)])
+            if not coupled.issubset(set(ports)):
+                continue
+            (d, Q) = portModel(M, suffix, internal, ports)
+            if d == 0:
+                continue
+            taken = taken.union(inside)
+            portVars = portVars.union(ports)
+            models.append((ports, d, Q))
+        if len(models) == 0:
+            return False
+        self.retained = [i for i in range(dim) if i not in taken]
+        position = {self.retained[i]: i for i in range(len(self.retained))}
+        factors = [[] for i in self.retained]
+        for k in range(len(models)):
+            for p in models[k][0]:
+                factors[position[p]].append(k)
+        self.scales = [sp.Mul(*[models[k][1] for k in factor]) for factor in factors]
+        self.divisor = sp.Mul(*[d**(len(ports) - 1) for (ports, d, Q) in models])
+        S = sp.zeros(len(self.retained))
+        for a in range(len(self.retained)):
+            for b in range(len(self.retained)):
+                entry = self.scales[a]*M[self.retained[a], self.retained[b]]
+                for k in factors[a]:
+                    (ports, d, Q) = models[k]
+                    if self.retained[b] in ports:
+                        others = sp.Mul(*[models[l][1] for l in factors[a] if l != k])
+                        entry -= others*Q[ports.index(self.retained[a]), ports.index(self.retained[b])]
+                S[a, b] = sp.expand(entry)
+        self.reduced = matrixCofactors(S)
+        return True
+
+    def evaluateReduced(self, minors, numeric = True):
+        """
+        Calculates the minors of the matrix with rows and columns that are
+        retained in the reduced matrix from the minors of the reduced matrix.
+
+        :param minors: List with (row, col) tuples of minors, (None, None)
+                       for the determinant of the matrix.
+        :type minors: list
+
+        :param numeric: True will convert the results into floats.
+        :type numeric: bool
+        """
+        position = {self.retained[i]: i for i in range(len(self.retained))}
+        mapped = []
+        for (row, col) in minors:
+            if row == None:
+                mapped.append((None, None))
+            else:
+                mapped.append((position[row], position[col]))
+        self.reduced.request(mapped)
+        self.reduced.evaluate(numeric = False)
+        for i in range(len(minors)):
+            (row, col) = mapped[i]
+            result = self.reduced.dets[(row, col, False)]
+            if row != None:
+                # Row 'row' of the reduced matrix has been deleted, and its
+                # multiplication factor with it
+                result = (-1)**(minors[i][0] - row + minors[i][1] - col)*self.scales[row]*result
+            result = exactQuotient(result, self.divisor)
+            if numeric:
+                result = sp.N(result)
+            self.dets[(minors[i][0], minors[i][1], numeric)] = result
+
+    def det(self, numeric = True):
+        """
+        Returns the determinant of the matrix.
+
+        :param numeric: True will force Maxima to use (big) floats for numeric
+                        values.
+        :type numeric: bool
+
+        :return: Determinant of the matrix.
+        :rtype: sympy.Expr
+        """
+        self.evaluate(numeric)
+        return self.prune(self.dets[(None, None, numeric)])
+
+    def cofactor(self, row, col, numeric = True):
+        """
+        Returns the cofactor C(row, col) = (-1)^(row+col)*det(minor(row, col)).
+
+        :param row: Number of the row of the minor.
+        :type row: int
+
+        :param col: Number of the column of the minor.
+        :type col: int
+
+        :param numeric: True will force Maxima to use (big) floats for numeric
+                        values.
+        :type numeric: bool
+
+        :return: Cofactor C(row, col)
+        :rtype: sympy.Expr
+        """
+        self.request([(row, col)])
+        self.evaluate(numeric)
+        result = self.dets[(row, col, numeric)]
+        if (row + col)%2 != 0:
+            result = -result
+        return result
+
+    def requestNumer(self, detP, detN, srcP, srcN):
+        """
+        Adds the minors required for the numerator of a transfer function to
+        the list of minors that will be calculated at the next evaluation.
+
+        See **maxNumer()** for the description of the arguments.
+
+        :return: List with (row, col, sign) tuples of the cofactors of the
+                 numerator.
+        :rtype: list
+        """
+        terms = [(srcP, detP, 1), (srcN, detP, -1), (srcP, detN, -1), (srcN, detN, 1)]
+        terms = [term for term in terms if term[0] != None and term[1] != None]
+        self.request([(row, col) for (row, col, sign) in terms])
+        return terms
+
+    def numer(self, detP, detN, srcP, srcN, numeric = True):
+        """
+        Returns the numerator of a transfer function:
+
+        numer = + cofactor(srcP, detP) - cofactor(srcN, detP) - cofactor(srcP, detN) + cofactor(srcN, detN)
+
+        See **maxNumer()** for the description of the arguments.
+
+        :return: Numerator of a transfer function
+        :rtype: sympy.Expr
+        """
+        terms = self.requestNumer(detP, detN, srcP, srcN)
+        result = 0
+        for (row, col, sign) in terms:
+            result += sign*self.cofactor(row, col, numeric)
+        return self.prune(sp.expand(result))
+
+    def cramer(self, Iv, detP, detN, numeric = True):
+        """
+        Returns the numerator of the response at the detector as a result of
+        excitations from one or more sources. The numerator is written as:
+
+        numer = sum_i Iv[i]*(cofactor(i, detP) - cofactor(i, detN))
+
+        See **maxCramerNumer()** for the description of the arguments.
+
+        :return: Numerator of a response
+        :rtype: sympy.Expr
+        """
+        terms = []
+        for i in range(len(Iv)):
+            if Iv[i] != 0:
+                if detP != None:
+                    terms.append((i, detP, 1))
+                if detN != None:
+                    terms.append((i, detN, -1))
+        self.request([(row, col) for (row, col, sign) in terms])
+        result = 0
+        for (row, col, sign) in terms:
+            result += sign*Iv[row]*self.cofactor(row, col, numeric)
+        return self.prune(sp.expand(result))
+
 def maxSolve(M, Iv, numeric = True):
     """
     Calculates M^(-1).Iv
@@ -528,11 +1512,15 @@ def equateCoeffs(protoType, transfer, noSolve = [], numeric=True):
             print('Error: could not solve equations.')
     return values
 
-def rmsNoise(noiseResult, noise, fmin, fmax, source = None):
+def rmsNoise(noiseResult, noise, fmin, fmax, source = None, cumulative = False):
     """
     Calculates the RMS source-referred noise or detector-referred noise,
     or the contribution of a specific noise source to it.
 
+    If the instruction has simType 'numeric' and the frequency limits are
+    numbers, the spectra are integrated numerically with
+    **SLiCAPnumeric.numRmsNoise()**. Else they are integrated with Maxima.
+
     :param noiseResult: Results of the execution of an instruction with data type 'noise'.
     :type noiseResult: SLiCAPprotos.allResults
 
@@ -550,11 +1538,24 @@ def rmsNoise(noiseResult, noise, fmin, fmax, source = None):
                    contribution to the RMS noise needs to be evaluated. Only
                    IDs of current of voltage sources with a nonzero value
                    for 'noise' are accepted.
+    :type source: NoneType, str
+
+    :param cumulative: If True, the RMS noise integrated from fmin up to each
+                       frequency of the integration grid is returned as well.
+                       Only available for numeric integration; defaults to
+                       False.
+    :type cumulative: Bool
+
     :return: RMS noise over the frequency interval.
 
              - An expression or value if parameter stepping of the instruction is disabled.
              - A list with expressions or values if parameter stepping of the instruction is enabled.
-    :rtype: int, float, sympy.Expr, list
+             - A dictionary with key-value pairs: ID of the noise source and
+               its contribution to the RMS noise if source == 'all'.
+             - A tuple with the RMS noise, a numpy array with frequencies and
+               the cumulative RMS noise at these frequencies if
+               cumulative == True.
+    :rtype: int, float, sympy.Expr, list, dict, tuple
     """
     if fmin == None or fmax == None:
         print("Error in frequency range specification.")
@@ -571,33 +1572,67 @@ def rmsNoise(noiseResult, noise, fmin, fmax, source = None):
             return None
     if noiseResult.dataType != 'noise':
         print("Error: expected dataType noise, got: '{0}'.".format(noiseResult.dataType))
-        rms = None
-    keys = list(noiseResult.onoiseTerms.keys())
-    if noise == 'inoise':
-        if source == None:
-            noiseData = noiseResult.inoise
-        elif source in keys:
-            noiseData = noiseResult.inoiseTerms[source]
-        else:
-            print("Error: unknown noise source: '{0}'.".format(source))
-            rms = None
-    elif noise == 'onoise':
-        if source == None:
-            noiseData = noiseResult.onoise
-        elif source in keys:
-            noiseData = noiseResult.onoiseTerms[source]
-        else:
-            print("Error: unknown noise source: '{0}'.".format(source))
-            rms = None
+        return None
+    keys = list(noiseResult.snoiseTerms.keys())
+    if source == None:
+        sources = [None]
+    elif source == 'all':
+        sources = keys
+    elif source in keys:
+        sources = [source]
     else:
+        print("Error: unknown noise source: '{0}'.".format(source))
+        return None
+    if noise not in ['inoise', 'onoise']:
         print("Error: unknown noise type: '{0}'.".format(noise))
-        rms = None
-    if type(noiseData) != list:
-        noiseData = [noiseData]
-    rms =  np.array([sp.N(sp.sqrt(maxIntegrate(noiseData[i], ini.frequency, start=fmin, stop=fmax, numeric=noiseResult.simType))) for i in range(len(noiseData))])
-    if len(rms) == 1:
-        rms = rms[0]
-    return rms
+        return None
+    elif noise == 'inoise' and noiseResult.source == None:
+        print("Error: source-referred noise requires a signal source.")
+        return None
+    rms = None
+    if noiseResult.numeric and fMi != None and fMa != None and fMi >= 0:
+        rms = numRmsNoise(noiseResult, noise, fmin, fmax, sources, cumulative = cumulative)
+        if cumulative and type(rms) != type(None):
+            (rms, f, cum) = rms
+    if type(rms) == type(None):
+        if type(noiseResult.onoise) == type(None):
+            print("Error: cannot integrate the numeric noise spectra.")
+            return None
+        elif cumulative:
+            print("Error: cumulative RMS noise requires numeric integration.")
+            return None
+        rms = []
+        for key in sources:
+            if key == None:
+                if noise == 'inoise':
+                    noiseData = noiseResult.inoise
+                else:
+                    noiseData = noiseResult.onoise
+            elif noise == 'inoise':
+                noiseData = noiseResult.inoiseTerms[key]
+            else:
+                noiseData = noiseResult.onoiseTerms[key]
+            if type(noiseData) != list:
+                noiseData = [noiseData]
+            rms.append(np.array([sp.N(sp.sqrt(maxIntegrate(noiseData[i], ini.frequency, start=fmin, stop=fmax, numeric=noiseResult.simType))) for i in range(len(noiseData))]))
+    rmsValues = {}
+    cumValues = {}
+    for i in range(len(sources)):
+        if len(rms[i]) == 1:
+            rmsValues[sources[i]] = rms[i][0]
+            if cumulative:
+                cumValues[sources[i]] = cum[i][0]
+        else:
+            rmsValues[sources[i]] = rms[i]
+            if cumulative:
+                cumValues[sources[i]] = cum[i]
+    if source != 'all':
+        rmsValues = rmsValues[sources[0]]
+        if cumulative:
+            cumValues = cumValues[sources[0]]
+    if cumulative:
+        return (rmsValues, f, cumValues)
+    return rmsValues
 
 if __name__ == '__main__':
     print(maxILT(1, ini.Laplace**2 + sp.Symbol('a')**2, numeric = False))
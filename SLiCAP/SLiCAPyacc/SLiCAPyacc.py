@@ -28,15 +28,42 @@ CIRTITLES = []
 
 LIB = circuit()
 
+# Hash of the SLiCAP version and the contents of the built-in libraries
+LIBKEY = ''
+
+# Dict with names and content hashes of the user libraries added to LIB
+LIBFILES = {}
+
+# Dict with checked circuits, keys are returned by circuitCacheKey()
+CIRCUITS = {}
+
 def checkCircuit(fileName):
     """
     Checks a netlist and converts it into a circuit object.
+
+    If ini.circuitCache is True, the checked circuit is stored and a copy of
+    it is returned at subsequent calls, as long as neither the netlist file,
+    the libraries in LIB, nor the libraries used by the netlist have changed.
+    If ini.circuitDiskCache is True, the circuit is also stored in
+    ini.cachePath + 'cir/'.
     
     :param fileName: Name of the netlist file, relative to the circuit directory.
     :type param: str
     :return: cir
     :rtype: SLiCAPprotos.circuit
     """
+    # Be sure the libraries are compiled withou errors.
+    if LIB.errors == 0:
+        key = circuitCacheKey(fileName)
+        cir = getCachedCircuit(key)
+        if cir != None:
+            # Add the libraries of the circuit to LIB, as would have been
+            # done by makeCircuit().
+            if len(cir.libs) != 0:
+                addUserLibs(cir.libs)
+            htmlCircuitIndex(cir)
+            print("No errors found for circuit: '{0}' from file: '{1}'.\n".format(cir.title, fileName))
+            return cir
     # Create in instance of the ciruit object
     cir = circuit()
     cir.file = fileName
@@ -56,10 +83,101 @@ def checkCircuit(fileName):
                 print("Errors found during updating of circuit data from '{0}'. Instructions with this circuit will not be executed.".format(cir.title))
             else:
                 print("No errors found for circuit: '{0}' from file: '{1}'.\n".format(cir.title, fileName))
+                # Parsing may have added user libraries to LIB: store the
+                # circuit also with the key for the updated libraries.
+                putCachedCircuit(key, cir)
+                newKey = circuitCacheKey(fileName)
+                if newKey != key:
+                    putCachedCircuit(newKey, cir)
     else:
         print("Errors found in library. Circuit '{0}' will not be ckecked.".format(fileName))
     return cir
 
+def circuitCacheKey(fileName):
+    """
+    Returns the key of a checked circuit in the circuit cache.
+
+    :param fileName: Name of the netlist file, relative to the circuit directory.
+    :type fileName: str
+
+    :return: Hash of the SLiCAP version, the name and the contents of the
+             netlist file, the libraries in LIB, ini.depVarOrder and
+             ini.detMethod, or None if the netlist file cannot be read.
+    :rtype: str, NoneType
+    """
+    libs = ['%s:%s'%(name, LIBFILES[name]) for name in sorted(LIBFILES.keys())]
+    return libCacheKey([fileName, fileHash(ini.circuitPath + fileName), LIBKEY, str(ini.depVarOrder), str(ini.detMethod)] + libs)
+
+def getCachedCircuit(key):
+    """
+    Returns a copy of a checked circuit from the circuit cache.
+
+    :param key: Key of the circuit as returned by **circuitCacheKey()**.
+    :type key: str
+
+    :return: Copy of the circuit object or None if the circuit has not been
+             cached, or if one of the libraries used by its netlist has
+             changed.
+    :rtype: SLiCAPprotos.circuit, NoneType
+    """
+    if not ini.circuitCache or key == None:
+        return None
+    if key not in list(CIRCUITS.keys()):
+        if not ini.circuitDiskCache or ini.cachePath == None:
+            return None
+        cir = readCache(ini.cachePath + 'cir/', key)
+        if cir == None:
+            return None
+        CIRCUITS[key] = cir
+    cir = CIRCUITS[key]
+    if getattr(cir, 'libHashes', None) != userLibHashes(cir.libs):
+        del CIRCUITS[key]
+        return None
+    return deepcopy(cir)
+
+def putCachedCircuit(key, cir):
+    """
+    Stores a copy of a checked circuit in the circuit cache.
+
+    :param key: Key of the circuit as returned by **circuitCacheKey()**.
+    :type key: str
+
+    :param cir: Checked circuit object.
+    :type cir: SLiCAPprotos.circuit
+    """
+    if not ini.circuitCache or key == None:
+        return
+    lexers = circuitLexers(cir)
+    for (subCircuit, lexer) in lexers:
+        subCircuit.lexer = None
+    CIRCUITS[key] = deepcopy(cir)
+    for (subCircuit, lexer) in lexers:
+        subCircuit.lexer = lexer
+    CIRCUITS[key].libHashes = userLibHashes(cir.libs)
+    if ini.circuitDiskCache and ini.cachePath != None:
+        writeCache(ini.cachePath + 'cir/', key, CIRCUITS[key])
+    return
+
+def htmlCircuitIndex(cir):
+    """
+    Makes the HTML index page of a circuit the active index page.
+
+    The page is only created if it has not been created before in this
+    session.
+
+    :param cir: Checked circuit object.
+    :type cir: SLiCAPprotos.circuit
+    """
+    ini.htmlPrefix = ('-'.join(cir.title.split()) + '_')
+    fileName = ini.htmlPrefix + 'index.html'
+    if fileName in ini.htmlPages and os.path.exists(ini.htmlPath + fileName):
+        ini.htmlIndex = fileName
+        ini.htmlPage = fileName
+    else:
+        ini.htmlIndex = 'index.html'
+        htmlPage(cir.title, index = True)
+    return
+
 def makeCircuit(cir):
     """
     Creates a nested circuit object from the tokens in cir.lexer.
@@ -565,6 +683,8 @@ def expandCircuit(elmt, parentCircuit, childCircuit):
     'childCircuit'.
     
     After expansion the element 'elmt' will be removed from 'parentCircuit'.
+    Its nodes and the names of the new elements are stored in the attribute
+    'instances' of 'parentCircuit'.
     
     This proceeds as follows:
         
@@ -675,6 +795,9 @@ def expandCircuit(elmt, parentCircuit, childCircuit):
         newKey = fullSubs(sp.Symbol(key), substDict)
         newValue = fullSubs(newParDefs[key], substDict)
         parentCircuit.parDefs[str(newKey)] = newValue
+    # Store the ports and the elements of the instance for hierarchical
+    # analysis
+    parentCircuit.instances[elmt.refDes] = (list(elmt.nodes), list(newElements.keys()))
     # Delete elmt from the parent circuit, it has now been replaced with
     # elements of the child
     del parentCircuit.elements[elmt.refDes]
@@ -865,6 +988,64 @@ def sortDepVars(mainCircuit):
         mainCircuit.depVars.append('V_' + mainCircuit.nodes[i])
         mainCircuit.varIndex[mainCircuit.nodes[i]] = varIndexPos
         varIndexPos += 1
+    if ini.depVarOrder == 'mindegree' or (ini.depVarOrder == 'auto' and ini.detMethod != 'maxima'):
+        mainCircuit = minDegreeOrder(mainCircuit)
+    return mainCircuit
+
+def minDegreeOrder(mainCircuit):
+    """
+    Reorders the dependent variables according to the minimum-degree ordering
+    of the structural pattern of the MNA matrix.
+
+    The variable with the smallest number of off-diagonal entries in its row
+    and column is placed first and eliminated from the pattern; the fill-in
+    caused by its elimination is added to the pattern. Ties are resolved in
+    the order of **sortDepVars()**. The reference node '0' is placed last.
+
+    The ordering is recorded in the attributes *depVars* and *varIndex*, from
+    which the MNA matrix, the source and detector positions and the vector
+    with dependent variables are built.
+
+    :param mainCircuit: Main (fully expanded) circuit object.
+    :type mainCircuit: SLiCAP.protos.circuit
+    :return: mainCircuit: Main circuit with updated attributes *depVars* and *varIndex*.
+    :rtype: SLiCAPprotos.circuit
+    """
+    dim = len(mainCircuit.depVars)
+    gndPos = mainCircuit.varIndex['0']
+    # Symmetric structural pattern of the matrix without the reference node
+    pattern = [set() for i in range(dim)]
+    for el in list(mainCircuit.elements.keys()):
+        try:
+            stamps = elementStamps(mainCircuit, mainCircuit.elements[el], False, {})
+        except KeyError as key:
+            print("Warning: cannot determine the matrix entries of '{0}' for the minimum-degree ordering, missing: {1}.".format(el, key))
+            continue
+        for row in list(stamps.keys()):
+            for col in list(stamps[row].keys()):
+                if row != col and row != gndPos and col != gndPos:
+                    pattern[row].add(col)
+                    pattern[col].add(row)
+    remaining = [pos for pos in range(dim) if pos != gndPos]
+    order = []
+    while len(remaining) != 0:
+        pos = min(remaining, key = lambda i: len(pattern[i]))
+        for i in pattern[pos]:
+            pattern[i] |= pattern[pos]
+            pattern[i].discard(i)
+            pattern[i].discard(pos)
+        order.append(pos)
+        remaining.remove(pos)
+    order.append(gndPos)
+    names = {}
+    for key in list(mainCircuit.varIndex.keys()):
+        names[mainCircuit.varIndex[key]] = key
+    depVars = mainCircuit.depVars
+    mainCircuit.depVars = []
+    mainCircuit.varIndex = {}
+    for i in range(dim):
+        mainCircuit.depVars.append(depVars[order[i]])
+        mainCircuit.varIndex[names[order[i]]] = i
     return mainCircuit
 
 def addGlobals(parDefs, par):
@@ -899,8 +1080,14 @@ def makeLibraries():
              definitions from  'lib/SLiCAPmodels.lib'.
     :rtype: SLiCAPprotos.circuit
     """
-    global CIRTITLES, LIB
+    global CIRTITLES, LIB, LIBKEY, LIBFILES
     CIRTITLES = []
+    LIBFILES = {}
+    LIBKEY = libCacheKey([fileHash(ini.defaultLib + '/SLiCAPmodels.lib'), fileHash(ini.defaultLib + '/SLiCAP.lib')])
+    cachedLib = readLibCache(LIBKEY)
+    if cachedLib != None:
+        LIB = cachedLib
+        return LIB
     # This must be the first library: it contains the basic expansion models!
     fileName = ini.defaultLib + '/SLiCAPmodels.lib'
     LIB = circuit()
@@ -934,6 +1121,7 @@ def makeLibraries():
             return LIB
         CIRTITLES = []
         LIB = cir
+        writeLibCache(LIBKEY, LIB)
         return LIB
     
 def addUserLibs(fileNames):
@@ -945,40 +1133,33 @@ def addUserLibs(fileNames):
     :param fileNames: List with file names (*str*) of user libraries.
     :type fileNames: list
     """
-    global CIRTITLES, LIB
+    global CIRTITLES, LIB, LIBFILES
     for fi in fileNames:
         # The standard library "SLiCAP.lib" has already been included.
         libFile = fi.split('.')
         try:
             if libFile[0] != 'SLiCAP' and libFile[0] != 'SLiCAPmodels':               
-                try:
-                    # first libraries in circuit directory
-                    f = open(ini.projectPath + CIRPATH + fi, "r")
-                    fileName = ini.projectPath + CIRPATH + fi
-                    f.close()
-                except:
-                    try:
-                        # then libraries in the user library directory
-                        f = open(ini.projectPath + LIBRARYPATH + fi, "r")
-                        fileName = ini.projectPath + LIBRARYPATH + fi
-                        f.close()
-                    except:
-                        try:
-                            # then absolute path
-                            f = open(fi, "r")
-                            fileName = fi
-                            f.close()
-                        except:
-                            print("Error: cannot find library file: '{0}'.".format(fi))
-                            fileName = False
+                fileName = userLibFile(fi)
+                if fileName == False:
+                    print("Error: cannot find library file: '{0}'.".format(fi))
                 if fileName != False:
-                    cir = circuit()
-                    cir.file = fi
-                    cir.lexer = tokenize(fileName)
-                    cir = makeCircuit(cir)
+                    # The compiled library also depends on the libraries that
+                    # have already been added to LIB
+                    fileKey = fileHash(fileName)
+                    otherLibs = ['%s:%s'%(name, LIBFILES[name]) for name in sorted(LIBFILES.keys()) if name != fileName]
+                    key = libCacheKey([LIBKEY, fileKey] + otherLibs)
+                    cir = readLibCache(key)
+                    if cir == None:
+                        cir = circuit()
+                        cir.file = fi
+                        cir.lexer = tokenize(fileName)
+                        cir = makeCircuit(cir)
+                        if cir.errors == 0:
+                            writeLibCache(key, cir)
                     if cir.errors != 0:
                         print("Errors found in library: '{0}'. Library will not be added!".format(fileName))
                     else:
+                        LIBFILES[fileName] = fileKey
                         for cirName in list(cir.circuits.keys()):
                             LIB.circuits[cirName] = cir.circuits[cirName]
                         for newModelDef in list(cir.modelDefs.keys()):
@@ -994,6 +1175,199 @@ def addUserLibs(fileNames):
             pass
     return
 
+def userLibFile(fi):
+    """
+    Returns the path of a user library file.
+
+    The file is searched for in the circuit directory, in the user library
+    directory and as absolute path, in this order.
+
+    :param fi: Name of the library file.
+    :type fi: str
+
+    :return: Path of the library file, or False if it cannot be found.
+    :rtype: str, bool
+    """
+    for path in ['circuit', 'library', 'absolute']:
+        try:
+            if path == 'circuit':
+                fileName = ini.circuitPath + fi
+            elif path == 'library':
+                fileName = ini.projectPath + LIBRARYPATH + fi
+            else:
+                fileName = fi
+            f = open(fileName, "r")
+            f.close()
+            return fileName
+        except:
+            pass
+    return False
+
+def userLibHashes(fileNames):
+    """
+    Returns the content hashes of user library files.
+
+    :param fileNames: List with file names (*str*) of libraries.
+    :type fileNames: list
+
+    :return: Dictionary with key-value pairs:
+
+             - key: name (*str*) of a user library file
+             - value: hash of its contents (*str*), or None if the file
+               cannot be found
+    :rtype: dict
+    """
+    hashes = {}
+    for fi in fileNames:
+        libFile = fi.split('.')
+        if libFile[0] != 'SLiCAP' and libFile[0] != 'SLiCAPmodels':
+            fileName = userLibFile(fi)
+            if fileName == False:
+                hashes[fi] = None
+            else:
+                hashes[fi] = fileHash(fileName)
+    return hashes
+
+def fileHash(fileName):
+    """
+    Returns the hash of the contents of a file.
+
+    :param fileName: Name of the file.
+    :type fileName: str
+
+    :return: SHA-256 hash of the file contents, or None if the file cannot be
+             read.
+    :rtype: str, NoneType
+    """
+    try:
+        f = open(fileName, 'rb')
+        data = f.read()
+        f.close()
+    except:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+def libCacheKey(hashes):
+    """
+    Returns the key of a compiled library in the library cache.
+
+    :param hashes: List with hashes (*str*) of the library files and of the
+                   libraries on which the compiled library depends.
+    :type hashes: list
+
+    :return: Hash of the SLiCAP version and the hashes, or None if one of the
+             hashes is None.
+    :rtype: str, NoneType
+    """
+    if None in hashes:
+        return None
+    text = '\n'.join([VERSION] + hashes)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def readLibCache(key):
+    """
+    Returns a compiled library from the library cache in the directory
+    ini.cachePath + 'lib/'.
+
+    :param key: Key of the library as returned by **libCacheKey()**.
+    :type key: str
+
+    :return: Circuit object of the compiled library or None if it has not
+             been cached.
+    :rtype: SLiCAPprotos.circuit, NoneType
+    """
+    if not ini.libCache or ini.cachePath == None or key == None:
+        return None
+    return readCache(ini.cachePath + 'lib/', key)
+
+def writeLibCache(key, cir):
+    """
+    Stores a compiled library in the library cache in the directory
+    ini.cachePath + 'lib/'.
+
+    :param key: Key of the library as returned by **libCacheKey()**.
+    :type key: str
+
+    :param cir: Circuit object of the compiled library.
+    :type cir: SLiCAPprotos.circuit
+    """
+    if not ini.libCache or ini.cachePath == None or key == None:
+        return
+    writeCache(ini.cachePath + 'lib/', key, cir)
+    return
+
+def readCache(path, key):
+    """
+    Returns a circuit object stored by **writeCache()**.
+
+    :param path: Directory of the cache.
+    :type path: str
+
+    :param key: Key of the circuit object.
+    :type key: str
+
+    :return: Circuit object or None if it has not been stored.
+    :rtype: SLiCAPprotos.circuit, NoneType
+    """
+    try:
+        f = open(path + key + '.pkl', 'rb')
+        cir = pickle.load(f)
+        f.close()
+    except:
+        return None
+    return cir
+
+def writeCache(path, key, cir):
+    """
+    Stores a circuit object in the file '<key>.pkl' in the directory 'path'.
+
+    The lexers of the circuit and its sub circuits are not stored.
+
+    :param path: Directory of the cache.
+    :type path: str
+
+    :param key: Key of the circuit object.
+    :type key: str
+
+    :param cir: Circuit object.
+    :type cir: SLiCAPprotos.circuit
+    """
+    lexers = circuitLexers(cir)
+    for (subCircuit, lexer) in lexers:
+        subCircuit.lexer = None
+    try:
+        if not os.path.exists(path):
+            os.makedirs(path)
+        fileName = path + key + '.pkl'
+        f = open(fileName + '.%s'%(os.getpid()), 'wb')
+        pickle.dump(cir, f)
+        f.close()
+        os.replace(fileName + '.%s'%(os.getpid()), fileName)
+    except:
+        print("Error: could not write to the cache directory: '%s'."%(path))
+    for (subCircuit, lexer) in lexers:
+        subCircuit.lexer = lexer
+    return
+
+def circuitLexers(cir):
+    """
+    Returns the lexers of a circuit and of its sub circuits.
+
+    :param cir: Circuit object.
+    :type cir: SLiCAPprotos.circuit
+
+    :return: List with tuples with a (sub) circuit object and its lexer.
+    :rtype: list
+    """
+    lexers = {}
+    circuits = [cir]
+    while len(circuits) != 0:
+        subCircuit = circuits.pop()
+        if id(subCircuit) not in list(lexers.keys()):
+            lexers[id(subCircuit)] = (subCircuit, subCircuit.lexer)
+            circuits += list(subCircuit.circuits.values())
+    return list(lexers.values())
+
 if __name__ == '__main__':
     """
     Since we are not running a project, we need to define project data.
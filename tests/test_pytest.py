@@ -6,6 +6,7 @@ Created on Sat Oct  3 11:28:37 2020
 """
 from SLiCAP import *
 import os
+import sys
 
 def test_pytest():
     assert 4==4
@@ -187,3 +188,494 @@ def test_python_maxima():
     circuit_component_values = equateCoeffs(proto_transfer, circuit_transfer, noSolve=['A','tau'], numeric=False)
     print(circuit_component_values)
 
+
+def test_matrixDet():
+    s = ini.Laplace
+    R, C, g = sp.symbols('R C g')
+    M = sp.Matrix([[1/R + s*C, -1/R, 0, 1],
+                   [-1/R, 1/R + s*C, g, 0],
+                   [0, -g, 1/R, 0],
+                   [1, 0, 0, 0]])
+    DET = sp.expand(M.det())
+    for method in ['minors', 'bareiss', 'zippel', 'ddd']:
+        assert sp.simplify(matrixDet(M, method = method) - DET) == 0
+    # Row scale factor with a symbol that is not in the scaled entries
+    R1, A = sp.symbols('R1 A')
+    M = sp.Matrix([[1/R1, 0], [A, g]])
+    for method in ['minors', 'bareiss', 'zippel', 'ddd']:
+        assert sp.simplify(matrixDet(M, method = method) - g/R1) == 0
+    # Numeric polynomial matrix with widely spread coefficients
+    M = sp.Matrix([[1e-3 + s*1e-12, -1e-3, 0, 0, 1],
+                   [-1e-3, 2e-3 + s*1e-9, -1e-3, 0, 0],
+                   [0, -1e-3, 1e-3 + s*1e-6, 4e1, 0],
+                   [0, 0, -1e-5*s, 1e-6 + s*1e-15, 0],
+                   [1, 0, 0, 0, 0]])
+    M = sp.nsimplify(M, rational = True)
+    DET = sp.Poly(M.det(method = 'berkowitz'), s).all_coeffs()
+    coeffs = sp.Poly(matrixDet(M, method = 'fft'), s).all_coeffs()
+    assert len(coeffs) == len(DET)
+    for (coeff, ref) in zip(coeffs, DET):
+        assert abs(coeff/ref - 1) < 1e-10
+    minors = minorsFFT(M, [(3, 3), (4, 4)])
+    for (row, col) in [(3, 3), (4, 4)]:
+        MINOR = sp.Poly(M.minor(row, col, method = 'berkowitz'), s).all_coeffs()
+        coeffs = sp.Poly(minors[(row, col)], s).all_coeffs()
+        assert len(coeffs) == len(MINOR)
+        for (coeff, ref) in zip(coeffs, MINOR):
+            assert abs(coeff - ref) <= 1e-10*abs(ref)
+
+def test_polyEig():
+    s = ini.Laplace
+    M = sp.Matrix([[1e-3 + s*1e-9, -1e-3, 1],
+                   [-1e-3, 2e-3 + s*2e-9, 0],
+                   [1, 0, 0]])
+    poles = polyEig(coeffMatrices(M))
+    assert len(poles) == 1
+    assert abs(poles[0] + 1e6) < 1e-3
+
+def test_parResolver():
+    a, b, c, x = sp.symbols('a b c x')
+    resolver = parResolver()
+    resolver.update({a: 2*b, b: c + 1, c: 3})
+    assert resolver.subs(a*x) == 8*x
+    resolver.update({a: 2*b, b: c + 1, c: 4})
+    assert resolver.subs(a*x) == 10*x
+    resolver.update({a: 2*b, b: a + 1})
+    resolver.subs(a)
+    assert resolver.cycles == {a, b}
+
+def test_numIntegrate():
+    fc = 1e3
+    func = lambda f: np.array([1/(1 + (f/fc)**2), np.ones(len(f))])
+    result = numIntegrate(func, 0, 1e6)
+    assert abs(result[0]/(fc*np.arctan(1e6/fc)) - 1) < 1e-6
+    assert abs(result[1]/1e6 - 1) < 1e-6
+    (result, f, cum) = numIntegrate(func, 0, 1e6, cumulative = True)
+    assert np.allclose(cum[:, -1], result, rtol = 1e-12, atol = 0)
+    assert np.allclose(cum[0], fc*np.arctan(f/fc), rtol = 1e-6, atol = 1e-6)
+
+def test_iltFunction():
+    # (s + 2)/((s + 1)**3 (s + 2)) = 1/(s + 1)**3
+    t = np.linspace(0, 5, 11)
+    f = iltFunction([[0, 0, 0, 1, 2]], [[1, 5, 9, 7, 2]])
+    assert np.max(np.abs(f.evaluate(t)[0] - t**2/2*np.exp(-t))) < 1e-9
+    # s/(s**2 + 2s + 5)
+    f = iltFunction([[0, 1, 0]], [[1, 2, 5]])
+    assert np.max(np.abs(f.evaluate(t)[0] - np.exp(-t)*(np.cos(2*t) - 0.5*np.sin(2*t)))) < 1e-9
+
+def test_pruneTerms():
+    s = ini.Laplace
+    a, b, x = sp.symbols('a b x')
+    values = {a: sp.Float(1), b: sp.Float(1e-4)}
+    (result, error) = pruneTerms(a + b + a*b*s + x*s**2, values, 0.01)
+    assert result == a + a*b*s + x*s**2
+    assert abs(error - 1e-4) < 1e-6
+    (result, error) = pruneTerms(a - b, values, 0)
+    assert result == a - b and error == 0
+    # Terms are grouped by the parameters without a nominal value
+    y = sp.Symbol('y')
+    (result, error) = pruneTerms(x*(a + b) + y*b, values, 0.01)
+    assert result == a*x + b*y
+
+def setTestProject():
+    # Project settings for tests with netlists in tests/test_files
+    ini.installPath = os.getcwd() + '/'
+    ini.projectPath = ini.installPath + 'files/examples/CSstage/'
+    ini.circuitPath = ini.installPath + 'tests/test_files/'
+    ini.htmlPath    = ini.projectPath + 'html/'
+    ini.htmlIndex   = 'index.html'
+    makeDir(ini.htmlPath)
+    ini.lastUpdate  = datetime.now()
+    ini.detMethod   = 'minors'
+    LIB = makeLibraries()
+
+def makeInstruction(fileName, source, detector, gainType, dataType, simType = 'numeric'):
+    i1 = instruction()
+    i1.setCircuit(fileName)
+    i1.setSource(source)
+    i1.setDetector(detector)
+    i1.setGainType(gainType)
+    i1.setDataType(dataType)
+    i1.setSimType(simType)
+    return i1
+
+def test_numPZloopgain():
+    # Pole of the loop gain reference close to the origin
+    setTestProject()
+    i1 = makeInstruction('EZamp.cir', 'V1', 'V_out', 'loopgain', 'pz')
+    i1.setLGref('E1')
+    ini.numericPZ = True
+    result = i1.execute()
+    assert abs(result.DCvalue/(-1e5/11) - 1) < 1e-6
+
+def test_numTransient():
+    setTestProject()
+    # Algebraic output at t[0]
+    result = makeInstruction('divider.cir', 'V1', 'V_out', 'vi', 'laplace').execute()
+    assert np.allclose(numTransient(result, [0, 1e-6, 2e-6], 1), 0.75)
+    y = numTransient(result, [0, 1e-6, 2e-6], pwlWave([0, 1e-6, 2e-6], [1, 0, 1]))
+    assert np.allclose(y, [0.75, 0, 0.75])
+    assert numTransient(result, [0], 1) is None
+    # Step response of an RC network
+    result = makeInstruction('myFirstRCnetwork.cir', 'V1', 'V_out', 'vi', 'laplace').execute()
+    t = np.linspace(0, 1e-3, 1001)
+    tau = 1/(2*np.pi*1e3)
+    assert np.max(np.abs(numTransient(result, t, 1) - (1 - np.exp(-t/tau)))) < 1e-4
+
+def test_numNoise():
+    setTestProject()
+    i1 = makeInstruction('RCnoise.cir', 'V1', 'V_out', 'vi', 'noise')
+    ref = i1.execute()
+    # Spectra are not calculated symbolically with ini.numericNoise
+    ini.numericNoise = True
+    result = i1.execute()
+    ini.numericNoise = False
+    assert result.onoise == None
+    assert set(result.snoiseTerms.keys()) == {'V1', 'I1'}
+    f = np.logspace(0, 8, 50)
+    spectrum = lambda expr: sp.lambdify(ini.frequency, expr)(f)*np.ones(len(f))
+    (onoise, inoise, onoiseTerms, inoiseTerms) = numNoise(result, f)
+    assert np.allclose(onoise, spectrum(ref.onoise), rtol = 1e-10, atol = 0)
+    assert np.allclose(inoise, spectrum(ref.inoise), rtol = 1e-10, atol = 0)
+    for src in ['V1', 'I1']:
+        assert np.allclose(onoiseTerms[src], spectrum(ref.onoiseTerms[src]), rtol = 1e-10, atol = 0)
+        assert np.allclose(inoiseTerms[src], spectrum(ref.inoiseTerms[src]), rtol = 1e-10, atol = 0)
+    noiseData = sweepNoise_f(result, f, 'inoise', ['I1', None])
+    assert np.allclose(noiseData['I1'], spectrum(ref.inoiseTerms['I1']), rtol = 1e-10, atol = 0)
+    assert np.allclose(noiseData[None], spectrum(ref.inoise), rtol = 1e-10, atol = 0)
+
+def test_numDCvar():
+    setTestProject()
+    ini.dcvarSamples = 100000
+    ini.dcvarSeed = 1
+    result = makeInstruction('divider.cir', 'V1', 'V_out', 'vi', 'dcvar').execute()
+    ini.dcvarSamples = 0
+    ini.dcvarSeed = None
+    # First-order variances of V_out = V1*R2/(R1 + R2)
+    V1, R1, R2 = 1, 1e3, 3e3
+    varV, varR1, varR2 = 1e-4, 100, 400
+    ovarTerms = {'V1': varV*(R2/(R1 + R2))**2,
+                 'I_R1': varR1*(V1*R2/(R1 + R2)**2)**2,
+                 'I_R2': varR2*(V1*R1/(R1 + R2)**2)**2}
+    assert abs(result.ovar/sum(ovarTerms.values()) - 1) < 0.05
+    for key in list(ovarTerms.keys()):
+        assert abs(result.ovarTerms[key]/ovarTerms[key] - 1) < 0.05
+    # Variances of the equivalent error currents of the resistors
+    I = V1/(R1 + R2)
+    assert abs(result.svarTerms['I_R1']/(varR1*(I/R1)**2) - 1) < 1e-10
+    assert abs(result.svarTerms['I_R2']/(varR2*(I/R2)**2) - 1) < 1e-10
+
+def test_numSens():
+    setTestProject()
+    f = np.array([1e2, 1e3, 1e4])
+    s = 2j*np.pi*f
+    # C is defined in terms of R and f_c: the total derivatives with respect
+    # to R are zero
+    i1 = makeInstruction('myFirstRCnetwork.cir', 'V1', 'V_out', 'gain', 'laplace')
+    result = i1.execute()
+    transferSens = numTransferSens(result, f)
+    (pole, poleSens) = numPoleSens(result)
+    gain = sp.lambdify(ini.Laplace, result.laplace)(s)
+    for par in result.parDefs.keys():
+        value = float(fullSubs(result.parDefs[par], result.parDefs))
+        h = 1e-6*value
+        gains = []
+        poles = []
+        for parValue in [value + h, value - h]:
+            i1.defPar(par, parValue)
+            r = i1.execute()
+            gains.append(sp.lambdify(ini.Laplace, r.laplace)(s))
+            poles.append(numPoleSens(r)[0])
+        i1.defPar(par, result.parDefs[par])
+        # Relative sensitivities
+        fd = (gains[0] - gains[1])/(2*h)
+        assert np.allclose(value*transferSens[par]/np.abs(gain), value*fd/np.abs(gain), rtol = 0, atol = 1e-6)
+        fd = (poles[0] - poles[1])/(2*h)
+        assert abs(value*(poleSens[par] - fd)/pole) < 1e-6
+    assert np.allclose(transferSens[sp.Symbol('R')], 0, atol = 1e-12)
+    # DC value of the detector voltage
+    i1 = makeInstruction('divider.cir', 'V1', 'V_out', 'vi', 'laplace')
+    result = i1.execute()
+    dcSens = numDCsens(result)
+    for name in ['R1', 'R2']:
+        par = sp.Symbol(name)
+        value = float(result.parDefs[par])
+        h = 1e-6*value
+        dcValues = []
+        for parValue in [value + h, value - h]:
+            i1.defPar(par, parValue)
+            dcValues.append(float(i1.execute().laplace.subs(ini.Laplace, 0)))
+        i1.defPar(par, result.parDefs[par])
+        assert abs(value*(dcSens[par] - (dcValues[0] - dcValues[1])/(2*h))/0.75) < 1e-6
+
+def test_numTransfer():
+    setTestProject()
+    result = makeInstruction('EZamp.cir', 'V1', 'V_out', 'gain', 'laplace').execute()
+    f = np.logspace(-3, 8, 200)
+    s = 2j*np.pi*f
+    H = sp.lambdify(ini.Laplace, result.laplace)(s)
+    dH = sp.lambdify(ini.Laplace, sp.diff(result.laplace, ini.Laplace))(s)
+    assert np.allclose(numTransfer(result, f), H, rtol = 1e-10, atol = 0)
+    assert np.allclose(numFunc_f(result, f, 'mag'), np.abs(H), rtol = 1e-10, atol = 0)
+    assert np.allclose(numFunc_f(result, f, 'dBmag'), 20*np.log10(np.abs(H)), rtol = 0, atol = 1e-8)
+    assert np.allclose(numFunc_f(result, f, 'phase'), np.unwrap(np.angle(H))*180/np.pi, rtol = 0, atol = 1e-8)
+    delay = -np.real(dH/H)
+    assert np.allclose(numFunc_f(result, f, 'delay'), delay, rtol = 1e-8, atol = 1e-10*np.max(np.abs(delay)))
+
+def test_depVarOrder():
+    setTestProject()
+    keys = []
+    results = {}
+    for order in ['heuristic', 'mindegree']:
+        ini.depVarOrder = order
+        keys.append(circuitCacheKey('EZamp.cir'))
+        results[order] = makeInstruction('EZamp.cir', 'V1', 'V_out', 'gain', 'laplace').execute()
+    ini.depVarOrder = 'auto'
+    assert keys[0] != keys[1]
+    cir = results['mindegree'].circuit
+    assert cir.depVars[-1] == 'V_0'
+    assert len(cir.varIndex) == len(cir.depVars)
+    for name in list(cir.varIndex.keys()):
+        assert cir.depVars[cir.varIndex[name]] in [name, 'V_' + name]
+    s = 2j*np.pi*np.logspace(-3, 8, 20)
+    H = [sp.lambdify(ini.Laplace, results[order].laplace)(s) for order in ['heuristic', 'mindegree']]
+    assert np.allclose(H[0], H[1], rtol = 1e-10, atol = 0)
+
+def test_mnaTemplate():
+    setTestProject()
+    i1 = makeInstruction('EZamp.cir', 'V1', 'V_out', 'gain', 'laplace')
+    result = i1.execute()
+    M = result.M
+    templates = list(i1.circuit.mnaTemplates.values())
+    assert len(templates) == 1
+    stamps = dict(templates[0].stamps)
+    # Only the stamps of E1 depend on tau
+    i1.defPar('tau', 20)
+    result = i1.execute()
+    assert list(i1.circuit.mnaTemplates.values()) == templates
+    assert [el for el in stamps.keys() if templates[0].stamps[el] is not stamps[el]] == ['E1']
+    pos = list(result.Dv).index(sp.Symbol('Io_E1'))
+    changed = [(i, j) for i in range(M.shape[0]) for j in range(M.shape[1]) if M[i, j] != result.M[i, j]]
+    assert len(changed) != 0 and all([i == pos for (i, j) in changed])
+    cir = deepcopy(i1.circuit)
+    cir.mnaTemplates = {}
+    assert makeMatrices(cir, result.parDefs, True, 'gain', None)[0] == result.M
+
+def test_matrixCofactors(monkeypatch):
+    ini.detMethod = 'minors'
+    s = ini.Laplace
+    R, C, g = sp.symbols('R C g')
+    M = sp.Matrix([[1/R + s*C, -1/R, 0, 1],
+                   [-1/R, 1/R + s*C, g, 0],
+                   [0, -g, 1/R, 0],
+                   [1, 0, 0, 0]])
+    cofactor = lambda row, col: (-1)**(row + col)*M.minor(row, col)
+    cof = matrixCofactors(M)
+    calls = []
+    calculate = cof.calculate
+    def count(minors, numeric = True):
+        calls.append(list(minors))
+        calculate(minors, numeric)
+    cof.calculate = count
+    # All requested minors are calculated in one pass
+    cof.request([(0, 1), (2, 1)])
+    assert sp.simplify(cof.det(numeric = False) - M.det()) == 0
+    assert set(calls[0]) == {(None, None), (0, 1), (2, 1)}
+    assert sp.simplify(cof.cofactor(0, 1, numeric = False) - cofactor(0, 1)) == 0
+    assert sp.simplify(cof.cofactor(2, 1, numeric = False) - cofactor(2, 1)) == 0
+    # Stored minors are not recalculated
+    assert [minors for minors in calls[1:] if len(minors) != 0] == []
+    numer = cof.numer(1, 2, 0, 3, numeric = False)
+    assert sp.simplify(numer - (cofactor(0, 1) - cofactor(3, 1) - cofactor(0, 2) + cofactor(3, 2))) == 0
+    Iv = [sp.Symbol('I1'), 0, 0, sp.Symbol('V1')]
+    numer = cof.cramer(Iv, 1, None, numeric = False)
+    assert sp.simplify(numer - (Iv[0]*cofactor(0, 1) + Iv[3]*cofactor(3, 1))) == 0
+    # Symbolic matrices are expanded by minors with ini.detMethod == 'fft',
+    # and if Maxima fails
+    module = sys.modules[matrixCofactors.__module__]
+    monkeypatch.setattr(module, 'maxEval', lambda maxExpr: 'error')
+    for method in ['fft', 'maxima']:
+        ini.detMethod = method
+        cof = matrixCofactors(M)
+        assert sp.simplify(cof.det(numeric = False) - M.det()) == 0
+        assert sp.simplify(cof.cofactor(2, 1, numeric = False) - cofactor(2, 1)) == 0
+    ini.detMethod = 'minors'
+
+def test_trackRoots():
+    # Roots -1 and -0.5 +/- j*y: the magnitude of the complex pair crosses
+    # that of the real root
+    y = np.linspace(0.5, 1.5, 21)
+    coeffs = np.array([np.ones(len(y)), 2*np.ones(len(y)), 1.25 + y**2, 0.25 + y**2]).T
+    roots = batchRoots(coeffs)
+    for k in range(len(y)):
+        assert np.allclose(np.sort_complex(roots[k]), np.sort_complex(np.roots(coeffs[k])))
+    branches = trackRoots(roots)
+    assert branches.shape == (len(y), 3)
+    assert np.max(np.abs(np.diff(branches, axis = 0))) < 1.01*(y[1] - y[0])
+    # Leading and trailing zero coefficients
+    roots = batchRoots([[0, 1, 2, 0], [1, 3, 2, 0]])
+    assert np.allclose(roots[0], [0, -2]) or np.allclose(roots[0], [-2, 0])
+    assert np.allclose(np.sort(roots[1]), [-2, -1, 0])
+
+def test_cancelPZ():
+    poles = [-1, -1, -2 + 1j, -2 - 1j, -5]
+    zeros = [-1*(1 + 10**(-ini.disp - 1)), -2 - 1j, -3]
+    (newPoles, newZeros) = cancelPZ(poles, zeros)
+    assert newPoles == [-1, -2 + 1j, -5]
+    assert newZeros == [-3]
+
+def test_doParallelSteps(capsys):
+    setTestProject()
+    ini.stepFunction = False
+    results = {}
+    for processes in [1, 2]:
+        ini.stepProcesses = processes
+        for dataType in ['pz', 'laplace']:
+            i1 = makeInstruction('EZamp.cir', 'V1', 'V_out', 'gain', dataType)
+            i1.setStepVar('R2')
+            i1.setStepMethod('lin')
+            i1.setStepStart(1e3)
+            i1.setStepStop(2e4)
+            i1.setStepNum(5)
+            i1.stepOn()
+            results[(processes, dataType)] = i1.execute()
+    ini.stepProcesses = 1
+    ini.stepFunction = True
+    assert 'parallel parameter stepping failed' not in capsys.readouterr().out
+    assert results[(2, 'pz')].poles == results[(1, 'pz')].poles
+    assert results[(2, 'pz')].zeros == results[(1, 'pz')].zeros
+    assert results[(2, 'laplace')].laplace == results[(1, 'laplace')].laplace
+    # Step order: DC gain -R2/R1
+    DCvalues = [float(value) for value in results[(2, 'pz')].DCvalue]
+    assert np.allclose(DCvalues, -np.linspace(1e3, 2e4, 5)/1e3, rtol = 1e-3)
+
+def test_stepPolyCoeffs():
+    s = ini.Laplace
+    R, C, A = sp.symbols('R C A')
+    poly = R**2*C*s**2 + (R + A*sp.sqrt(R))*s + A*R
+    instObj = allResults()
+    instObj.stepMethod = 'list'
+    instObj.stepVar = R
+    instObj.stepList = [0, 1e3, 2e3, 5e3]
+    assert stepPolyCoeffs(instObj, poly) == None
+    instObj.stepMethod = 'array'
+    instObj.stepVars = [R, A]
+    instObj.stepArray = [[0, 1e3, 2e3, 5e3], [10, 20, 30, 40]]
+    function = poly.subs(C, 1e-9)
+    coeffs = stepPolyCoeffs(instObj, function)
+    assert coeffs.shape == (4, 3)
+    for i, stepFunction in enumerate(stepFunctions(instObj, function)):
+        # sp.Poly drops leading zero coefficients
+        ref = [float(coeff) for coeff in sp.Poly(stepFunction, s).all_coeffs()]
+        ref = [0]*(3 - len(ref)) + ref
+        assert np.allclose(coeffs[i], ref, rtol = 1e-12, atol = 0)
+    instObj.stepMethod = 'list'
+    instObj.stepList = [1e3, 2e3, 5e3]
+    function = poly.subs({C: 1e-9, A: 10})
+    coeffs = stepPolyCoeffs(instObj, function)
+    for i, stepFunction in enumerate(stepFunctions(instObj, function)):
+        ref = [float(coeff) for coeff in sp.Poly(stepFunction, s).all_coeffs()]
+        assert np.allclose(coeffs[i], ref, rtol = 1e-12, atol = 0)
+
+def test_schurReduction():
+    setTestProject()
+    results = {}
+    for schurReduction in [False, True]:
+        ini.schurReduction = schurReduction
+        PORTMODELS.clear()
+        i1 = makeInstruction('stages.cir', 'V1', 'V_out', 'gain', 'laplace', 'symbolic')
+        results[schurReduction] = i1.execute()
+    ini.schurReduction = False
+    result = results[True]
+    assert isinstance(result.cofactors.reduced, matrixCofactors)
+    assert sp.simplify(result.laplace - results[False].laplace) == 0
+    # One port description for the three identical instances
+    assert len(PORTMODELS) == 1
+    blocks = subcircuitBlocks(result)
+    assert [block[0] for block in blocks] == ['_X1', '_X2', '_X3']
+    names = [str(var) for var in result.Dv]
+    for (suffix, internal, ports) in blocks:
+        assert sorted([names[i] for i in internal]) == sorted(['V_mid' + suffix, 'Io_G1' + suffix])
+        (d, Q) = portModel(result.M, suffix, internal, ports)
+        M = result.M
+        A = M.extract(internal, internal)
+        schur = M.extract(ports, internal)*A.inv()*M.extract(internal, ports)
+        assert sp.simplify(Q/d - schur) == sp.zeros(len(ports))
+    assert len(PORTMODELS) == 1
+
+def test_maximaCache(tmp_path):
+    (cachePath, cacheSize) = (ini.cachePath, ini.MaximaCacheSize)
+    ini.cachePath = str(tmp_path) + '/'
+    clearMaximaCache()
+    assert MAXIMACACHE.get('a:1;') == None
+    MAXIMACACHE.put('a:1;', 'x'*1000)
+    MAXIMACACHE.put('b:2;', 'y'*1000)
+    assert MAXIMACACHE.get('a:1;') == 'x'*1000
+    assert maximaCacheStats() == {'hits': 1, 'misses': 1, 'entries': 2, 'size': 2000}
+    # The least recently used result is removed
+    ini.MaximaCacheSize = 2.5e-3
+    MAXIMACACHE.put('c:3;', 'z'*1000)
+    assert MAXIMACACHE.get('b:2;') == None
+    assert MAXIMACACHE.get('a:1;') == 'x'*1000
+    assert MAXIMACACHE.get('c:3;') == 'z'*1000
+    assert maximaCacheStats() == {'hits': 3, 'misses': 2, 'entries': 2, 'size': 2000}
+    # The index is read from the cache directory
+    assert maximaCache().stats()['entries'] == 2
+    clearMaximaCache()
+    assert maximaCacheStats() == {'hits': 0, 'misses': 0, 'entries': 0, 'size': 0}
+    assert len(os.listdir(ini.cachePath + 'maxima/')) == 0
+    (ini.cachePath, ini.MaximaCacheSize) = (cachePath, cacheSize)
+
+def test_circuitCache(tmp_path):
+    setTestProject()
+    ini.circuitPath = str(tmp_path) + '/'
+    library = '"Amplifier library"\n.subckt amp in out ref\nE1 out ref in ref {A}\n.param A=%s\n.ends\n.end\n'
+    with open(ini.circuitPath + 'amp.cir', 'w') as f:
+        f.write('"Amplifier"\n.lib amp.lib\nV1 in 0 V value=1\nX1 in out 0 amp\nR1 out 0 {R}\n.param R=1k\n.end\n')
+    with open(ini.circuitPath + 'amp.lib', 'w') as f:
+        f.write(library%('10'))
+    # Cached circuits are returned as independent copies
+    cir1 = checkCircuit('amp.cir')
+    cir2 = checkCircuit('amp.cir')
+    assert cir1 is not cir2
+    cir1.parDefs[sp.Symbol('R')] = 2
+    cir1.elements['R1'].params['value'] = 3
+    for cir in [cir2, checkCircuit('amp.cir')]:
+        assert float(cir.parDefs[sp.Symbol('R')]) == 1000
+        assert cir.elements['R1'].params['value'] == sp.Symbol('R')
+        assert float(cir.parDefs[sp.Symbol('A_X1')]) == 10
+    # Editing the library invalidates the cached circuit
+    with open(ini.circuitPath + 'amp.lib', 'w') as f:
+        f.write(library%('20'))
+    assert float(checkCircuit('amp.cir').parDefs[sp.Symbol('A_X1')]) == 20
+    setTestProject()
+
+def test_libCache(tmp_path):
+    setTestProject()
+    cachePath = ini.cachePath
+    ini.cachePath = str(tmp_path) + '/'
+    module = sys.modules[makeLibraries.__module__]
+    cold = makeLibraries()
+    assert os.listdir(ini.cachePath + 'lib/') == [module.LIBKEY + '.pkl']
+    warm = makeLibraries()
+    assert warm is not cold
+    assert sorted(warm.circuits.keys()) == sorted(cold.circuits.keys())
+    for name in list(cold.circuits.keys()):
+        assert list(warm.circuits[name].elements.keys()) == list(cold.circuits[name].elements.keys())
+    assert sorted(warm.modelDefs.keys()) == sorted(cold.modelDefs.keys())
+    assert warm.parDefs == cold.parDefs
+    # Compiled user libraries are cached with the hash of their file
+    ini.circuitPath = str(tmp_path) + '/'
+    library = '"Amplifier library"\n.subckt amp in out ref\nE1 out ref in ref {A}\n.param A=%s\n.ends\n.end\n'
+    keys = []
+    for A in ['10', '10', '20']:
+        with open(ini.circuitPath + 'amp.lib', 'w') as f:
+            f.write(library%(A))
+        makeLibraries()
+        addUserLibs(['amp.lib'])
+        keys.append(module.LIBFILES[ini.circuitPath + 'amp.lib'])
+        assert 'amp' in list(module.LIB.circuits.keys())
+    assert keys[0] == keys[1] and keys[1] != keys[2]
+    assert len(os.listdir(ini.cachePath + 'lib/')) == 3
+    ini.cachePath = cachePath
+    setTestProject()